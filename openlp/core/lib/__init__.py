@@ -59,9 +59,13 @@ class ImageSource(object):
 
     ``Theme``
         This says, that the image is used by a theme.
+
+    ``Thumbnail``
+        This states that a small copy of an image is shown in the slide list of a slide controller.
     """
     ImagePlugin = 1
     Theme = 2
+    Thumbnail = 3
 
 
 class MediaType(object):
@@ -170,24 +174,46 @@ def build_icon(icon):
     return button_icon
 
 
-def image_to_byte(image):
+def image_to_byte(image, image_format='PNG', quality=-1):
     """
     Resize an image to fit on the current screen for the web and returns it as a byte stream.
 
     ``image``
         The image to converted.
+
+    ``image_format``
+        The format to encode the image in, e. g. ``PNG`` or ``JPG``. Defaults to ``PNG``.
+
+    ``quality``
+        The quality of the encoded image from 0 to 100. Defaults to -1, which uses the format's default quality.
     """
     log.debug('image_to_byte - start')
     byte_array = QtCore.QByteArray()
     # use buffer to store pixmap into byteArray
     buffie = QtCore.QBuffer(byte_array)
     buffie.open(QtCore.QIODevice.WriteOnly)
-    image.save(buffie, "PNG")
+    image.save(buffie, image_format, quality)
     log.debug('image_to_byte - end')
     # convert to base64 encoding so does not get missed!
     return bytes(byte_array.toBase64()).decode('utf-8')
 
 
+def image_data_uri(image_bytes):
+    """
+    Returns a ``data:`` URI for a byte stream created by ``image_to_byte``, so that the web view can display it.
+
+    ``image_bytes``
+        The base64 encoded PNG or JPEG image. Other formats are not supported, see ``DISPLAY_IMAGE_FORMATS`` in
+        :mod:`openlp.core.lib.imagemanager`.
+    """
+    # Base64 encoded JPEG files always start with "/9j/", PNG files with "iVBORw0KGgo".
+    if image_bytes.startswith('/9j/'):
+        return 'data:image/jpeg;base64,%s' % image_bytes
+    if not image_bytes.startswith('iVBORw0KGgo'):
+        log.warning('image_data_uri - the image is neither JPEG nor PNG')
+    return 'data:image/png;base64,%s' % image_bytes
+
+
 def create_thumb(image_path, thumb_path, return_icon=True, size=None):
     """
     Create a thumbnail from the given image path and depending on ``return_icon`` it returns an icon from this thumb.
@@ -257,9 +283,13 @@ def resize_image(image_path, width, height, background='#000000'):
         The background colour. Defaults to black.
 
     DO NOT REMOVE THE DEFAULT BACKGROUND VALUE!
+
+    An empty image is returned if the file is not a readable image.
     """
     log.debug('resize_image - start')
     reader = QtGui.QImageReader(image_path)
+    if not reader.canRead() or reader.size().isEmpty():
+        return QtGui.QImage()
     # The image's ratio.
     image_ratio = reader.size().width() / reader.size().height()
     resize_ratio = width / height
@@ -386,7 +416,8 @@ from .plugin import PluginStatus, StringContent, Plugin
 from .pluginmanager import PluginManager
 from .settingstab import SettingsTab
 from .serviceitem import ServiceItem, ServiceItemType, ItemCapabilities
-from .htmlbuilder import build_html, build_lyrics_format_css, build_lyrics_outline_css
+from .htmlbuilder import build_html, build_item_update, build_lyrics_html, build_lyrics_format_css, \
+    build_lyrics_outline_css
 from .toolbar import OpenLPToolbar
 from .dockwidget import OpenLPDockWidget
 from .imagemanager import ImageManager
@@ -39,6 +39,8 @@ class FormattingTags(object):
     Static Class to HTML Tags to be access around the code the list is managed by the Options Tab.
     """
     html_expands = []
+    # Increased whenever the tags change, so that text formatted with the previous tags can be discarded.
+    version = 0
 
     @staticmethod
     def get_html_tags():
@@ -64,6 +66,8 @@ class FormattingTags(object):
                     del tag['temporary']
         # Formatting Tags were also known as display tags.
         Settings().setValue('formattingTags/html_tags', json.dumps(tags) if tags else '')
+        # The tags may have been edited in place before they are saved.
+        FormattingTags.version += 1
 
     @staticmethod
     def load_tags():
@@ -72,6 +76,7 @@ class FormattingTags(object):
         """
         temporary_tags = [tag for tag in FormattingTags.html_expands if tag.get('temporary')]
         FormattingTags.html_expands = []
+        FormattingTags.version += 1
         base_tags = []
         # Append the base tags.
         base_tags.append({'desc': translate('OpenLP.FormattingTags', 'Red'),
@@ -192,6 +197,7 @@ class FormattingTags(object):
             to be a ``boolean``.
         """
         FormattingTags.html_expands.extend(tags)
+        FormattingTags.version += 1
 
     @staticmethod
     def remove_html_tag(tag_id):
@@ -199,3 +205,4 @@ class FormattingTags(object):
         Removes an individual html_expands tag.
         """
         FormattingTags.html_expands.pop(tag_id)
+        FormattingTags.version += 1
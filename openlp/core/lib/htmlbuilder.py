@@ -27,10 +27,12 @@
 # Temple Place, Suite 330, Boston, MA 02111-1307 USA                          #
 ###############################################################################
 
+import json
 import logging
 
 from PyQt4 import QtWebKit
 
+from openlp.core.lib import image_data_uri
 from openlp.core.lib.theme import BackgroundType, BackgroundGradientType, VerticalType, HorizontalType
 
 log = logging.getLogger(__name__)
@@ -48,9 +50,6 @@ HTMLSRC = """
     overflow: hidden;
     -webkit-user-select: none;
 }
-body {
-    %s;
-}
 .size {
     position: absolute;
     left: 0px;
@@ -70,13 +69,6 @@ body {
     z-index: 2;
 }
 %s
-#footer {
-    position: absolute;
-    z-index: 6;
-    %s
-}
-/* lyric css */
-%s
 sup {
     font-size: 0.6em;
     vertical-align: top;
@@ -84,6 +76,9 @@ sup {
     top: -0.3em;
 }
 </style>
+<style id="itemstyle">
+%s
+</style>
 <script>
     var timer = null;
     var transition = %s;
@@ -178,17 +173,63 @@ sup {
         text.style.opacity = '1';
         // Wait until the text is completely visible. We want to save the timer id, to be able to call
         // clearTimeout(timer) when the text has changed before finishing fading.
-        timer = window.setTimeout(function(){timer = null;}, 400);
+        timer = window.setTimeout(function(){
+            timer = null;
+            notify_display();
+        }, 400);
+    }
+
+    function notify_display(){
+        /*
+        Tell the display that a transition has finished or an image has been loaded.
+        */
+        if(window.openlp_display)
+            openlp_display.page_changed();
     }
 
     function show_text_completed(){
         return (timer == null);
     }
+
+    function images_loaded(){
+        return document.getElementById('bgimage').complete && document.getElementById('image').complete;
+    }
+
+    function update_item(css, bgimage, new_transition, image){
+        /*
+        Replace everything which depends on the service item, without loading a new page.
+        */
+        if(timer != null){
+            clearTimeout(timer);
+            timer = null;
+        }
+        document.getElementById('itemstyle').innerHTML = css;
+        var bg = document.getElementById('bgimage');
+        if(bgimage == ''){
+            bg.removeAttribute('src');
+            bg.style.display = 'none';
+        }
+        else{
+            bg.src = bgimage;
+            bg.style.display = '';
+        }
+        transition = new_transition;
+        show_image(image);
+        show_footer('');
+        var ids = ['lyricsmain', 'lyricsoutline', 'lyricsshadow'];
+        for(var i = 0; i < ids.length; i++){
+            var text = document.getElementById(ids[i]);
+            if(text != null){
+                text.innerHTML = '';
+                text.style.opacity = '1';
+            }
+        }
+    }
 </script>
 </head>
 <body>
-<img id="bgimage" class="size" %s />
-<img id="image" class="size" %s />
+<img id="bgimage" class="size" onload="notify_display()" onerror="notify_display()" %s />
+<img id="image" class="size" onload="notify_display()" onerror="notify_display()" %s />
 %s
 %s
 <div id="footer" class="footer"></div>
@@ -197,6 +238,19 @@ sup {
 </html>
 """
 
+ITEMCSS = """
+body {
+    %s;
+}
+#footer {
+    position: absolute;
+    z-index: 6;
+    %s
+}
+/* lyric css */
+%s
+"""
+
 
 def build_html(item, screen, is_live, background, image=None, plugins=None):
     """
@@ -220,19 +274,17 @@ def build_html(item, screen, is_live, background, image=None, plugins=None):
     ``plugins``
         The List of available plugins
     """
-    width = screen['size'].width()
-    height = screen['size'].height()
     theme = item.themedata
     webkit_ver = webkit_version()
     # Image generated and poked in
     if background:
-        bgimage_src = 'src="data:image/png;base64,%s"' % background
+        bgimage_src = 'src="%s"' % image_data_uri(background)
     elif item.bg_image_bytes:
-        bgimage_src = 'src="data:image/png;base64,%s"' % item.bg_image_bytes
+        bgimage_src = 'src="%s"' % image_data_uri(item.bg_image_bytes)
     else:
         bgimage_src = 'style="display:none;"'
     if image:
-        image_src = 'src="data:image/png;base64,%s"' % image
+        image_src = 'src="%s"' % image_data_uri(image)
     else:
         image_src = 'style="display:none;"'
     css_additions = ''
@@ -244,10 +296,8 @@ def build_html(item, screen, is_live, background, image=None, plugins=None):
             js_additions += plugin.get_display_javascript()
             html_additions += plugin.get_display_html()
     html = HTMLSRC % (
-        build_background_css(item, width),
         css_additions,
-        build_footer_css(item, height),
-        build_lyrics_css(item, webkit_ver),
+        build_item_css(item, screen),
         'true' if theme and theme.display_slide_transition and is_live else 'false',
         js_additions,
         bgimage_src, image_src,
@@ -257,6 +307,55 @@ def build_html(item, screen, is_live, background, image=None, plugins=None):
     return html
 
 
+def build_item_update(item, screen, is_live, background, image=None):
+    """
+    Build the JavaScript which updates a page built by :func:`build_html` for another service item, as long as the
+    lyrics HTML of both items (see :func:`build_lyrics_html`) is the same. This saves loading a new page.
+
+    ``item``
+        Service Item to be displayed
+
+    ``screen``
+        Current display information
+
+    ``is_live``
+        Item is going live, rather than preview/theme building
+
+    ``background``
+        Theme background image - bytes
+
+    ``image``
+        Image media item - bytes
+    """
+    theme = item.themedata
+    if background:
+        bgimage_src = image_data_uri(background)
+    elif item.bg_image_bytes:
+        bgimage_src = image_data_uri(item.bg_image_bytes)
+    else:
+        bgimage_src = ''
+    image_src = image_data_uri(image) if image else ''
+    return 'update_item(%s, %s, %s, %s);' % (json.dumps(build_item_css(item, screen)), json.dumps(bgimage_src),
+        'true' if theme and theme.display_slide_transition and is_live else 'false', json.dumps(image_src))
+
+
+def build_item_css(item, screen):
+    """
+    Build the CSS which depends on the service item and its theme
+
+    ``item``
+        Service Item to be displayed
+
+    ``screen``
+        Current display information
+    """
+    return ITEMCSS % (
+        build_background_css(item, screen['size'].width()),
+        build_footer_css(item, screen['size'].height()),
+        build_lyrics_css(item, webkit_version())
+    )
+
+
 def webkit_version():
     """
     Return the Webkit version in use. Note method added relatively recently, so return 0 if prior to this
@@ -29,20 +29,51 @@
 ###############################################################################
 """
 Provides the store and management for Images automatically caching them and resizing them when needed. Only one copy of
-each image is needed in the system. A Thread is used to convert the image to a byte array so the user does not need to
-wait for the conversion to happen.
+each image is needed in the system. A pool of threads is used to convert the images to byte arrays so the user does
+not need to wait for the conversion to happen. All threads drain the same priority queue.
+
+The cache is bounded by the ``advanced/image cache size`` setting (in megabytes). When the memory used by the generated
+``QImage`` objects and byte streams exceeds this budget, the least recently used images are evicted. Evicted images stay
+known to the manager and are regenerated through the conversion queue the next time they are requested.
+
+Display images are encoded as JPEG by default, which is much faster than PNG and results in much smaller byte streams.
+The ``advanced/display image format`` and ``advanced/display image quality`` settings select the format and quality.
+Only JPEG and PNG are supported, as the web views are given the images as ``data:`` URIs of one of these types.
+
+Resized images are also kept in a cache on disk (limited by the ``advanced/image disk cache size`` setting), so that
+they do not need to be decoded and resized again after a restart.
+
+Threads waiting for an image are woken through a condition as soon as the image's ``QImage`` or byte stream is ready.
+The ``image_generated`` signal tells the user interface that an image's ``QImage`` is ready, e. g. a thumbnail which
+has been requested through ``request_image``.
 """
+import base64
+import hashlib
+import heapq
+import itertools
 import logging
 import os
+import stat
+import threading
 import time
 import queue
+from collections import OrderedDict
 
-from PyQt4 import QtCore
+from PyQt4 import QtCore, QtGui
 
-from openlp.core.lib import Registry, ScreenList, resize_image, image_to_byte
+from openlp.core.lib import ImageSource, Registry, ScreenList, Settings, resize_image, image_to_byte
+from openlp.core.utils import AppLocation
 
 log = logging.getLogger(__name__)
 
+# The maximum width of the thumbnails shown in the slide lists of the slide controllers.
+THUMBNAIL_WIDTH = 320
+# The number of seconds the displays wait for an image at most, so a slow or broken image never freezes the user
+# interface.
+DISPLAY_IMAGE_TIMEOUT = 10
+# The formats the display images can be encoded in, see image_data_uri().
+DISPLAY_IMAGE_FORMATS = ['JPG', 'PNG']
+
 
 class ImageThread(QtCore.QThread):
     """
@@ -127,6 +158,8 @@ class Image(object):
         self.source = source
         self.background = background
         self.timestamp = 0
+        # The number of bytes used by ``image`` and ``image_bytes``. This is maintained by the :class:`ImageManager`.
+        self.memory_size = 0
         # FIXME: We assume that the path exist. The caller has to take care that it exists!
         if os.path.exists(path):
             self.timestamp = os.stat(path).st_mtime
@@ -147,7 +180,59 @@ class PriorityQueue(queue.PriorityQueue):
     Doing this, the :class:`Queue.PriorityQueue` will sort the images according to their priorities, but also according
     to there number. However, the number only has an impact on the result if there are more images with the same
     priority. In such case the image which has been added earlier is privileged.
+
+    An image is queued at most once. Putting an image which is already queued replaces its old entry. Replaced and
+    removed entries are only marked as invalid and skipped when they reach the top of the heap, so that changing the
+    priority of an image costs O(log n).
     """
+    def _init(self, maxsize):
+        """
+        Set up the heap and the mapping of the queued images to their heap entries.
+        """
+        super(PriorityQueue, self)._init(maxsize)
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def _qsize(self):
+        """
+        Returns the number of valid entries.
+        """
+        return len(self.entries)
+
+    def _put(self, item):
+        """
+        Push the given item on the heap, replacing the image's previous entry.
+        """
+        priority, secondary_priority, image = item
+        self._invalidate(image)
+        # The counter makes sure that the images themselves are never compared.
+        entry = [priority, secondary_priority, next(self.counter), image]
+        self.entries[image] = entry
+        heapq.heappush(self.queue, entry)
+
+    def _get(self):
+        """
+        Pop the first valid entry from the heap.
+        """
+        while True:
+            priority, secondary_priority, count, image = heapq.heappop(self.queue)
+            if image is not None:
+                del self.entries[image]
+                return priority, secondary_priority, image
+
+    def _invalidate(self, image):
+        """
+        Mark the entry of the given ``image`` as invalid. The caller has to hold the queue's mutex.
+        """
+        entry = self.entries.pop(image, None)
+        if entry is None:
+            return
+        entry[-1] = None
+        # Rebuild the heap when most of its entries are invalid, so that it does not grow without limit.
+        if len(self.queue) > 2 * len(self.entries) + 64:
+            self.queue = [entry for entry in self.queue if entry[-1] is not None]
+            heapq.heapify(self.queue)
+
     def modify_priority(self, image, new_priority):
         """
         Modifies the priority of the given ``image``.
@@ -158,10 +243,19 @@ class PriorityQueue(queue.PriorityQueue):
         ``new_priority``
             The image's new priority. See the :class:`Priority` class for priorities.
         """
-        self.remove(image)
         image.priority = new_priority
         self.put((image.priority, image.secondary_priority, image))
 
+    def contains(self, image):
+        """
+        Returns whether the given ``image`` is queued.
+
+        ``image``
+            The image to look for. This should be an ``Image`` instance.
+        """
+        with self.mutex:
+            return image in self.entries
+
     def remove(self, image):
         """
         Removes the given ``image`` from the queue.
@@ -169,8 +263,141 @@ class PriorityQueue(queue.PriorityQueue):
         ``image``
             The image to remove. This should be an ``Image`` instance.
         """
-        if (image.priority, image.secondary_priority, image) in self.queue:
-            self.queue.remove((image.priority, image.secondary_priority, image))
+        with self.mutex:
+            self._invalidate(image)
+
+
+class ImageDiskCache(object):
+    """
+    A content-addressed cache of resized images on disk. Each file is named after a hash of the image's path,
+    modification time, target size, background colour and encoding, and contains the encoded resized image. The least
+    recently used files are deleted when the cache grows beyond its size limit.
+    """
+    def __init__(self, size_limit, image_format, quality):
+        """
+        Constructor for the disk cache.
+
+        ``size_limit``
+            The maximum size of the cache in bytes. 0 disables the cache.
+
+        ``image_format``
+            The format of the cached images, e. g. ``PNG`` or ``JPG``.
+
+        ``quality``
+            The quality the cached images have been encoded with.
+        """
+        self.size_limit = size_limit
+        self.image_format = image_format
+        self.quality = quality
+        self._path = None
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _get_path(self):
+        """
+        Returns the cache directory, creating it if necessary. The caller has to hold the lock.
+        """
+        if self._path is None:
+            self._path = AppLocation.get_section_data_path('imagecache')
+            self._size = sum(size for mtime, size, path in self._get_files())
+        return self._path
+
+    def _get_file_path(self, image, width, height):
+        """
+        Returns the path of the cache file of the given :class:`Image` instance resized to ``width`` and ``height``.
+        """
+        # QColor has no stable string representation, so use its name.
+        background = image.background.name() if isinstance(image.background, QtGui.QColor) else image.background
+        key = '%s|%s|%d|%d|%s|%s|%d' % (image.path, image.timestamp, width, height, background, self.image_format,
+            self.quality)
+        with self._lock:
+            path = self._get_path()
+        return os.path.join(path, '%s.%s' % (hashlib.sha1(key.encode('utf-8')).hexdigest(), self.image_format.lower()))
+
+    def load(self, image, width, height):
+        """
+        Returns a tuple with the cached ``QImage`` and its byte stream, or ``None`` if the image is not cached.
+        """
+        if not self.size_limit:
+            return None
+        file_path = self._get_file_path(image, width, height)
+        try:
+            with open(file_path, 'rb') as cache_file:
+                data = cache_file.read()
+            # Update the modification time, so that the file counts as recently used.
+            os.utime(file_path, None)
+        except (IOError, OSError):
+            return None
+        cached_image = QtGui.QImage.fromData(data)
+        if cached_image.isNull():
+            return None
+        return cached_image, base64.b64encode(data).decode('utf-8')
+
+    def store(self, image, width, height, image_bytes):
+        """
+        Writes the byte stream of the given :class:`Image` instance resized to ``width`` and ``height`` to the cache.
+        """
+        if not self.size_limit:
+            return
+        file_path = self._get_file_path(image, width, height)
+        data = base64.b64decode(image_bytes)
+        temp_path = '%s.%d.tmp' % (file_path, threading.get_ident())
+        try:
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, file_path)
+        except (IOError, OSError):
+            log.exception('Could not write image cache file %s' % file_path)
+            return
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.size_limit:
+                self._trim()
+
+    def _trim(self):
+        """
+        Deletes the least recently used files until the cache uses at most 90% of its size limit. The caller has to
+        hold the lock.
+        """
+        entries = sorted(entry for entry in self._get_files() if not entry[2].endswith('.tmp'))
+        self._size = sum(entry[1] for entry in entries)
+        for mtime, size, path in entries:
+            if self._size <= self.size_limit * 0.9:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                log.exception('Could not delete image cache file %s' % path)
+
+    def purge(self):
+        """
+        Deletes all files from the cache.
+        """
+        with self._lock:
+            for mtime, size, path in self._get_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    log.exception('Could not delete image cache file %s' % path)
+            self._size = 0
+
+    def _get_files(self):
+        """
+        Returns a list with a ``(modification time, size, path)`` tuple for each file in the cache directory. The caller
+        has to hold the lock.
+        """
+        files = []
+        path = self._path if self._path is not None else self._get_path()
+        for file_name in os.listdir(path):
+            file_path = os.path.join(path, file_name)
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue
+            if stat.S_ISREG(file_stat.st_mode):
+                files.append((file_stat.st_mtime, file_stat.st_size, file_path))
+        return files
 
 
 class ImageManager(QtCore.QObject):
@@ -178,6 +405,9 @@ class ImageManager(QtCore.QObject):
     Image Manager handles the conversion and sizing of images.
     """
     log.info('Image Manager loaded')
+    # Emitted with the path and the source of an image, when its ``QImage`` has been generated. The source is usually
+    # one of the ``ImageSource`` values, but can be any object.
+    image_generated = QtCore.pyqtSignal(str, object)
 
     def __init__(self):
         """
@@ -188,8 +418,31 @@ class ImageManager(QtCore.QObject):
         current_screen = ScreenList().current
         self.width = current_screen['size'].width()
         self.height = current_screen['size'].height()
-        self._cache = {}
-        self.image_thread = ImageThread(self)
+        # The cache is ordered from the least recently used image to the most recently used one.
+        self._cache = OrderedDict()
+        # Maps each path to the images (one per source) created from it.
+        self._path_index = {}
+        self._cache_lock = threading.RLock()
+        # Notified whenever an image's QImage or byte stream has been generated.
+        self._image_ready = threading.Condition(self._cache_lock)
+        self._cache_memory = 0
+        self.cache_size_limit = Settings().value('advanced/image cache size') * 1024 * 1024
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        # The images currently converted by one of the threads. These must not be evicted.
+        self._in_progress = set()
+        # The number of threads waiting for each image. These must not be evicted either.
+        self._waiters = {}
+        thread_count = Settings().value('advanced/image threads') or QtCore.QThread.idealThreadCount()
+        self.image_format = Settings().value('advanced/display image format').upper()
+        if self.image_format not in DISPLAY_IMAGE_FORMATS:
+            log.warning('Unsupported display image format "%s", using JPG instead', self.image_format)
+            self.image_format = 'JPG'
+        self.image_quality = Settings().value('advanced/display image quality')
+        self.disk_cache = ImageDiskCache(Settings().value('advanced/image disk cache size') * 1024 * 1024,
+            self.image_format, self.image_quality)
+        self.image_threads = [ImageThread(self) for thread in range(max(thread_count, 1))]
         self._conversion_queue = PriorityQueue()
         self.stop_manager = False
         Registry().register_function('images_regenerate', self.process_updates)
@@ -213,7 +466,7 @@ class ImageManager(QtCore.QObject):
         log.debug('update_images_border')
         # Mark the images as dirty for a rebuild by setting the image and byte stream to None.
         for image in list(self._cache.values()):
-            if image.source == source:
+            if image.source == source or (source == ImageSource.ImagePlugin and image.source == ImageSource.Thumbnail):
                 image.background = background
                 self._reset_image(image)
 
@@ -232,90 +485,298 @@ class ImageManager(QtCore.QObject):
         """
         Mark the given :class:`Image` instance as dirty by setting its ``image`` and ``image_bytes`` attributes to None.
         """
-        image.image = None
-        image.image_bytes = None
+        with self._cache_lock:
+            image.image = None
+            image.image_bytes = None
+            self._update_memory_size(image)
         self._conversion_queue.modify_priority(image, Priority.Normal)
 
+    def _touch_image(self, image):
+        """
+        Mark the given :class:`Image` instance as the most recently used one.
+        """
+        with self._cache_lock:
+            self._cache.move_to_end((image.path, image.source))
+
+    def _update_memory_size(self, image):
+        """
+        Recalculate the memory used by the given :class:`Image` instance and update the cache's total. The caller has to
+        hold the cache lock.
+        """
+        memory_size = 0
+        if image.image is not None:
+            memory_size += image.image.byteCount()
+        if image.image_bytes is not None:
+            memory_size += len(image.image_bytes)
+        self._cache_memory += memory_size - image.memory_size
+        image.memory_size = memory_size
+
+    def _evict_images(self, keep=None):
+        """
+        Evict the least recently used images until the cache fits into ``cache_size_limit``. Evicted images are not
+        removed from the cache; their ``image`` and ``image_bytes`` are dropped and regenerated when requested again.
+
+        ``keep``
+            An :class:`Image` instance which must not be evicted, e. g. the image which has just been generated.
+        """
+        if not self.cache_size_limit:
+            return
+        with self._cache_lock:
+            for image in list(self._cache.values()):
+                if self._cache_memory <= self.cache_size_limit:
+                    break
+                if image is keep or image in self._in_progress or image in self._waiters or not image.memory_size:
+                    continue
+                log.debug('_evict_images %s' % image.path)
+                self._conversion_queue.remove(image)
+                image.image = None
+                image.image_bytes = None
+                image.priority = Priority.Normal
+                self._update_memory_size(image)
+                self.cache_evictions += 1
+
+    def get_cache_statistics(self):
+        """
+        Returns a dict describing the state of the cache: the number of ``hits``, ``misses`` and ``evictions``, the
+        number of ``images`` known to the manager and the memory ``used`` by them and its ``limit`` (both in bytes).
+        """
+        with self._cache_lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'evictions': self.cache_evictions,
+                'images': len(self._cache),
+                'used': self._cache_memory,
+                'limit': self.cache_size_limit
+            }
+
+    def purge_disk_cache(self):
+        """
+        Deletes all resized images from the disk cache.
+        """
+        log.debug('purge_disk_cache')
+        self.disk_cache.purge()
+
     def process_updates(self):
         """
         Flush the queue to updated any data to update
         """
-        # We want only one thread.
-        if not self.image_thread.isRunning():
-            self.image_thread.start()
+        for image_thread in self.image_threads:
+            if not image_thread.isRunning():
+                image_thread.start()
 
-    def get_image(self, path, source):
+    def is_running(self):
+        """
+        Returns whether any of the image threads is still running.
+        """
+        return any(image_thread.isRunning() for image_thread in self.image_threads)
+
+    def _wait_for(self, image, priority, is_ready, timeout):
+        """
+        Block until ``is_ready`` returns ``True``. Returns ``False`` if this did not happen within ``timeout`` seconds.
+        The caller has to hold the cache lock. The image is not evicted while waiting for it.
+
+        ``image``
+            The :class:`Image` instance waited for.
+
+        ``priority``
+            The priority the image is queued with, if it is neither queued nor converted while waiting.
+
+        ``is_ready``
+            A callable returning whether the awaited data has been generated.
+
+        ``timeout``
+            The number of seconds to wait at most. ``None`` means to wait until the data is ready.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        self._waiters[image] = self._waiters.get(image, 0) + 1
+        try:
+            while not is_ready():
+                wait_time = 1.0
+                if deadline is not None:
+                    wait_time = min(wait_time, deadline - time.time())
+                    if wait_time <= 0:
+                        return False
+                self._image_ready.wait(wait_time)
+                if not is_ready():
+                    # Make sure the image is still going to be converted, then give the threads a kick, as they might
+                    # have finished just before our image was queued.
+                    if image not in self._in_progress and not self._conversion_queue.contains(image):
+                        self._conversion_queue.modify_priority(image, priority)
+                    self.process_updates()
+            return True
+        finally:
+            self._waiters[image] -= 1
+            if not self._waiters[image]:
+                del self._waiters[image]
+
+    def get_image(self, path, source, timeout=None):
         """
         Return the ``QImage`` from the cache. If not present wait for the background thread to process it.
+
+        ``timeout``
+            The number of seconds to wait for the image at most. ``None`` is returned if the image is not ready by then.
+            Defaults to ``None``, which means to wait until the image is ready.
         """
         log.debug('getImage %s' % path)
         image = self._cache[(path, source)]
+        self._touch_image(image)
         if image.image is None:
+            self.cache_misses += 1
             self._conversion_queue.modify_priority(image, Priority.High)
             # make sure we are running and if not give it a kick
             self.process_updates()
-            while image.image is None:
+            with self._image_ready:
                 log.debug('getImage - waiting')
-                time.sleep(0.1)
+                if not self._wait_for(image, Priority.High, lambda: image.image is not None, timeout):
+                    log.warning('getImage - timed out waiting for %s' % path)
+                return image.image
         elif image.image_bytes is None:
+            self.cache_hits += 1
             # Set the priority to Low, because the image was requested but the byte stream was not generated yet.
             # However, we only need to do this, when the image was generated before it was requested (otherwise this is
             # already taken care of).
             self._conversion_queue.modify_priority(image, Priority.Low)
+        else:
+            self.cache_hits += 1
+        return image.image
+
+    def request_image(self, path, source):
+        """
+        Return the ``QImage`` from the cache without waiting for it. If it has not been generated yet, ``None`` is
+        returned and the image is generated with a high priority. The ``image_generated`` signal is emitted when it is
+        ready.
+        """
+        image = self._cache[(path, source)]
+        self._touch_image(image)
+        if image.image is None:
+            self.cache_misses += 1
+            self._conversion_queue.modify_priority(image, Priority.High)
+            self.process_updates()
+        else:
+            self.cache_hits += 1
         return image.image
 
-    def get_image_bytes(self, path, source):
+    def get_image_bytes(self, path, source, timeout=None):
         """
         Returns the byte string for an image. If not present wait for the background thread to process it.
+
+        ``timeout``
+            The number of seconds to wait for the byte string at most. ``None`` is returned if the byte string is not
+            ready by then. Defaults to ``None``, which means to wait until the byte string is ready.
         """
         log.debug('get_image_bytes %s' % path)
         image = self._cache[(path, source)]
+        self._touch_image(image)
         if image.image_bytes is None:
+            self.cache_misses += 1
             self._conversion_queue.modify_priority(image, Priority.Urgent)
             # make sure we are running and if not give it a kick
             self.process_updates()
-            while image.image_bytes is None:
+            with self._image_ready:
                 log.debug('getImageBytes - waiting')
-                time.sleep(0.1)
+                if not self._wait_for(image, Priority.Urgent, lambda: image.image_bytes is not None, timeout):
+                    log.warning('getImageBytes - timed out waiting for %s' % path)
+                return image.image_bytes
+        else:
+            self.cache_hits += 1
         return image.image_bytes
 
-    def add_image(self, path, source, background):
+    def add_image(self, path, source, background, priority=Priority.Normal):
         """
         Add image to cache if it is not already there.
+
+        ``priority``
+            The priority the image is generated with, until it is requested. Defaults to ``Priority.Normal``.
         """
         log.debug('add_image %s' % path)
         if not (path, source) in self._cache:
             image = Image(path, source, background)
-            self._cache[(path, source)] = image
+            image.priority = priority
+            with self._cache_lock:
+                self._cache[(path, source)] = image
+                self._path_index.setdefault(path, []).append(image)
             self._conversion_queue.put((image.priority, image.secondary_priority, image))
         # Check if the there are any images with the same path and check if the timestamp has changed.
-        for image in list(self._cache.values()):
-            if os.path.exists(path):
-                if image.path == path and image.timestamp != os.stat(path).st_mtime:
-                    image.timestamp = os.stat(path).st_mtime
+        try:
+            timestamp = os.stat(path).st_mtime
+        except OSError:
+            timestamp = None
+        if timestamp is not None:
+            for image in self._path_index[path]:
+                if image.timestamp != timestamp:
+                    image.timestamp = timestamp
                     self._reset_image(image)
-        # We want only one thread.
-        if not self.image_thread.isRunning():
-            self.image_thread.start()
+        self.process_updates()
+
+    def _get_image_size(self, image):
+        """
+        Returns the width and the height the given :class:`Image` instance is resized to. Thumbnails are at most
+        ``THUMBNAIL_WIDTH`` pixels wide, all other images fill the screen.
+        """
+        if image.source == ImageSource.Thumbnail and self.width > THUMBNAIL_WIDTH:
+            return THUMBNAIL_WIDTH, self.height * THUMBNAIL_WIDTH // self.width
+        return self.width, self.height
 
     def _process(self):
         """
         Controls the processing called from a ``QtCore.QThread``.
         """
         log.debug('_process - started')
-        while not self._conversion_queue.empty() and not self.stop_manager:
-            self._process_cache()
+        while not self.stop_manager:
+            try:
+                image = self._conversion_queue.get(False)[2]
+            except queue.Empty:
+                break
+            with self._cache_lock:
+                self._in_progress.add(image)
+            try:
+                self._process_cache(image)
+            finally:
+                with self._cache_lock:
+                    self._in_progress.discard(image)
         log.debug('_process - ended')
 
-    def _process_cache(self):
+    def _process_cache(self, image):
         """
         Actually does the work.
+
+        ``image``
+            The :class:`Image` instance taken from the queue.
         """
         log.debug('_processCache')
-        image = self._conversion_queue.get()[2]
-        # Generate the QImage for the image.
+        width, height = self._get_image_size(image)
+        # Thumbnails are only shown in the user interface, so they do not need a byte stream.
+        is_thumbnail = image.source == ImageSource.Thumbnail
+        # Generate the QImage for the image. Use the disk cache if the image has been resized before.
         if image.image is None:
-            image.image = resize_image(image.path, self.width, self.height, image.background)
+            cached = self.disk_cache.load(image, width, height)
+            if cached is not None:
+                with self._image_ready:
+                    image.image = cached[0]
+                    image.image_bytes = None if is_thumbnail else cached[1]
+                    self._update_memory_size(image)
+                    self._image_ready.notify_all()
+                self._evict_images(image)
+                self.image_generated.emit(image.path, image.source)
+                return
+            try:
+                new_image = resize_image(image.path, width, height, image.background)
+            except Exception:
+                # Use an empty image for unreadable files, so that nobody waits for them forever.
+                log.exception('_processCache - could not load %s' % image.path)
+                new_image = QtGui.QImage()
+            with self._image_ready:
+                image.image = new_image
+                self._update_memory_size(image)
+                self._image_ready.notify_all()
+            self._evict_images(image)
+            self.image_generated.emit(image.path, image.source)
+            if is_thumbnail:
+                if not new_image.isNull():
+                    self.disk_cache.store(image, width, height,
+                        image_to_byte(new_image, self.image_format, self.image_quality))
+                return
             # Set the priority to Lowest and stop here as we need to process more important images first.
             if image.priority == Priority.Normal:
                 self._conversion_queue.modify_priority(image, Priority.Lowest)
@@ -327,4 +788,15 @@ class ImageManager(QtCore.QObject):
                 return
         # Generate the byte stream for the image.
         if image.image_bytes is None:
-            image.image_bytes = image_to_byte(image.image)
+            source_image = image.image
+            # The image has been reset meanwhile and is already queued again.
+            if source_image is None:
+                return
+            image_bytes = image_to_byte(source_image, self.image_format, self.image_quality)
+            with self._image_ready:
+                image.image_bytes = image_bytes
+                self._update_memory_size(image)
+                self._image_ready.notify_all()
+            self._evict_images(image)
+            if not source_image.isNull():
+                self.disk_cache.store(image, width, height, image_bytes)
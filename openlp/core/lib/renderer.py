@@ -28,11 +28,14 @@
 ###############################################################################
 
 import logging
+import re
+from collections import OrderedDict, deque
 
 from PyQt4 import QtGui, QtCore, QtWebKit
 
 from openlp.core.lib import Settings, FormattingTags, ImageSource, ItemCapabilities, Registry, ScreenList, \
     ServiceItem, expand_tags, build_lyrics_format_css, build_lyrics_outline_css
+from openlp.core.lib.htmlbuilder import webkit_version
 from openlp.core.lib.theme import ThemeLevel
 from openlp.core.ui import MainDisplay
 
@@ -47,6 +50,12 @@ VERSE = 'The Lord said to {r}Noah{/r}: \n' \
     'r{/pk}{o}e{/o}{pp}n{/pp} of the Lord\n'
 VERSE_FOR_LINE_COUNT = '\n'.join(map(str, range(100)))
 FOOTER = ['Arky Arky (Unknown)', 'Public Domain', 'CCLI 123456']
+# The number of formatted slides the renderer remembers.
+FORMAT_SLIDE_CACHE_SIZE = 2000
+# The number of hidden web views (one per theme and text area) the renderer keeps loaded.
+WEB_VIEW_POOL_SIZE = 8
+# HTML which affects the layout in ways Qt's rich text engine does not support. Such text is always measured by WebKit.
+NATIVE_LAYOUT_UNSUPPORTED = re.compile(r'<(img|table|iframe|object)|display\s*:|position\s*:|float\s*:', re.IGNORECASE)
 
 
 class Renderer(object):
@@ -68,9 +77,19 @@ class Renderer(object):
         self.service_theme_name = ''
         self.item_theme_name = ''
         self.force_page = False
+        self.native_layout = False
         self.display = MainDisplay(None, False, self)
         self.display.setup()
+        # The themes waiting for a preview, as (theme data, callback) tuples.
+        self._preview_requests = deque()
         self._theme_dimensions = {}
+        # Maps the raw slide text, the item's capabilities, the theme and the text rectangle to the formatted pages.
+        self._format_slide_cache = OrderedDict()
+        # The version of the formatting tags the cached slides were formatted with.
+        self._formatting_tags_version = FormattingTags.version
+        self._theme_key = None
+        # Maps the theme and text area to a loaded web view, its main frame and its empty height.
+        self._web_views = OrderedDict()
         self._calculate_default()
         Registry().register_function('theme_update_global', self.set_global_theme)
         self.web = QtWebKit.QWebView()
@@ -88,6 +107,10 @@ class Renderer(object):
         self.display = MainDisplay(None, False, self)
         self.display.setup()
         self._theme_dimensions = {}
+        self._format_slide_cache.clear()
+        self._web_views.clear()
+        if self._preview_requests:
+            self._generate_next_preview()
 
     def update_theme(self, theme_name, old_theme_name=None, only_delete=False):
         """
@@ -107,6 +130,8 @@ class Renderer(object):
             del self._theme_dimensions[old_theme_name]
         if theme_name in self._theme_dimensions:
             del self._theme_dimensions[theme_name]
+        self._format_slide_cache.clear()
+        self._web_views.clear()
         if not only_delete and theme_name:
             self._set_theme(theme_name)
 
@@ -202,26 +227,44 @@ class Renderer(object):
         self._set_theme(item_theme_name)
         self.item_theme_name = item_theme_name
 
-    def generate_preview(self, theme_data, force_page=False):
+    def generate_preview(self, theme_data, force_page=False, callback=None):
         """
-        Generate a preview of a theme.
+        Generate a preview of a theme. The preview is generated once the display has loaded it, it is passed to
+        ``callback`` then. Previews are generated one after the other, as they share the display.
 
         ``theme_data``
             The theme to generated a preview for.
 
         ``force_page``
-            Flag to tell message lines per page need to be generated.
+            Flag to tell message lines per page need to be generated. No preview is generated in this case.
+
+        ``callback``
+            The function to call with the preview pixmap.
         """
         log.debug('generate preview')
-        # save value for use in format_slide
-        self.force_page = force_page
-        # build a service item to generate preview
-        service_item = ServiceItem()
-        if self.force_page:
+        if force_page:
+            # save value for use in format_slide
+            self.force_page = True
             # make big page for theme edit dialog to get line count
-            service_item.add_from_text(VERSE_FOR_LINE_COUNT)
-        else:
-            service_item.add_from_text(VERSE)
+            self._build_preview_item(theme_data, VERSE_FOR_LINE_COUNT)
+            self.force_page = False
+            return
+        self._preview_requests.append((theme_data, callback))
+        if len(self._preview_requests) == 1:
+            self._generate_next_preview()
+
+    def _build_preview_item(self, theme_data, text):
+        """
+        Build and render a service item showing ``text`` with the given theme.
+
+        ``theme_data``
+            The theme to use.
+
+        ``text``
+            The text of the service item.
+        """
+        service_item = ServiceItem()
+        service_item.add_from_text(text)
         service_item.raw_footer = FOOTER
         # if No file do not update cache
         if theme_data.background_filename:
@@ -232,13 +275,37 @@ class Renderer(object):
         service_item.main = main
         service_item.footer = footer
         service_item.render(True)
-        if not self.force_page:
-            self.display.build_html(service_item)
-            raw_html = service_item.get_rendered_frame(0)
-            self.display.text(raw_html, False)
-            preview = self.display.preview()
-            return preview
-        self.force_page = False
+        return service_item
+
+    def _generate_next_preview(self):
+        """
+        Show the first waiting preview on the display and grab it, once the display is ready.
+        """
+        theme_data = self._preview_requests[0][0]
+        service_item = self._build_preview_item(theme_data, VERSE)
+        display = self.display
+        display.build_html(service_item)
+        display.text(service_item.get_rendered_frame(0), False)
+        display.grab_preview(lambda preview: self._preview_generated(display, preview))
+
+    def _preview_generated(self, display, preview):
+        """
+        Pass a grabbed preview to the callback which is waiting for it and generate the next one.
+
+        ``display``
+            The display the preview has been grabbed from.
+
+        ``preview``
+            The preview pixmap.
+        """
+        # The display has been replaced meanwhile, the preview is generated again on the new one.
+        if display is not self.display:
+            return
+        theme_data, callback = self._preview_requests.popleft()
+        if callback:
+            callback(preview)
+        if self._preview_requests:
+            self._generate_next_preview()
 
     def format_slide(self, text, item):
         """
@@ -251,6 +318,34 @@ class Renderer(object):
             The :class:`~openlp.core.lib.serviceitem.ServiceItem` item object.
         """
         log.debug('format slide')
+        # The theme line count is reported while formatting, so do not use the cache when it has been requested.
+        if self.force_page:
+            return self._format_slide(text, item)
+        # The formatting tags have changed, so the cached slides may have been formatted with the wrong HTML.
+        if self._formatting_tags_version != FormattingTags.version:
+            self._format_slide_cache.clear()
+            self._formatting_tags_version = FormattingTags.version
+        key = (text, item.is_capable(ItemCapabilities.CanSoftBreak), item.is_capable(ItemCapabilities.CanWordSplit),
+            item.is_capable(ItemCapabilities.NoLineBreaks), self._theme_key)
+        if key in self._format_slide_cache:
+            self._format_slide_cache.move_to_end(key)
+            return list(self._format_slide_cache[key])
+        pages = self._format_slide(text, item)
+        self._format_slide_cache[key] = pages
+        if len(self._format_slide_cache) > FORMAT_SLIDE_CACHE_SIZE:
+            self._format_slide_cache.popitem(False)
+        return list(pages)
+
+    def _format_slide(self, text, item):
+        """
+        Split the text into pages. This does the actual work of ``format_slide``.
+
+        ``text``
+            The words to go on the slides.
+
+        ``item``
+            The :class:`~openlp.core.lib.serviceitem.ServiceItem` item object.
+        """
         # Add line endings after each line of text used for bibles.
         line_end = '<br>'
         if item.is_capable(ItemCapabilities.NoLineBreaks):
@@ -379,8 +474,20 @@ class Renderer(object):
         if theme_data.font_main_shadow:
             self.page_width -= int(theme_data.font_main_shadow_size)
             self.page_height -= int(theme_data.font_main_shadow_size)
+        self.native_layout = theme_data.display_native_pagination
+        self._theme_key = (theme_data.extract_xml(), self.page_width, self.page_height)
+        if self.native_layout:
+            self._set_text_document(theme_data)
+        # Reuse the web view which has already been loaded for this theme and text area.
+        reuse_views = Settings().value('advanced/reuse renderer views')
+        if reuse_views and self._theme_key in self._web_views:
+            self._web_views.move_to_end(self._theme_key)
+            self.web, self.web_frame, self.empty_height = self._web_views[self._theme_key]
+            return
         # For the life of my I don't know why we have to completely kill the QWebView in order for the display to work
-        # properly, but we do. See bug #1041366 for an example of what happens if we take this out.
+        # properly, but we do. See bug #1041366 for an example of what happens if we take this out. The views are only
+        # reused for the same theme and text area, which can be disabled with the 'advanced/reuse renderer views'
+        # setting should the bug show up again.
         self.web = None
         self.web = QtWebKit.QWebView()
         self.web.setVisible(False)
@@ -403,6 +510,31 @@ class Renderer(object):
             self.page_height), build_lyrics_outline_css(theme_data))
         self.web.setHtml(html)
         self.empty_height = self.web_frame.contentsSize().height()
+        if reuse_views:
+            self._web_views[self._theme_key] = (self.web, self.web_frame, self.empty_height)
+            if len(self._web_views) > WEB_VIEW_POOL_SIZE:
+                self._web_views.popitem(False)
+
+    def _set_text_document(self, theme_data):
+        """
+        Sets up the ``QTextDocument`` which measures the text when the theme uses native pagination. It mirrors the CSS
+        created by ``build_lyrics_format_css``.
+
+        ``theme_data``
+            The theme data.
+        """
+        font = QtGui.QFont(theme_data.font_main_name)
+        # WebKit lays out CSS points at 96 dpi.
+        font.setPixelSize(int(round(theme_data.font_main_size * 96 / 72)))
+        font.setBold(theme_data.font_main_bold)
+        font.setItalic(theme_data.font_main_italics)
+        if theme_data.font_main_outline and webkit_version() <= 534.3:
+            font.setLetterSpacing(QtGui.QFont.AbsoluteSpacing, 1)
+        self.text_document = QtGui.QTextDocument()
+        self.text_document.setDefaultFont(font)
+        self.text_document.setDocumentMargin(0)
+        self.text_document.setTextWidth(self.page_width)
+        self.line_height = 100 + int(theme_data.font_main_line_adjustment)
 
     def _paginate_slide(self, lines, line_end):
         """
@@ -589,6 +721,33 @@ class Renderer(object):
         """
         Checks if the given ``text`` fits on a slide. If it does ``True`` is returned, otherwise ``False``.
 
+        ``text``
+            The text to check. It may contain HTML tags.
+        """
+        if self.native_layout and not NATIVE_LAYOUT_UNSUPPORTED.search(text):
+            return self._text_fits_on_slide_natively(text)
+        return self._text_fits_on_slide_webkit(text)
+
+    def _text_fits_on_slide_natively(self, text):
+        """
+        Checks if the given ``text`` fits on a slide by laying it out with a ``QTextDocument``.
+
+        ``text``
+            The text to check. It may contain HTML tags.
+        """
+        self.text_document.setHtml('<div style="white-space:pre-wrap;">%s</div>' % text)
+        if self.line_height != 100:
+            cursor = QtGui.QTextCursor(self.text_document)
+            cursor.select(QtGui.QTextCursor.Document)
+            block_format = QtGui.QTextBlockFormat()
+            block_format.setLineHeight(self.line_height, QtGui.QTextBlockFormat.ProportionalHeight)
+            cursor.mergeBlockFormat(block_format)
+        return self.text_document.size().height() <= self.page_height
+
+    def _text_fits_on_slide_webkit(self, text):
+        """
+        Checks if the given ``text`` fits on a slide by showing it in the hidden ``QWebView``.
+
         ``text``
             The text to check. It may contain HTML tags.
         """
@@ -158,6 +158,10 @@ class ServiceItem(object):
         self.service_item_type = None
         self._raw_frames = []
         self._display_frames = []
+        self._rendered_slide_count = 0
+        self._previous_pages = {}
+        self._lazy_render = False
+        self._render_pending = False
         self.unique_identifier = 0
         self.notes = ''
         self.from_plugin = False
@@ -224,7 +228,7 @@ class ServiceItem(object):
         self.icon = icon
         self.iconic_representation = build_icon(icon)
 
-    def render(self, provides_own_theme_data=False):
+    def render(self, provides_own_theme_data=False, lazy=False):
         """
         The render method is what generates the frames for the screen and
         obtains the display information from the renderer. At this point all
@@ -235,35 +239,28 @@ class ServiceItem(object):
             disabled by default. If this is used, it has to be taken care, that
             the renderer knows the correct theme data. However, this is needed
             for the theme manager.
+
+        ``lazy``
+            Only set up the theme now and split text slides into frames when
+            they are requested through ``get_frames``, ``get_rendered_frame``
+            or ``prefetch_frames``. Defaults to *False*.
         """
         log.debug('Render called')
         self._display_frames = []
+        self._rendered_slide_count = 0
+        # Save rendered pages to this dict. In the case that a slide is used
+        # twice we can use the pages saved to the dict instead of rendering
+        # them again.
+        self._previous_pages = {}
+        self._lazy_render = lazy and not provides_own_theme_data
+        self._render_pending = True
         self.bg_image_bytes = None
         if not provides_own_theme_data:
             self.renderer.set_item_theme(self.theme)
             self.themedata, self.main, self.footer = self.renderer.pre_render()
         if self.service_item_type == ServiceItemType.Text:
-            log.debug('Formatting slides: %s' % self.title)
-            # Save rendered pages to this dict. In the case that a slide is used
-            # twice we can use the pages saved to the dict instead of rendering
-            # them again.
-            previous_pages = {}
-            for slide in self._raw_frames:
-                verse_tag = slide['verseTag']
-                if verse_tag in previous_pages and previous_pages[verse_tag][0] == slide['raw_slide']:
-                    pages = previous_pages[verse_tag][1]
-                else:
-                    pages = self.renderer.format_slide(slide['raw_slide'], self)
-                    previous_pages[verse_tag] = (slide['raw_slide'], pages)
-                for page in pages:
-                    page = page.replace('<br>', '{br}')
-                    html = expand_tags(cgi.escape(page.rstrip()))
-                    self._display_frames.append({
-                        'title': clean_tags(page),
-                        'text': clean_tags(page.rstrip()),
-                        'html': html.replace('&amp;nbsp;', '&nbsp;'),
-                        'verseTag': verse_tag
-                    })
+            if not self._lazy_render:
+                self._render_frames()
         elif self.service_item_type == ServiceItemType.Image or self.service_item_type == ServiceItemType.Command:
             pass
         else:
@@ -276,6 +273,77 @@ class ServiceItem(object):
             self.raw_footer = []
         self.foot_text = '<br>'.join([_f for _f in self.raw_footer if _f])
 
+    def _render_frames(self, row=None):
+        """
+        Split the raw text slides into frames until the frame ``row`` exists.
+
+        ``row``
+            The frame which is needed. Defaults to *None*, which renders all
+            frames.
+        """
+        if not self._render_pending or self._rendered_slide_count >= len(self._raw_frames):
+            return
+        if row is not None and row < len(self._display_frames):
+            return
+        log.debug('Formatting slides: %s' % self.title)
+        # The renderer might have been set up for another item meanwhile.
+        if self._lazy_render:
+            self.renderer.pre_render(self.themedata)
+        while self._rendered_slide_count < len(self._raw_frames):
+            if row is not None and row < len(self._display_frames):
+                break
+            slide = self._raw_frames[self._rendered_slide_count]
+            self._rendered_slide_count += 1
+            verse_tag = slide['verseTag']
+            if verse_tag in self._previous_pages and self._previous_pages[verse_tag][0] == slide['raw_slide']:
+                pages = self._previous_pages[verse_tag][1]
+            else:
+                pages = self.renderer.format_slide(slide['raw_slide'], self)
+                self._previous_pages[verse_tag] = (slide['raw_slide'], pages)
+            for page in pages:
+                page = page.replace('<br>', '{br}')
+                html = expand_tags(cgi.escape(page.rstrip()))
+                self._display_frames.append({
+                    'title': clean_tags(page),
+                    'text': clean_tags(page.rstrip()),
+                    'html': html.replace('&amp;nbsp;', '&nbsp;'),
+                    'verseTag': verse_tag
+                })
+
+    def prefetch_frames(self, row, count=2):
+        """
+        Make sure the frame ``row`` and the ``count`` frames following it
+        have been rendered, e. g. before they are shown.
+
+        ``row``
+            The first frame which is needed.
+
+        ``count``
+            The number of frames needed after ``row``. Defaults to 2.
+        """
+        if self.service_item_type == ServiceItemType.Text:
+            self._render_frames(row + count)
+
+    def __copy__(self):
+        """
+        Returns a shallow copy of the service item, which renders its frames
+        independently of this one.
+        """
+        service_item = self.__class__.__new__(self.__class__)
+        service_item.__dict__.update(self.__dict__)
+        service_item._display_frames = list(self._display_frames)
+        service_item._previous_pages = dict(self._previous_pages)
+        return service_item
+
+    def is_fully_rendered(self):
+        """
+        Returns whether all frames have been rendered. This is only ever
+        ``False`` for text items which have been rendered lazily.
+        """
+        if self.service_item_type == ServiceItemType.Text and self._render_pending:
+            return self._rendered_slide_count >= len(self._raw_frames)
+        return True
+
     def add_from_image(self, path, title, background=None):
         """
         Add an image slide to the service item.
@@ -286,11 +354,31 @@ class ServiceItem(object):
         ``title``
             A title for the slide in the service item.
         """
+        self.add_from_images([(path, title)], background)
+
+    def add_from_images(self, images, background=None, add_to_image_manager=True):
+        """
+        Add several image slides to the service item at once. The item is
+        only validated once all the images have been added.
+
+        ``images``
+            A list of tuples with the path and the title of each image.
+
+        ``background``
+            The colour of the border around the images. Defaults to *None*.
+
+        ``add_to_image_manager``
+            Add the images to the image manager. This has to be done with
+            ``reload_images`` later, if the files do not exist yet. Defaults to
+            *True*.
+        """
         if background:
             self.image_border = background
         self.service_item_type = ServiceItemType.Image
-        self._raw_frames.append({'title': title, 'path': path})
-        self.image_manager.add_image(path, ImageSource.ImagePlugin, self.image_border)
+        for path, title in images:
+            self._raw_frames.append({'title': title, 'path': path})
+            if add_to_image_manager:
+                self.image_manager.add_image(path, ImageSource.ImagePlugin, self.image_border)
         self._new_item()
 
     def add_from_text(self, raw_slide, verse_tag=None):
@@ -320,8 +408,21 @@ class ServiceItem(object):
         ``image``
             The command of/for the slide.
         """
+        self.add_from_commands([(path, file_name, image)])
+
+    def add_from_commands(self, commands):
+        """
+        Add several slides from a command at once, e. g. the slides of a
+        presentation. The item is only validated once all the slides have
+        been added.
+
+        ``commands``
+            A list of tuples with the path, the file name and the image of
+            each slide.
+        """
         self.service_item_type = ServiceItemType.Command
-        self._raw_frames.append({'title': file_name, 'image': image, 'path': path})
+        for path, file_name, image in commands:
+            self._raw_frames.append({'title': file_name, 'image': image, 'path': path})
         self._new_item()
 
     def get_service_repr(self, lite_save):
@@ -381,6 +482,9 @@ class ServiceItem(object):
             Defaults to *None*. This is the service manager path for things
             which have their files saved with them or None when the saved
             service is lite and the original file paths need to be preserved..
+            The files in the service manager path might not have been extracted
+            yet, so images are not added to the image manager in this case.
+            Call ``reload_images`` once the files are there.
         """
         log.debug('set_from_service called with path %s' % path)
         header = serviceitem['serviceitem']['header']
@@ -426,22 +530,24 @@ class ServiceItem(object):
             background = QtGui.QColor(Settings().value(settings_section + '/background color'))
             if path:
                 self.has_original_files = False
-                for text_image in serviceitem['serviceitem']['data']:
-                    filename = os.path.join(path, text_image)
-                    self.add_from_image(filename, text_image, background)
+                self.add_from_images([(os.path.join(path, text_image), text_image)
+                    for text_image in serviceitem['serviceitem']['data']], background, False)
             else:
-                for text_image in serviceitem['serviceitem']['data']:
-                    self.add_from_image(text_image['path'], text_image['title'], background)
+                self.add_from_images([(text_image['path'], text_image['title'])
+                    for text_image in serviceitem['serviceitem']['data']], background)
         elif self.service_item_type == ServiceItemType.Command:
+            commands = []
             for text_image in serviceitem['serviceitem']['data']:
                 if not self.title:
                     self.title = text_image['title']
                 if path:
                     self.has_original_files = False
-                    self.add_from_command(path, text_image['title'], text_image['image'])
+                    commands.append((path, text_image['title'], text_image['image']))
                 else:
-                    self.add_from_command(text_image['path'], text_image['title'], text_image['image'])
-        self._new_item()
+                    commands.append((text_image['path'], text_image['title'], text_image['image']))
+            self.add_from_commands(commands)
+        else:
+            self._new_item()
 
     def get_display_title(self):
         """
@@ -536,11 +642,18 @@ class ServiceItem(object):
         if length > 0:
             self.add_capability(ItemCapabilities.HasVariableStartTime)
 
-    def get_frames(self):
+    def get_frames(self, rendered_only=False):
         """
         Returns the frames for the ServiceItem
+
+        ``rendered_only``
+            Only return the frames of a lazily rendered text item which have
+            been rendered so far, instead of rendering the others. Defaults to
+            *False*.
         """
         if self.service_item_type == ServiceItemType.Text:
+            if not rendered_only:
+                self._render_frames()
             return self._display_frames
         else:
             return self._raw_frames
@@ -552,6 +665,7 @@ class ServiceItem(object):
             The service item slide to be returned
         """
         if self.service_item_type == ServiceItemType.Text:
+            self._render_frames(row)
             return self._display_frames[row]['html'].split('\n')[0]
         elif self.service_item_type == ServiceItemType.Image:
             return self._raw_frames[row]['path']
@@ -642,21 +756,34 @@ class ServiceItem(object):
         Validates a service item to make sure it is valid
         """
         self.is_valid = True
+        # The slides of a presentation all refer to the same file, so every file is only checked once.
+        checked_files = set()
         for frame in self._raw_frames:
             if self.is_image() and not os.path.exists(frame['path']):
                 self.is_valid = False
                 break
             elif self.is_command():
                 file_name = os.path.join(frame['path'], frame['title'])
-                if not os.path.exists(file_name):
-                    self.is_valid = False
-                    break
+                if file_name not in checked_files:
+                    if not os.path.exists(file_name):
+                        self.is_valid = False
+                        break
+                    checked_files.add(file_name)
                 if suffix_list and not self.is_text():
                     file_suffix = frame['title'].split('.')[-1]
                     if file_suffix.lower() not in suffix_list:
                         self.is_valid = False
                         break
 
+    def reload_images(self):
+        """
+        Let the image manager pick up the images of an image item again, e. g.
+        after their files have been replaced.
+        """
+        if self.is_image():
+            for frame in self._raw_frames:
+                self.image_manager.add_image(frame['path'], ImageSource.ImagePlugin, self.image_border)
+
     def _get_renderer(self):
         """
         Adds the Renderer to the class dynamically
@@ -99,17 +99,26 @@ class Settings(QtCore.QSettings):
         'advanced/default service hour': 11,
         'advanced/default service minute': 0,
         'advanced/default service name': UiStrings().DefaultServiceName,
+        'advanced/display image format': 'jpg',
+        'advanced/display image quality': 90,
         'advanced/display size': 0,
         'advanced/double click live': False,
         'advanced/enable exit confirmation': True,
         'advanced/expand service item': False,
         'advanced/hide mouse': True,
+        # The memory budget of the image manager's cache in megabytes. 0 means no limit.
+        'advanced/image cache size': 512,
+        # The size limit of the resized images cached on disk in megabytes. 0 disables the disk cache.
+        'advanced/image disk cache size': 1024,
+        # The number of threads converting images. 0 means one thread per CPU core.
+        'advanced/image threads': 0,
         'advanced/is portable': False,
         'advanced/max recent files': 20,
         'advanced/print file meta data': False,
         'advanced/print notes': False,
         'advanced/print slide text': False,
         'advanced/recent file count': 4,
+        'advanced/reuse renderer views': True,
         'advanced/save current plugin': False,
         'advanced/slide limits': SlideLimits.End,
         'advanced/single click preview': False,
@@ -272,8 +281,10 @@ class Settings(QtCore.QSettings):
         'shortcuts/songImportItem': [],
         'shortcuts/themeScreen': [QtGui.QKeySequence('T')],
         'shortcuts/toolsReindexItem': [],
+        'shortcuts/toolsRebuildBibleIndexItem': [],
         'shortcuts/toolsFindDuplicates': [],
         'shortcuts/toolsAlertItem': [QtGui.QKeySequence('F7')],
+        'shortcuts/toolsClearImageCache': [],
         'shortcuts/toolsFirstTimeWizard': [],
         'shortcuts/toolsOpenDataFolder': [],
         'shortcuts/toolsAddToolItem': [],
@@ -82,6 +82,7 @@ BLANK_THEME_XML = \
       <horizontalAlign>0</horizontalAlign>
       <verticalAlign>0</verticalAlign>
       <slideTransition>False</slideTransition>
+      <nativePagination>False</nativePagination>
    </display>
  </theme>
 '''
@@ -200,7 +201,7 @@ class VerticalType(object):
     Names = ['top', 'middle', 'bottom']
 
 
-BOOLEAN_LIST = ['bold', 'italics', 'override', 'outline', 'shadow', 'slide_transition']
+BOOLEAN_LIST = ['bold', 'italics', 'override', 'outline', 'shadow', 'slide_transition', 'native_pagination']
 
 INTEGER_LIST = ['size', 'line_adjustment', 'x', 'height', 'y', 'width', 'shadow_size', 'outline_size',
     'horizontal_align', 'vertical_align', 'wrap_style']
@@ -401,7 +402,7 @@ class ThemeXML(object):
         element.appendChild(value)
         background.appendChild(element)
 
-    def add_display(self, horizontal, vertical, transition):
+    def add_display(self, horizontal, vertical, transition, native_pagination=False):
         """
         Add a Display options.
 
@@ -414,6 +415,8 @@ class ThemeXML(object):
         ``transition``
             Whether the slide transition is active.
 
+        ``native_pagination``
+            Whether the text is split into slides using Qt's text layout instead of WebKit. Defaults to *False*.
         """
         background = self.theme_xml.createElement('display')
         self.theme.appendChild(background)
@@ -432,6 +435,11 @@ class ThemeXML(object):
         value = self.theme_xml.createTextNode(str(transition))
         element.appendChild(value)
         background.appendChild(element)
+        # Native pagination
+        element = self.theme_xml.createElement('nativePagination')
+        value = self.theme_xml.createTextNode(str(native_pagination))
+        element.appendChild(value)
+        background.appendChild(element)
 
     def child_element(self, element, tag, value):
         """
@@ -653,5 +661,6 @@ class ThemeXML(object):
         self.add_display(
             self.display_horizontal_align,
             self.display_vertical_align,
-            self.display_slide_transition
+            self.display_slide_transition,
+            self.display_native_pagination
         )
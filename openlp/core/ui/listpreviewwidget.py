@@ -29,11 +29,40 @@
 """
 The :mod:`listpreviewwidget` is a widget that lists the slides in the slide controller.
 It is based on a QTableWidget but represents its contents in list form.
+
+The pictures of image, media and presentation slides are painted by a delegate. They are only requested when a row is
+painted, i. e. when it is visible. Images are shown as small thumbnails, which the image manager generates in the
+background.
 """
+from collections import OrderedDict
 
 from PyQt4 import QtCore, QtGui
 
 from openlp.core.lib import ImageSource, Registry, ServiceItem
+from openlp.core.lib.imagemanager import Priority
+
+# The number of thumbnails each list keeps as pixmaps.
+THUMBNAIL_CACHE_SIZE = 50
+
+
+class SlideThumbnailDelegate(QtGui.QStyledItemDelegate):
+    """
+    Paints the picture of a slide into its row, scaled to fit the row.
+    """
+    def paint(self, painter, option, index):
+        """
+        Overloaded method from QStyledItemDelegate. Paints the row and the slide's thumbnail, if there is one.
+        """
+        super(SlideThumbnailDelegate, self).paint(painter, option, index)
+        pixmap = self.parent().get_thumbnail(index.row())
+        if pixmap is None or pixmap.isNull():
+            return
+        rect = option.rect.adjusted(4, 4, -4, -4)
+        if not self.parent().service_item.is_media() or pixmap.width() > rect.width() or \
+                pixmap.height() > rect.height():
+            pixmap = pixmap.scaled(rect.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        painter.drawPixmap(rect.x() + (rect.width() - pixmap.width()) // 2,
+            rect.y() + (rect.height() - pixmap.height()) // 2, pixmap)
 
 
 class ListPreviewWidget(QtGui.QTableWidget):
@@ -53,9 +82,18 @@ class ListPreviewWidget(QtGui.QTableWidget):
         self.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.setAlternatingRowColors(True)
+        self.setItemDelegate(SlideThumbnailDelegate(self))
         # Initialize variables.
         self.service_item = ServiceItem()
         self.screen_ratio = screen_ratio
+        # The most recently painted thumbnails, by row.
+        self.thumbnails = OrderedDict()
+        # The rows showing each image, to repaint them once their thumbnail has been generated.
+        self.image_rows = {}
+        self.image_manager_connected = False
+        # The label of the last row and the labels of all rows, to continue them when rendered frames are added.
+        self.row_label = 0
+        self.row_labels = []
 
     def resizeEvent(self, QResizeEvent):
         """
@@ -93,13 +131,41 @@ class ListPreviewWidget(QtGui.QTableWidget):
         Displays the given slide.
         """
         self.service_item = service_item
+        self.thumbnails.clear()
+        self.image_rows = {}
         self.clear()
         self.setRowCount(0)
         self.setColumnWidth(0, width)
-        row = 0
-        text = []
-        for framenumber, frame in enumerate(self.service_item.get_frames()):
-            self.setRowCount(self.slide_count() + 1)
+        if self.service_item.is_image() and not self.image_manager_connected:
+            self.image_manager.image_generated.connect(self.on_image_generated)
+            self.image_manager_connected = True
+        self.row_label = 0
+        self.row_labels = []
+        self._add_rows(width)
+        self.setColumnWidth(0, self.viewport().width())
+        self.setFocus()
+        self.change_slide(slideNumber)
+
+    def add_rendered_frames(self):
+        """
+        Adds the frames of the service item which have been rendered since the list was filled. Text items can be
+        rendered lazily, a few frames at a time.
+        """
+        if len(self.service_item.get_frames(rendered_only=True)) > self.slide_count():
+            self._add_rows(self.columnWidth(0))
+
+    def _add_rows(self, width):
+        """
+        Adds a row for each rendered frame of the service item which is not listed yet.
+
+        ``width``
+            The width of the list.
+        """
+        frames = self.service_item.get_frames(rendered_only=True)
+        start = self.slide_count()
+        self.setRowCount(len(frames))
+        row = self.row_label
+        for framenumber, frame in enumerate(frames[start:], start):
             item = QtGui.QTableWidgetItem()
             slide_height = 0
             if self.service_item.is_text():
@@ -113,30 +179,63 @@ class ListPreviewWidget(QtGui.QTableWidget):
                     row += 1
                 item.setText(frame['text'])
             else:
-                label = QtGui.QLabel()
-                label.setMargin(4)
-                if self.service_item.is_media():
-                    label.setAlignment(QtCore.Qt.AlignHCenter | QtCore.Qt.AlignVCenter)
-                else:
-                    label.setScaledContents(True)
-                if self.service_item.is_command():
-                    label.setPixmap(QtGui.QPixmap(frame['image']))
-                else:
-                    image = self.image_manager.get_image(frame['path'], ImageSource.ImagePlugin)
-                    label.setPixmap(QtGui.QPixmap.fromImage(image))
-                self.setCellWidget(framenumber, 0, label)
+                # The picture of the slide is painted by the delegate, once the row is visible. Requesting it then
+                # raises its priority, so the thumbnails of the hidden rows are only generated when nothing else is.
+                if self.service_item.is_image():
+                    self.image_manager.add_image(frame['path'], ImageSource.Thumbnail, self.service_item.image_border,
+                        Priority.Low)
+                    self.image_rows.setdefault(frame['path'], []).append(framenumber)
                 slide_height = width // self.screen_ratio
                 row += 1
-            text.append(str(row))
+            self.row_labels.append(str(row))
             self.setItem(framenumber, 0, item)
             if slide_height:
                 self.setRowHeight(framenumber, slide_height)
-        self.setVerticalHeaderLabels(text)
+        self.row_label = row
+        self.setVerticalHeaderLabels(self.row_labels)
         if self.service_item.is_text():
             self.resizeRowsToContents()
-        self.setColumnWidth(0, self.viewport().width())
-        self.setFocus()
-        self.change_slide(slideNumber)
+
+    def get_thumbnail(self, row):
+        """
+        Returns the picture of the given slide as a ``QPixmap``. ``None`` is returned for text slides and for images
+        whose thumbnail has not been generated yet.
+
+        ``row``
+            The slide to return the picture of.
+        """
+        if self.service_item.is_text() or row >= len(self.service_item.get_frames()):
+            return None
+        if row in self.thumbnails:
+            self.thumbnails.move_to_end(row)
+            return self.thumbnails[row]
+        frame = self.service_item.get_frames()[row]
+        if self.service_item.is_command():
+            pixmap = QtGui.QPixmap(frame['image'])
+        else:
+            image = self.image_manager.request_image(frame['path'], ImageSource.Thumbnail)
+            if image is None:
+                return None
+            pixmap = QtGui.QPixmap.fromImage(image)
+        self.thumbnails[row] = pixmap
+        if len(self.thumbnails) > THUMBNAIL_CACHE_SIZE:
+            self.thumbnails.popitem(last=False)
+        return pixmap
+
+    def on_image_generated(self, path, source):
+        """
+        Repaint the rows showing an image, once its thumbnail has been generated.
+
+        ``path``
+            The path of the image.
+
+        ``source``
+            The source of the image.
+        """
+        if source != ImageSource.Thumbnail:
+            return
+        for row in self.image_rows.get(path, []):
+            self.update(self.model().index(row, 0))
 
     def change_slide(self, slide):
         """
@@ -44,8 +44,10 @@ import sys
 from PyQt4 import QtCore, QtGui, QtWebKit, QtOpenGL
 from PyQt4.phonon import Phonon
 
-from openlp.core.lib import ServiceItem, Settings, ImageSource, Registry, build_html, expand_tags, \
-    image_to_byte, translate
+from openlp.core.lib import ServiceItem, Settings, ImageSource, Registry, build_html, build_item_update, \
+    build_lyrics_html, expand_tags, image_data_uri, image_to_byte, translate
+from openlp.core.lib.htmlbuilder import webkit_version
+from openlp.core.lib.imagemanager import DISPLAY_IMAGE_TIMEOUT
 from openlp.core.lib.theme import BackgroundType
 
 from openlp.core.lib import ScreenList
@@ -53,6 +55,9 @@ from openlp.core.ui import HideMode, AlertLocation
 
 log = logging.getLogger(__name__)
 
+# Milliseconds between checks whether the display is ready, in case the page does not tell us.
+READY_CHECK_INTERVAL = 100
+
 
 class Display(QtGui.QGraphicsView):
     """
@@ -118,6 +123,26 @@ class Display(QtGui.QGraphicsView):
         self.web_loaded = True
 
 
+class DisplayBridge(QtCore.QObject):
+    """
+    Object which is exposed to the JavaScript of the display page as ``openlp_display``. The page uses it to tell the
+    display when a text transition has finished or an image has been loaded.
+    """
+    def __init__(self, display):
+        """
+        Constructor
+        """
+        super(DisplayBridge, self).__init__(display)
+        self.display = display
+
+    @QtCore.pyqtSlot()
+    def page_changed(self):
+        """
+        Called by the page when a transition has finished or an image has been loaded.
+        """
+        self.display.check_ready()
+
+
 class MainDisplay(Display):
     """
     This is the display screen as a specialized class from the Display class
@@ -139,6 +164,19 @@ class MainDisplay(Display):
             self.audio_player = None
         self.first_time = True
         self.web_loaded = True
+        # Callbacks waiting for the display to be ready, as (callback, wait_for_text) tuples.
+        self.ready_callbacks = []
+        # Callbacks waiting for the next preview grab.
+        self.preview_callbacks = []
+        # The latest slide passed to text() while the page was still loading, as (slide, animate).
+        self.pending_text = None
+        self.bridge = DisplayBridge(self)
+        # The page tells us when it changes, this timer is only a safety net in case a notification gets lost.
+        self.ready_timer = QtCore.QTimer(self)
+        self.ready_timer.setInterval(READY_CHECK_INTERVAL)
+        self.ready_timer.timeout.connect(self.check_ready)
+        # The lyrics HTML of the current page. Pages with the same lyrics HTML are updated in place for a new item.
+        self.page_lyrics_html = None
         self.setStyleSheet('border: 0px; margin: 0px; padding: 0px;')
         window_flags = QtCore.Qt.FramelessWindowHint | QtCore.Qt.Tool | QtCore.Qt.WindowStaysOnTopHint
         if Settings().value('advanced/x11 bypass wm'):
@@ -193,6 +231,8 @@ class MainDisplay(Display):
         self.screen = self.screens.current
         self.setVisible(False)
         Display.setup(self)
+        self.frame.javaScriptWindowObjectCleared.connect(self.add_display_bridge)
+        self.page_lyrics_html = None
         if self.is_live:
             # Build the initial frame.
             background_color = QtGui.QColor()
@@ -230,9 +270,13 @@ class MainDisplay(Display):
             Perform transitions if applicable when setting the text
         """
         log.debug('text to display')
-        # Wait for the webview to update before displaying text.
-        while not self.web_loaded:
-            self.application.process_events()
+        # Wait for the webview to update before displaying text. Only the latest slide is shown once the page has
+        # been loaded, so going through the slides quickly does not queue up transitions.
+        if not self.web_loaded:
+            if self.pending_text is None:
+                self.call_when_ready(self._show_pending_text)
+            self.pending_text = (slide, animate)
+            return
         self.setGeometry(self.screen['size'])
         if animate:
             self.frame.evaluateJavaScript('show_text("%s")' % slide.replace('\\', '\\\\').replace('\"', '\\\"'))
@@ -246,6 +290,62 @@ class MainDisplay(Display):
             self.frame.findFirstElement("#lyricsoutline").setInnerXml(slide)
             self.frame.findFirstElement("#lyricsshadow").setInnerXml(slide)
 
+    def _show_pending_text(self):
+        """
+        Show the latest slide which was passed to text() while the page was loading.
+        """
+        if self.pending_text is None:
+            return
+        slide, animate = self.pending_text
+        self.pending_text = None
+        self.text(slide, animate)
+
+    def add_display_bridge(self):
+        """
+        Make the display bridge available to the JavaScript of a new page.
+        """
+        self.frame.addToJavaScriptWindowObject('openlp_display', self.bridge)
+
+    def is_web_loaded(self):
+        """
+        Called by webView event to show display is fully loaded
+        """
+        super(MainDisplay, self).is_web_loaded()
+        self.check_ready()
+
+    def call_when_ready(self, callback, wait_for_text=False):
+        """
+        Call ``callback`` as soon as the page has been loaded and its images have been decoded. The callbacks are
+        called in the order they were added.
+
+        ``callback``
+            The function to call without any arguments.
+
+        ``wait_for_text``
+            Also wait for the current text transition to finish.
+        """
+        self.ready_callbacks.append((callback, wait_for_text))
+        self.check_ready()
+
+    def check_ready(self):
+        """
+        Call the waiting callbacks whose conditions are met. This is called whenever the page tells us it has changed.
+        """
+        while self.ready_callbacks:
+            # A callback might change the page, so check again before each one.
+            if not self.web_loaded or \
+                    self.frame.evaluateJavaScript('typeof images_loaded == "function" && !images_loaded()'):
+                self.ready_timer.start()
+                return
+            callback, wait_for_text = self.ready_callbacks[0]
+            if wait_for_text and not self.frame.evaluateJavaScript(
+                    'typeof show_text_completed != "function" || show_text_completed()'):
+                self.ready_timer.start()
+                return
+            self.ready_callbacks.pop(0)
+            callback()
+        self.ready_timer.stop()
+
     def alert(self, text, location):
         """
         Display an alert.
@@ -303,7 +403,7 @@ class MainDisplay(Display):
             re-added to the image manager.
         """
         log.debug('image to display')
-        image = self.image_manager.get_image_bytes(path, ImageSource.ImagePlugin)
+        image = self.image_manager.get_image_bytes(path, ImageSource.ImagePlugin, DISPLAY_IMAGE_TIMEOUT)
         self.controller.media_controller.media_reset(self.controller)
         self.display_image(image)
 
@@ -313,7 +413,7 @@ class MainDisplay(Display):
         """
         self.setGeometry(self.screen['size'])
         if image:
-            js = 'show_image("data:image/png;base64,%s");' % image
+            js = 'show_image("%s");' % image_data_uri(image)
         else:
             js = 'show_image("");'
         self.frame.evaluateJavaScript(js)
@@ -328,37 +428,47 @@ class MainDisplay(Display):
             self.display_image(self.service_item.bg_image_bytes)
         else:
             self.display_image(None)
+        # clear the cache
+        self.override = {}
         # Update the preview frame.
         if self.is_live:
             self.live_controller.update_preview()
-        # clear the cache
-        self.override = {}
 
-    def preview(self):
+    def grab_preview(self, callback, size=None):
         """
-        Generates a preview of the image displayed.
+        Grab a preview of the image displayed as soon as the display is ready and pass it to ``callback``. Requests
+        made while a grab is waiting share its preview.
+
+        ``callback``
+            The function to call with the preview pixmap.
+
+        ``size``
+            The size of the preview. The display is rendered directly in this size, instead of grabbing it in full
+            size and scaling it down. Defaults to the size of the display.
         """
-        log.debug('preview for %s', self.is_live)
+        self.preview_callbacks.append((callback, size))
+        if len(self.preview_callbacks) > 1:
+            return
         was_visible = self.isVisible()
-        self.application.process_events()
-        # We must have a service item to preview.
-        if self.is_live and hasattr(self, 'service_item'):
-            # Wait for the fade to finish before geting the preview.
-            # Important otherwise preview will have incorrect text if at all!
-            if self.service_item.themedata and self.service_item.themedata.display_slide_transition:
-                while not self.frame.evaluateJavaScript('show_text_completed()'):
-                    self.application.process_events()
-        # Wait for the webview to update before getting the preview.
-        # Important otherwise first preview will miss the background !
-        while not self.web_loaded:
-            self.application.process_events()
+        # We must have a service item to preview. Wait for the fade to finish before geting the preview, otherwise
+        # the preview will have incorrect text if at all!
+        wait_for_text = self.is_live and hasattr(self, 'service_item') and self.service_item.themedata and \
+            self.service_item.themedata.display_slide_transition
+        self.call_when_ready(lambda: self._grab_preview(was_visible), bool(wait_for_text))
+
+    def _grab_preview(self, was_visible):
+        """
+        Grab the preview for the waiting callbacks.
+
+        ``was_visible``
+            Whether the display was visible when the preview was requested.
+        """
         # if was hidden keep it hidden
         if self.is_live:
             if self.hide_mode:
                 self.hide_display(self.hide_mode)
-            # Only continue if the visibility wasn't changed during method call.
+            # Only continue if the visibility wasn't changed while waiting.
             elif was_visible == self.isVisible():
-
                 # Single screen active
                 if self.screens.display_count == 1:
                     # Only make visible if setting enabled.
@@ -366,15 +476,39 @@ class MainDisplay(Display):
                         self.setVisible(True)
                 else:
                     self.setVisible(True)
-        return QtGui.QPixmap.grabWidget(self)
+        callbacks, self.preview_callbacks = self.preview_callbacks, []
+        pixmaps = {}
+        for callback, size in callbacks:
+            key = (size.width(), size.height()) if size else None
+            if key not in pixmaps:
+                pixmaps[key] = self.render_preview(size)
+            callback(pixmaps[key])
+
+    def render_preview(self, size=None):
+        """
+        Render the display into a pixmap straight away.
+
+        ``size``
+            The size of the pixmap. Defaults to the size of the display.
+        """
+        if not size or size == self.size() or size.isEmpty():
+            return QtGui.QPixmap.grabWidget(self)
+        pixmap = QtGui.QPixmap(size)
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.scale(size.width() / self.width(), size.height() / self.height())
+        self.render(painter)
+        painter.end()
+        return pixmap
 
     def build_html(self, service_item, image_path=''):
         """
         Store the service_item and build the new HTML from it. Add the
-        HTML to the display
+        HTML to the display. If the current page has the same structure, it
+        is updated in place instead of loading a new page.
         """
         log.debug('build_html')
-        self.web_loaded = False
         self.initial_fame = None
         self.service_item = service_item
         background = None
@@ -390,22 +524,31 @@ class MainDisplay(Display):
                 self.override = {}
             else:
                 # replace the background
-                background = self.image_manager.get_image_bytes(self.override['image'], ImageSource.ImagePlugin)
+                background = self.image_manager.get_image_bytes(self.override['image'], ImageSource.ImagePlugin,
+                    DISPLAY_IMAGE_TIMEOUT)
         self.set_transparency(self.service_item.themedata.background_type ==
             BackgroundType.to_string(BackgroundType.Transparent))
         if self.service_item.themedata.background_filename:
             self.service_item.bg_image_bytes = self.image_manager.get_image_bytes(
-                self.service_item.themedata.background_filename, ImageSource.Theme
+                self.service_item.themedata.background_filename, ImageSource.Theme, DISPLAY_IMAGE_TIMEOUT
             )
         if image_path:
-            image_bytes = self.image_manager.get_image_bytes(image_path, ImageSource.ImagePlugin)
+            image_bytes = self.image_manager.get_image_bytes(image_path, ImageSource.ImagePlugin, DISPLAY_IMAGE_TIMEOUT)
         else:
             image_bytes = None
-        html = build_html(self.service_item, self.screen, self.is_live, background, image_bytes,
-            plugins=self.plugin_manager.plugins)
-        log.debug('buildHtml - pre setHtml')
-        self.web_view.setHtml(html)
-        log.debug('buildHtml - post setHtml')
+        lyrics_html = build_lyrics_html(self.service_item, webkit_version())
+        if self.web_loaded and lyrics_html == self.page_lyrics_html:
+            log.debug('buildHtml - update page')
+            self.frame.evaluateJavaScript(build_item_update(self.service_item, self.screen, self.is_live, background,
+                image_bytes))
+        else:
+            self.web_loaded = False
+            html = build_html(self.service_item, self.screen, self.is_live, background, image_bytes,
+                plugins=self.plugin_manager.plugins)
+            log.debug('buildHtml - pre setHtml')
+            self.web_view.setHtml(html)
+            log.debug('buildHtml - post setHtml')
+            self.page_lyrics_html = lyrics_html
         if service_item.foot_text:
             self.footer(service_item.foot_text)
         # if was hidden keep it hidden
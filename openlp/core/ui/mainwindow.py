@@ -257,6 +257,8 @@ class Ui_MainWindow(object):
             'toolsAddToolItem', icon=':/tools/tools_add.png', category=UiStrings().Tools, can_shortcuts=True)
         self.tools_open_data_folder = create_action(main_window,
             'toolsOpenDataFolder', icon=':/general/general_open.png', category=UiStrings().Tools, can_shortcuts=True)
+        self.tools_clear_image_cache = create_action(main_window,
+            'toolsClearImageCache', category=UiStrings().Tools, can_shortcuts=True)
         self.tools_first_time_wizard = create_action(main_window,
             'toolsFirstTimeWizard', icon=':/general/general_revert.png',
             category=UiStrings().Tools, can_shortcuts=True)
@@ -337,7 +339,7 @@ class Ui_MainWindow(object):
             add_actions(self.settings_menu, (self.settingsPluginListItem, self.settings_language_menu.menuAction(),
                 None, self.formatting_tag_item, self.settings_shortcuts_item, self.settings_configure_item))
         add_actions(self.tools_menu, (self.tools_add_tool_item, None))
-        add_actions(self.tools_menu, (self.tools_open_data_folder, None))
+        add_actions(self.tools_menu, (self.tools_open_data_folder, self.tools_clear_image_cache, None))
         add_actions(self.tools_menu, (self.tools_first_time_wizard, None))
         add_actions(self.tools_menu, [self.update_theme_images])
         if os.name == 'nt':
@@ -451,6 +453,9 @@ class Ui_MainWindow(object):
         self.tools_open_data_folder.setText(translate('OpenLP.MainWindow', 'Open &Data Folder...'))
         self.tools_open_data_folder.setStatusTip(translate('OpenLP.MainWindow',
             'Open the folder where songs, bibles and other data resides.'))
+        self.tools_clear_image_cache.setText(translate('OpenLP.MainWindow', 'Clear &Image Cache'))
+        self.tools_clear_image_cache.setStatusTip(translate('OpenLP.MainWindow',
+            'Delete the resized images which are kept to speed up starting OpenLP.'))
         self.tools_first_time_wizard.setText(translate('OpenLP.MainWindow', 'Re-run First Time Wizard'))
         self.tools_first_time_wizard.setStatusTip(translate('OpenLP.MainWindow',
             'Re-run the First Time Wizard, importing songs, Bibles and themes.'))
@@ -521,6 +526,7 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         self.export_theme_item.triggered.connect(self.theme_manager_contents.on_export_theme)
         self.web_site_item.triggered.connect(self.on_help_web_site_clicked)
         self.tools_open_data_folder.triggered.connect(self.on_tools_open_data_folder_clicked)
+        self.tools_clear_image_cache.triggered.connect(self.on_tools_clear_image_cache_clicked)
         self.tools_first_time_wizard.triggered.connect(self.on_first_time_wzard_clicked)
         self.update_theme_images.triggered.connect(self.on_update_theme_images)
         self.formatting_tag_item.triggered.connect(self.on_formatting_tag_item_clicked)
@@ -770,6 +776,12 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         path = AppLocation.get_data_path()
         QtGui.QDesktopServices.openUrl(QtCore.QUrl("file:///" + path))
 
+    def on_tools_clear_image_cache_clicked(self):
+        """
+        Delete the resized images cached on disk
+        """
+        self.image_manager.purge_disk_cache()
+
     def on_update_theme_images(self):
         """
         Updates the new theme preview images.
@@ -1055,7 +1067,7 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
             Switch to prevent saving settings. Defaults to **True**.
         """
         self.image_manager.stop_manager = True
-        while self.image_manager.image_thread.isRunning():
+        while self.image_manager.is_running():
             time.sleep(0.1)
         # Clean temporary files used by services
         self.service_manager_contents.clean_up()
@@ -1284,11 +1296,11 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         self.load_progress_bar.setValue(0)
         self.application.process_events()
 
-    def increment_progress_bar(self):
+    def increment_progress_bar(self, increment=1):
         """
-        Increase the Progress Bar value by 1
+        Increase the Progress Bar value by ``increment``, which defaults to 1
         """
-        self.load_progress_bar.setValue(self.load_progress_bar.value() + 1)
+        self.load_progress_bar.setValue(self.load_progress_bar.value() + increment)
         self.application.process_events()
 
     def finished_progress_bar(self):
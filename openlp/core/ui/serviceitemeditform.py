@@ -67,8 +67,7 @@ class ServiceItemEditForm(QtGui.QDialog, Ui_ServiceItemEditDialog):
         if self.data:
             self.item._raw_frames = []
             if self.item.is_image():
-                for item in self.item_list:
-                    self.item.add_from_image(item['path'], item['title'])
+                self.item.add_from_images([(item['path'], item['title']) for item in self.item_list])
             self.item.render()
         return self.item
 
@@ -30,20 +30,36 @@
 The service manager sets up, loads, saves and manages services.
 """
 import cgi
+import hashlib
 import logging
 import os
 import shutil
+import struct
+import time
+import warnings
 import zipfile
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import mkstemp
 from datetime import datetime, timedelta
 
 log = logging.getLogger(__name__)
 
+# The number of bytes extracted from a service file in one go, before the user interface gets the chance to respond.
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+# The number of threads used to check and compare the media files of a service when it is saved.
+SAVE_THREADS = 8
+# The number of times the service data may be appended to a service file, before the file is written from scratch.
+MAX_SERVICE_DATA_COPIES = 10
+# The signature of the end of central directory record of a zip file, and the largest size the record can have.
+END_OF_CENTRAL_DIRECTORY = b'PK\x05\x06'
+END_OF_CENTRAL_DIRECTORY_SIZE = 22 + 65535
+
 from PyQt4 import QtCore, QtGui
 
-from openlp.core.lib import OpenLPToolbar, ServiceItem, ItemCapabilities, Settings, PluginStatus, Registry, \
-    UiStrings, build_icon, translate, str_to_bool, check_directory_exists
+from openlp.core.lib import OpenLPToolbar, ServiceItem, ServiceItemType, ItemCapabilities, Settings, PluginStatus, \
+    Registry, UiStrings, build_icon, translate, str_to_bool, check_directory_exists
 from openlp.core.lib.theme import ThemeLevel
 from openlp.core.lib.ui import critical_error_message_box, create_widget_action, find_and_set_in_combo_box
 from openlp.core.ui import ServiceNoteForm, ServiceItemEditForm, StartTimeForm
@@ -52,6 +68,44 @@ from openlp.core.utils import AppLocation, delete_file, split_filename, format_t
 from openlp.core.utils.actions import ActionList, CategoryOrder
 
 
+def get_safe_member_name(member_name):
+    """
+    Returns the relative path a member of a service file is extracted to. Like ``ZipFile.extract`` absolute paths, drive
+    letters and ``..`` are removed, so that the file cannot end up outside of the service path.
+
+    ``member_name``
+        The name of the member in the service file.
+    """
+    member_name = member_name.replace('/', os.path.sep)
+    if os.path.altsep:
+        member_name = member_name.replace(os.path.altsep, os.path.sep)
+    member_name = os.path.splitdrive(member_name)[1]
+    return os.path.sep.join(part for part in member_name.split(os.path.sep)
+        if part not in ('', os.path.curdir, os.path.pardir))
+
+
+def get_central_directory_offset(file_name):
+    """
+    Returns the offset of the central directory of a zip file, which is where the next member is added when the file is
+    appended to. Returns ``None`` if the offset cannot be found, e. g. because the file uses the Zip64 extensions.
+
+    ``file_name``
+        The zip file.
+    """
+    with open(file_name, 'rb') as zip_file:
+        zip_file.seek(0, os.SEEK_END)
+        file_size = zip_file.tell()
+        zip_file.seek(max(file_size - END_OF_CENTRAL_DIRECTORY_SIZE, 0))
+        data = zip_file.read()
+    position = data.rfind(END_OF_CENTRAL_DIRECTORY)
+    if position == -1 or len(data) < position + 22:
+        return None
+    offset = struct.unpack('<I', data[position + 16:position + 20])[0]
+    if offset == 0xFFFFFFFF:
+        return None
+    return offset
+
+
 class ServiceManagerList(QtGui.QTreeWidget):
     """
     Set up key bindings and mouse behaviour for the service list
@@ -308,6 +362,15 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         self._modified = False
         self._file_name = ''
         self.service_has_all_original_files = True
+        # The media files of a loaded service which have not been extracted to the service path yet.
+        self.extract_zip = None
+        self.extract_queue = []
+        self.extract_waiting = {}
+        self.extract_sizes = {}
+        self.extract_current = None
+        self.extract_timer = QtCore.QTimer(self)
+        self.extract_timer.setSingleShot(True)
+        self.extract_timer.timeout.connect(self.on_extract_timer)
         self.service_note_form = ServiceNoteForm()
         self.service_item_edit_form = ServiceItemEditForm()
         self.start_time_form = StartTimeForm()
@@ -437,6 +500,7 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         """
         self.service_manager_list.clear()
         self.service_items = []
+        self.cancel_extract()
         self.set_file_name('')
         self.service_id += 1
         self.set_modified(False)
@@ -447,16 +511,14 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         """
         Save the current service file.
 
-        A temporary file is created so that we don't overwrite the existing one and leave a mangled service file should
-        there be an error when saving. Audio files are also copied into the service manager directory, and then packaged
-        into the zip file.
+        When the media files in the existing service file are still the ones of the service, only new media files are
+        appended to it and the service data is replaced. Otherwise a temporary file is written next to the existing one
+        and renamed over it, so that we don't leave a mangled service file should there be an error when saving. Audio
+        files are also copied into the service manager directory, and then packaged into the zip file.
         """
         if not self.file_name():
             return self.save_file_as()
-        temp_file, temp_file_name = mkstemp('.osz', 'openlp_')
-        # We don't need the file handle.
-        os.close(temp_file)
-        log.debug(temp_file_name)
+        self.finish_extract()
         path_file_name = str(self.file_name())
         path, file_name = os.path.split(path_file_name)
         base_name = os.path.splitext(file_name)[0]
@@ -464,25 +526,19 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         log.debug('ServiceManager.save_file - %s', path_file_name)
         Settings().setValue(self.main_window.service_manager_settings_section + '/last directory', path)
         service = []
-        write_list = []
-        missing_list = []
+        file_names = []
         audio_files = []
-        total_size = 0
         self.application.set_busy_cursor()
-        # Number of items + 1 to zip it
-        self.main_window.display_progress_bar(len(self.service_items) + 1)
         # Get list of missing files, and list of files to write
         for item in self.service_items:
             if not item['service_item'].uses_file():
                 continue
             for frame in item['service_item'].get_frames():
-                path_from = item['service_item'].get_frame_path(frame=frame)
-                if path_from in write_list or path_from in missing_list:
-                    continue
-                if not os.path.exists(path_from):
-                    missing_list.append(path_from)
-                else:
-                    write_list.append(path_from)
+                file_names.append(item['service_item'].get_frame_path(frame=frame))
+        file_sizes = self._get_file_sizes(file_names)
+        missing_list = [file_name for file_name in file_sizes if file_sizes[file_name] is None]
+        write_list = self._remove_duplicate_files(
+            [file_name for file_name in file_sizes if file_sizes[file_name] is not None], file_sizes)
         if missing_list:
             self.application.set_normal_cursor()
             title = translate('OpenLP.ServiceManager', 'Service File(s) Missing')
@@ -492,12 +548,11 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
             answer = QtGui.QMessageBox.critical(self, title, message,
                 QtGui.QMessageBox.StandardButtons(QtGui.QMessageBox.Ok | QtGui.QMessageBox.Cancel))
             if answer == QtGui.QMessageBox.Cancel:
-                self.main_window.finished_progress_bar()
                 return False
         # Check if item contains a missing file.
+        missing_files = set(missing_list)
         for item in list(self.service_items):
-            self.main_window.increment_progress_bar()
-            item['service_item'].remove_invalid_frames(missing_list)
+            item['service_item'].remove_invalid_frames(missing_files)
             if item['service_item'].missing_frames():
                 self.service_items.remove(item)
             else:
@@ -510,24 +565,15 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
                 # Add the service item to the service.
                 service.append({'serviceitem': service_item})
         self.repaint_service_list(-1, -1)
-        for file_item in write_list:
-            file_size = os.path.getsize(file_item)
-            total_size += file_size
+        members = [(write_from, write_from) for write_from in write_list]
+        total_size = sum(file_sizes[write_from] for write_from in write_list)
         log.debug('ServiceManager.save_file - ZIP contents size is %i bytes' % total_size)
         service_content = json.dumps(service)
         # Usual Zip file cannot exceed 2GiB, file with Zip64 cannot be extracted using unzip in UNIX.
         allow_zip_64 = (total_size > 2147483648 + len(service_content))
         log.debug('ServiceManager.save_file - allowZip64 is %s' % allow_zip_64)
-        zip_file = None
         success = True
-        self.main_window.increment_progress_bar()
         try:
-            zip_file = zipfile.ZipFile(temp_file_name, 'w', zipfile.ZIP_STORED, allow_zip_64)
-            # First we add service contents..
-            zip_file.writestr(service_file_name, service_content)
-            # Finally add all the listed media files.
-            for write_from in write_list:
-                zip_file.write(write_from, write_from)
             for audio_from, audio_to in audio_files:
                 if audio_from.startswith('audio'):
                     # When items are saved, they get new unique_identifier. Let's copy the file to the new location.
@@ -538,28 +584,238 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
                 check_directory_exists(save_path)
                 if not os.path.exists(save_file):
                     shutil.copy(audio_from, save_file)
-                zip_file.write(audio_from, audio_to)
-        except IOError:
-            log.exception('Failed to save service to disk: %s', temp_file_name)
+                members.append((audio_from, audio_to))
+                total_size += os.path.getsize(audio_from)
+            # The progress is shown in kilobytes of the files written, plus one for the service data.
+            self.main_window.display_progress_bar(total_size // 1024 + 1)
+            if not self._update_service_file(path_file_name, service_file_name, service_content, members):
+                self._write_service_file(path_file_name, service_file_name, service_content, members, allow_zip_64)
+        except (IOError, OSError):
+            log.exception('Failed to save service to disk: %s', path_file_name)
             self.main_window.error_message(translate('OpenLP.ServiceManager', 'Error Saving File'),
                 translate('OpenLP.ServiceManager', 'There was an error saving your file.')
             )
             success = False
-        finally:
-            if zip_file:
-                zip_file.close()
         self.main_window.finished_progress_bar()
         self.application.set_normal_cursor()
         if success:
-            try:
-                shutil.copy(temp_file_name, path_file_name)
-            except shutil.Error:
-                return self.save_file_as()
             self.main_window.add_recent_file(path_file_name)
             self.set_modified(False)
-        delete_file(temp_file_name)
         return success
 
+    def _write_service_file(self, path_file_name, service_file_name, service_content, members, allow_zip_64):
+        """
+        Write a complete service file. The file is written to a temporary file in the same directory first, which is
+        then renamed to the service file, so that an existing service file is replaced in one go.
+
+        ``path_file_name``
+            The service file to write.
+
+        ``service_file_name``
+            The name of the service data in the service file.
+
+        ``service_content``
+            The service data.
+
+        ``members``
+            A list of tuples with the media files to add and their names in the service file.
+
+        ``allow_zip_64``
+            Whether the service file needs the Zip64 extensions.
+        """
+        temp_file, temp_file_name = mkstemp('.osz', 'openlp_', os.path.split(path_file_name)[0])
+        # We don't need the file handle.
+        os.close(temp_file)
+        log.debug(temp_file_name)
+        zip_file = None
+        try:
+            zip_file = zipfile.ZipFile(temp_file_name, 'w', zipfile.ZIP_STORED, allow_zip_64)
+            for write_from, write_to in members:
+                zip_file.write(write_from, write_to)
+                self.main_window.increment_progress_bar(os.path.getsize(write_from) // 1024)
+            # The service data goes last, so that the next save can append new media files and service data.
+            zip_file.writestr(service_file_name, service_content)
+            zip_file.close()
+            zip_file = None
+            os.replace(temp_file_name, path_file_name)
+            self.main_window.increment_progress_bar()
+        finally:
+            if zip_file:
+                zip_file.close()
+            delete_file(temp_file_name)
+
+    def _update_service_file(self, path_file_name, service_file_name, service_content, members):
+        """
+        Update an existing service file. Media files which are not in the service file yet and the service data are
+        appended to the service file in place, so the media files already in it are neither read nor written again. If
+        appending fails, the file is truncated back to where the new members started and its old central directory is
+        restored. The previous service data stays in the file, but only the last one is read when the service is
+        loaded. Returns ``False`` without changing anything if the service file needs to be written from scratch, e. g.
+        because media files in it have changed or are no longer used.
+
+        ``path_file_name``
+            The service file to update.
+
+        ``service_file_name``
+            The name of the service data in the service file.
+
+        ``service_content``
+            The service data.
+
+        ``members``
+            A list of tuples with the media files of the service and their names in the service file.
+        """
+        if not os.path.isfile(path_file_name) or not zipfile.is_zipfile(path_file_name):
+            return False
+        with zipfile.ZipFile(path_file_name) as zip_file:
+            zip_infos = sorted(zip_file.infolist(), key=lambda zip_info: zip_info.header_offset)
+        if not zip_infos or not zip_infos[-1].filename.endswith('osj'):
+            return False
+        media_infos = [zip_info for zip_info in zip_infos if not zip_info.filename.endswith('osj')]
+        # Write the service file from scratch once too much old service data has piled up.
+        if len(zip_infos) - len(media_infos) >= MAX_SERVICE_DATA_COPIES:
+            return False
+        existing = dict((zip_info.filename, zip_info) for zip_info in media_infos)
+        if len(existing) != len(media_infos):
+            return False
+        new_members = []
+        unchanged_size = 0
+        used = set()
+        for write_from, write_to in members:
+            zip_name = self._get_zip_name(write_to)
+            if zip_name in used:
+                continue
+            used.add(zip_name)
+            if zip_name not in existing:
+                new_members.append((write_from, write_to))
+            elif not self._is_zip_member_current(existing[zip_name], write_from):
+                return False
+            else:
+                unchanged_size += existing[zip_name].file_size
+        if not used.issuperset(existing):
+            return False
+        central_directory_offset = get_central_directory_offset(path_file_name)
+        if central_directory_offset is None:
+            return False
+        log.debug('ServiceManager.save_file - appending %d of %d files' % (len(new_members), len(used)))
+        # Keep the central directory, so the file can be restored if appending fails.
+        with open(path_file_name, 'rb') as service_file:
+            service_file.seek(central_directory_offset)
+            central_directory = service_file.read()
+        self.main_window.increment_progress_bar(unchanged_size // 1024)
+        zip_file = None
+        try:
+            zip_file = zipfile.ZipFile(path_file_name, 'a', zipfile.ZIP_STORED, True)
+            for write_from, write_to in new_members:
+                zip_file.write(write_from, write_to)
+                self.main_window.increment_progress_bar(os.path.getsize(write_from) // 1024)
+            with warnings.catch_warnings():
+                # The previous service data has the same name.
+                warnings.simplefilter('ignore', UserWarning)
+                zip_file.writestr(service_file_name, service_content)
+            zip_file.close()
+            zip_file = None
+        except:
+            log.exception('Failed to append to the service file, restoring it: %s', path_file_name)
+            if zip_file:
+                try:
+                    zip_file.close()
+                except (IOError, OSError):
+                    pass
+            with open(path_file_name, 'r+b') as service_file:
+                service_file.truncate(central_directory_offset)
+                service_file.seek(central_directory_offset)
+                service_file.write(central_directory)
+            raise
+        self.main_window.increment_progress_bar()
+        return True
+
+    def _get_file_sizes(self, file_names):
+        """
+        Look up the sizes of the given files in parallel. Returns a dictionary, which maps each file name to the size of
+        the file or to ``None`` if the file is missing. It keeps the order of the file names, leaving out duplicates.
+
+        ``file_names``
+            The files to look up.
+        """
+        file_names = list(OrderedDict.fromkeys(file_names))
+
+        def get_file_size(file_name):
+            try:
+                return os.stat(file_name).st_size
+            except OSError:
+                return None
+        with ThreadPoolExecutor(SAVE_THREADS) as executor:
+            return OrderedDict(zip(file_names, executor.map(get_file_size, file_names)))
+
+    def _remove_duplicate_files(self, file_names, file_sizes):
+        """
+        Remove copies of the same file from the given files. The files are extracted by their name when the service is
+        loaded, so only files with the same name and size are compared by their contents. Those are hashed in parallel.
+
+        ``file_names``
+            The files to write.
+
+        ``file_sizes``
+            A dictionary with the sizes of the files.
+        """
+        candidates = {}
+        for file_name in file_names:
+            candidates.setdefault((os.path.basename(file_name), file_sizes[file_name]), []).append(file_name)
+        to_hash = [file_name for group in candidates.values() if len(group) > 1 for file_name in group]
+        if not to_hash:
+            return file_names
+
+        def get_file_hash(file_name):
+            file_hash = hashlib.sha1()
+            try:
+                with open(file_name, 'rb') as media_file:
+                    for block in iter(lambda: media_file.read(EXTRACT_CHUNK_SIZE), b''):
+                        file_hash.update(block)
+            except IOError:
+                # Should the file not be readable, it is kept and the error is reported when it is written.
+                return file_name
+            return file_hash.hexdigest()
+        with ThreadPoolExecutor(SAVE_THREADS) as executor:
+            file_hashes = dict(zip(to_hash, executor.map(get_file_hash, to_hash)))
+        unique_files = []
+        seen = set()
+        for file_name in file_names:
+            key = (os.path.basename(file_name), file_hashes.get(file_name, file_name))
+            if key in seen:
+                log.debug('ServiceManager.save_file - %s is a copy of another file' % file_name)
+                continue
+            seen.add(key)
+            unique_files.append(file_name)
+        return unique_files
+
+    def _get_zip_name(self, file_name):
+        """
+        Returns the name a file gets in a zip file, when it is added with the given name.
+
+        ``file_name``
+            The name the file is added with.
+        """
+        zip_name = os.path.normpath(os.path.splitdrive(file_name)[1])
+        zip_name = zip_name.lstrip(os.sep + (os.altsep or ''))
+        return zip_name.replace(os.sep, '/')
+
+    def _is_zip_member_current(self, zip_info, file_name):
+        """
+        Check whether a file in a zip file is still the same as the file on disk. Zip files only store the modification
+        time with a precision of two seconds.
+
+        ``zip_info``
+            The file in the zip file.
+
+        ``file_name``
+            The file on disk.
+        """
+        file_stat = os.stat(file_name)
+        date_time = time.localtime(file_stat.st_mtime)[0:6]
+        date_time = date_time[0:5] + (date_time[5] // 2 * 2,)
+        return zip_info.file_size == file_stat.st_size and tuple(zip_info.date_time) == date_time
+
     def save_local_file(self):
         """
         Save the current service file but leave all the file references alone to point to the current machine.
@@ -681,10 +937,11 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         if not os.path.exists(file_name):
             return False
         zip_file = None
-        file_to = None
         self.application.set_busy_cursor()
         try:
             zip_file = zipfile.ZipFile(file_name)
+            service_info = None
+            members = {}
             for zip_info in zip_file.infolist():
                 try:
                     ucs_file = zip_info.filename
@@ -693,24 +950,22 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
                     critical_error_message_box(message=translate('OpenLP.ServiceManager',
                         'File is not a valid service.\n The content encoding is not UTF-8.'))
                     continue
-                osfile = ucs_file.replace('/', os.path.sep)
+                osfile = get_safe_member_name(ucs_file)
                 if not osfile.startswith('audio'):
                     osfile = os.path.split(osfile)[1]
-                log.debug('Extract file: %s', osfile)
                 zip_info.filename = osfile
-                zip_file.extract(zip_info, self.servicePath)
                 if osfile.endswith('osj') or osfile.endswith('osd'):
-                    p_file = os.path.join(self.servicePath, osfile)
-            if 'p_file' in locals():
-                file_to = open(p_file, 'r')
-                if p_file.endswith('osj'):
-                    items = json.load(file_to)
+                    service_info = zip_info
                 else:
+                    members[osfile] = zip_info
+            if service_info:
+                if not service_info.filename.endswith('osj'):
                     critical_error_message_box(message=translate('OpenLP.ServiceManager',
                         'The service file you are trying to open is in an old format.\n '
                         'Please save it using OpenLP 2.0.2 or greater.'))
                     return
-                file_to.close()
+                # The service data is read straight from the archive, the media files are extracted afterwards.
+                items = json.loads(zip_file.read(service_info).decode('utf-8'))
                 self.new_file()
                 self.set_file_name(file_name)
                 self.main_window.display_progress_bar(len(items))
@@ -726,15 +981,24 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
                         new_item = Registry().get(service_item.name).service_load(service_item)
                         if new_item:
                             service_item = new_item
+                    if not self._save_lite:
+                        zip_infos = [members[name] for name in self._get_service_item_files(item) if name in members]
+                        if zip_infos:
+                            self.queue_extract(service_item, zip_infos)
+                        else:
+                            service_item.reload_images()
                     self.add_service_item(service_item, repaint=False)
-                delete_file(p_file)
+                if self.extract_queue:
+                    self.extract_zip = zip_file
+                    zip_file = None
+                    self.extract_timer.start(0)
                 self.main_window.add_recent_file(file_name)
                 self.set_modified(False)
                 Settings().setValue('servicemanager/last file', file_name)
             else:
                 critical_error_message_box(message=translate('OpenLP.ServiceManager', 'File is not a valid service.'))
                 log.exception('File contains no service data')
-        except (IOError, NameError, zipfile.BadZipfile):
+        except (IOError, ValueError, zipfile.BadZipfile):
             log.exception('Problem loading service file %s' % file_name)
             critical_error_message_box(message=translate('OpenLP.ServiceManager',
                 'File could not be opened because it is corrupt.'))
@@ -752,8 +1016,6 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
             self.application.set_normal_cursor()
             return
         finally:
-            if file_to:
-                file_to.close()
             if zip_file:
                 zip_file.close()
         self.main_window.finished_progress_bar()
@@ -977,26 +1239,23 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
             return
         selected = self.service_manager_list.selectedItems()[0]
         prevItem = None
-        prevItemLastSlide = None
         serviceIterator = QtGui.QTreeWidgetItemIterator(self.service_manager_list)
         while serviceIterator.value():
             if serviceIterator.value() == selected:
-                if last_slide and prevItemLastSlide:
-                    pos = prevItem.data(0, QtCore.Qt.UserRole)
-                    check_expanded = self.service_items[pos - 1]['expanded']
-                    self.service_manager_list.setCurrentItem(prevItemLastSlide)
-                    if not check_expanded:
-                        self.service_manager_list.collapseItem(prevItem)
-                    self.make_live()
-                    self.service_manager_list.setCurrentItem(prevItem)
-                elif prevItem:
+                if prevItem:
                     self.service_manager_list.setCurrentItem(prevItem)
-                    self.make_live()
+                    if last_slide:
+                        # Collapsed items which are rendered lazily have no slides in the list, so the last slide is
+                        # looked up in the service item itself.
+                        pos = prevItem.data(0, QtCore.Qt.UserRole)
+                        frame_count = len(self.service_items[pos - 1]['service_item'].get_frames())
+                        self.make_live(max(frame_count - 1, 0))
+                        self.service_manager_list.setCurrentItem(prevItem)
+                    else:
+                        self.make_live()
                 return
             if serviceIterator.value().parent() is None:
                 prevItem = serviceIterator.value()
-            if serviceIterator.value().parent() is prevItem:
-                prevItemLastSlide = serviceIterator.value()
             serviceIterator += 1
 
     def on_set_item(self, message):
@@ -1063,6 +1322,8 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         """
         pos = item.data(0, QtCore.Qt.UserRole)
         self.service_items[pos - 1]['expanded'] = True
+        if not self.service_items[pos - 1]['service_item'].is_fully_rendered():
+            self.update_rendered_item(self.service_items[pos - 1]['service_item'])
 
     def onServiceTop(self):
         """
@@ -1147,29 +1408,7 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         for item_count, item in enumerate(self.service_items):
             serviceitem = item['service_item']
             treewidgetitem = QtGui.QTreeWidgetItem(self.service_manager_list)
-            if serviceitem.is_valid:
-                if serviceitem.notes:
-                    icon = QtGui.QImage(serviceitem.icon)
-                    icon = icon.scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    overlay = QtGui.QImage(':/services/service_item_notes.png')
-                    overlay = overlay.scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    painter = QtGui.QPainter(icon)
-                    painter.drawImage(0, 0, overlay)
-                    painter.end()
-                    treewidgetitem.setIcon(0, build_icon(icon))
-                elif serviceitem.temporary_edit:
-                    icon = QtGui.QImage(serviceitem.icon)
-                    icon = icon.scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    overlay = QtGui.QImage(':/general/general_export.png')
-                    overlay = overlay.scaled(40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    painter = QtGui.QPainter(icon)
-                    painter.drawImage(40, 0, overlay)
-                    painter.end()
-                    treewidgetitem.setIcon(0, build_icon(icon))
-                else:
-                    treewidgetitem.setIcon(0, serviceitem.iconic_representation)
-            else:
-                treewidgetitem.setIcon(0, build_icon(':/general/general_delete.png'))
+            treewidgetitem.setIcon(0, self.get_service_item_icon(serviceitem))
             treewidgetitem.setText(0, serviceitem.get_display_title())
             tips = []
             if serviceitem.temporary_edit:
@@ -1184,10 +1423,23 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
                     (translate('OpenLP.ServiceManager', 'Notes'), cgi.escape(serviceitem.notes)))
             if item['service_item'].is_capable(ItemCapabilities.HasVariableStartTime):
                 tips.append(item['service_item'].get_media_time())
+            if serviceitem in self.extract_waiting:
+                tips.append('<em>%s</em>' % translate('OpenLP.ServiceManager', 'Extracting files...'))
+                treewidgetitem.setText(0, '%s (%d%%)' % (serviceitem.get_display_title(),
+                    self.get_extract_progress(serviceitem)))
+                font = treewidgetitem.font(0)
+                font.setItalic(True)
+                treewidgetitem.setFont(0, font)
             treewidgetitem.setToolTip(0, '<br>'.join(tips))
             treewidgetitem.setData(0, QtCore.Qt.UserRole, item['order'])
             treewidgetitem.setSelected(item['selected'])
-            # Add the children to their parent treewidgetitem.
+            # Add the children to their parent treewidgetitem. The slides of lazily rendered items are only split
+            # into frames when the item is expanded.
+            if not serviceitem.is_fully_rendered() and not item['expanded']:
+                treewidgetitem.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+                if service_item == item_count:
+                    self.service_manager_list.setCurrentItem(treewidgetitem)
+                continue
             for count, frame in enumerate(serviceitem.get_frames()):
                 child = QtGui.QTreeWidgetItem(treewidgetitem)
                 text = frame['title'].replace('\n', ' ')
@@ -1200,11 +1452,43 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
                         self.service_manager_list.setCurrentItem(treewidgetitem)
             treewidgetitem.setExpanded(item['expanded'])
 
+    def get_service_item_icon(self, service_item):
+        """
+        Build the icon which represents the given service item in the list.
+
+        ``service_item``
+            The service item to build the icon for.
+        """
+        if service_item in self.extract_waiting:
+            return service_item.iconic_representation
+        if not service_item.is_valid:
+            return build_icon(':/general/general_delete.png')
+        if service_item.notes:
+            icon = QtGui.QImage(service_item.icon)
+            icon = icon.scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            overlay = QtGui.QImage(':/services/service_item_notes.png')
+            overlay = overlay.scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            painter = QtGui.QPainter(icon)
+            painter.drawImage(0, 0, overlay)
+            painter.end()
+            return build_icon(icon)
+        if service_item.temporary_edit:
+            icon = QtGui.QImage(service_item.icon)
+            icon = icon.scaled(80, 80, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            overlay = QtGui.QImage(':/general/general_export.png')
+            overlay = overlay.scaled(40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            painter = QtGui.QPainter(icon)
+            painter.drawImage(40, 0, overlay)
+            painter.end()
+            return build_icon(icon)
+        return service_item.iconic_representation
+
     def clean_up(self):
         """
         Empties the servicePath of temporary files on system exit.
         """
         log.debug('Cleaning up servicePath')
+        self.cancel_extract()
         for file_name in os.listdir(self.servicePath):
             file_path = os.path.join(self.servicePath, file_name)
             delete_file(file_path)
@@ -1273,7 +1557,7 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         """
         for item_count, item in enumerate(self.service_items):
             if item['service_item'].edit_id == newItem.edit_id and item['service_item'].name == newItem.name:
-                newItem.render()
+                newItem.render(lazy=True)
                 newItem.merge(item['service_item'])
                 item['service_item'] = newItem
                 self.repaint_service_list(item_count + 1, 0)
@@ -1301,7 +1585,7 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
             self.repaint_service_list(sitem, child)
             self.live_controller.replace_service_manager_item(item)
         else:
-            item.render()
+            item.render(lazy=True)
             # nothing selected for dnd
             if self.drop_position == 0:
                 if isinstance(item, list):
@@ -1326,12 +1610,230 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         self.drop_position = 0
         self.set_modified()
 
+    def update_rendered_item(self, service_item):
+        """
+        Rebuild the slides of a service item's entry in the list, e. g. when a lazily rendered item is expanded.
+
+        ``service_item``
+            The service item to update.
+        """
+        for item in self.service_items:
+            if item['service_item'] is not service_item:
+                continue
+            tree_widget_item = self.service_manager_list.topLevelItem(item['order'] - 1)
+            if tree_widget_item is None:
+                return
+            tree_widget_item.takeChildren()
+            if not service_item.is_fully_rendered() and not item['expanded']:
+                tree_widget_item.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+                return
+            for count, frame in enumerate(service_item.get_frames()):
+                child = QtGui.QTreeWidgetItem(tree_widget_item)
+                text = frame['title'].replace('\n', ' ')
+                child.setText(0, text[:40])
+                child.setData(0, QtCore.Qt.UserRole, count)
+            tree_widget_item.setExpanded(item['expanded'])
+            return
+
+    def _get_service_item_files(self, item):
+        """
+        Returns the names of the files in the service path a saved service item refers to.
+
+        ``item``
+            The service item as read from the service file.
+        """
+        header = item['serviceitem']['header']
+        data = item['serviceitem']['data']
+        if header['type'] == ServiceItemType.Image:
+            file_names = list(data)
+        elif header['type'] == ServiceItemType.Command:
+            file_names = [frame['title'] for frame in data]
+        else:
+            file_names = []
+        file_names.extend(header.get('background_audio', []))
+        return [get_safe_member_name(file_name) for file_name in file_names]
+
+    def queue_extract(self, service_item, zip_infos):
+        """
+        Queue the files of a service item to be extracted from the service file in the background.
+
+        ``service_item``
+            The service item which needs the files.
+
+        ``zip_infos``
+            The archive members of the files.
+        """
+        queued = set(zip_info.filename for zip_info in self.extract_queue)
+        for zip_info in zip_infos:
+            if zip_info.filename not in queued:
+                self.extract_queue.append(zip_info)
+                queued.add(zip_info.filename)
+        self.extract_waiting[service_item] = dict((zip_info.filename, zip_info.file_size) for zip_info in zip_infos)
+        self.extract_sizes[service_item] = sum(self.extract_waiting[service_item].values())
+
+    def cancel_extract(self):
+        """
+        Stop extracting the files of the current service file, e. g. because another service is loaded.
+        """
+        self.extract_timer.stop()
+        if self.extract_current:
+            self.extract_current[1].close()
+            self.extract_current[2].close()
+            self.extract_current = None
+        if self.extract_zip:
+            self.extract_zip.close()
+            self.extract_zip = None
+        self.extract_queue = []
+        self.extract_waiting = {}
+        self.extract_sizes = {}
+
+    def finish_extract(self):
+        """
+        Extract all the files of the current service file which are still missing, e. g. before the service is saved.
+        """
+        if not self.extract_waiting:
+            return
+        self.application.set_busy_cursor()
+        while self.extract_waiting:
+            self._extract_next_chunk()
+        self.application.set_normal_cursor()
+
+    def ensure_extracted(self, service_item):
+        """
+        Extract the files of the given service item now, if they are still waiting to be extracted. This is used to
+        let the item the user is about to preview or to show live jump the queue.
+
+        ``service_item``
+            The service item which is needed now.
+        """
+        if service_item not in self.extract_waiting:
+            return
+        pending = self.extract_waiting[service_item]
+        self.extract_queue.sort(key=lambda zip_info: zip_info.filename not in pending)
+        while service_item in self.extract_waiting:
+            self._extract_next_chunk()
+
+    def get_extract_progress(self, service_item):
+        """
+        Returns how much of the files of a service item has been extracted, in percent.
+
+        ``service_item``
+            The service item which is waiting for its files.
+        """
+        pending = self.extract_waiting.get(service_item, {})
+        total = self.extract_sizes.get(service_item, 0)
+        remaining = sum(pending.values())
+        if self.extract_current and self.extract_current[0].filename in pending:
+            remaining -= self.extract_current[3]
+        return 100 * (total - remaining) // max(total, 1)
+
+    def on_extract_timer(self):
+        """
+        Extract the next chunk of the files of the current service file. The files are extracted in small chunks, so
+        that the user interface keeps responding while large media files are extracted.
+        """
+        if not self.extract_waiting:
+            return
+        self._extract_next_chunk()
+        if self.extract_current:
+            for service_item, pending in self.extract_waiting.items():
+                if self.extract_current[0].filename in pending:
+                    self.update_extracting_item(service_item)
+        if self.extract_waiting:
+            self.extract_timer.start(0)
+
+    def _extract_next_chunk(self):
+        """
+        Copy the next chunk of the first file in the queue from the service file to the service path.
+        """
+        if self.extract_current is None:
+            if not self.extract_queue:
+                # Nothing left to extract, so the remaining items will not get their files.
+                for service_item in list(self.extract_waiting):
+                    self._finish_extracting_item(service_item)
+                return
+            zip_info = self.extract_queue.pop(0)
+            log.debug('Extract file: %s', zip_info.filename)
+            target_name = os.path.join(self.servicePath, zip_info.filename)
+            service_path = os.path.join(os.path.realpath(self.servicePath), '')
+            if not os.path.realpath(target_name).startswith(service_path):
+                log.error('Not extracting %s, it is outside of the service path' % zip_info.filename)
+                self._member_extracted(zip_info)
+                return
+            check_directory_exists(os.path.split(target_name)[0])
+            self.extract_current = [zip_info, self.extract_zip.open(zip_info), open(target_name, 'wb'), 0]
+        zip_info, source, target, written = self.extract_current
+        data = source.read(EXTRACT_CHUNK_SIZE)
+        if data:
+            target.write(data)
+            self.extract_current[3] = written + len(data)
+            return
+        source.close()
+        target.close()
+        self.extract_current = None
+        self._member_extracted(zip_info)
+
+    def _member_extracted(self, zip_info):
+        """
+        Mark a file of the current service file as done and finish the service items which were waiting for it.
+
+        ``zip_info``
+            The archive member of the file.
+        """
+        for service_item, pending in list(self.extract_waiting.items()):
+            if pending.pop(zip_info.filename, None) is not None and not pending:
+                self._finish_extracting_item(service_item)
+        if not self.extract_waiting:
+            self.extract_zip.close()
+            self.extract_zip = None
+
+    def _finish_extracting_item(self, service_item):
+        """
+        Check the service item again once all its files have been extracted and update its entry in the list.
+
+        ``service_item``
+            The service item whose files have been extracted.
+        """
+        del self.extract_waiting[service_item]
+        del self.extract_sizes[service_item]
+        service_item.validate_item(self.suffixes)
+        service_item.reload_images()
+        self.update_extracting_item(service_item)
+
+    def update_extracting_item(self, service_item):
+        """
+        Update the entry of a service item in the list while its files are extracted.
+
+        ``service_item``
+            The service item whose files are extracted.
+        """
+        for item in self.service_items:
+            if item['service_item'] is not service_item:
+                continue
+            tree_widget_item = self.service_manager_list.topLevelItem(item['order'] - 1)
+            if tree_widget_item is None:
+                return
+            if service_item in self.extract_waiting:
+                tree_widget_item.setText(0, '%s (%d%%)' % (service_item.get_display_title(),
+                    self.get_extract_progress(service_item)))
+                return
+            tree_widget_item.setText(0, service_item.get_display_title())
+            tree_widget_item.setIcon(0, self.get_service_item_icon(service_item))
+            font = tree_widget_item.font(0)
+            font.setItalic(False)
+            tree_widget_item.setFont(0, font)
+            extracting_tip = '<em>%s</em>' % translate('OpenLP.ServiceManager', 'Extracting files...')
+            tips = [tip for tip in tree_widget_item.toolTip(0).split('<br>') if tip and tip != extracting_tip]
+            tree_widget_item.setToolTip(0, '<br>'.join(tips))
+            return
+
     def make_preview(self):
         """
         Send the current item to the Preview slide controller
         """
         self.application.set_busy_cursor()
         item, child = self.find_service_item()
+        self.ensure_extracted(self.service_items[item]['service_item'])
         if self.service_items[item]['service_item'].is_valid:
             self.preview_controller.add_service_manager_item(self.service_items[item]['service_item'], child)
         else:
@@ -1370,12 +1872,14 @@ class ServiceManager(QtGui.QWidget, ServiceManagerDialog):
         if row != -1:
             child = row
         self.application.set_busy_cursor()
+        self.ensure_extracted(self.service_items[item]['service_item'])
         if self.service_items[item]['service_item'].is_valid:
             self.live_controller.add_service_manager_item(self.service_items[item]['service_item'], child)
             if Settings().value(self.main_window.general_settings_section + '/auto preview'):
                 item += 1
                 if self.service_items and item < len(self.service_items) and \
                         self.service_items[item]['service_item'].is_capable(ItemCapabilities.CanPreview):
+                    self.ensure_extracted(self.service_items[item]['service_item'])
                     self.preview_controller.add_service_manager_item(self.service_items[item]['service_item'], 0)
                     next_item = self.service_manager_list.topLevelItem(item)
                     self.service_manager_list.setCurrentItem(next_item)
@@ -33,13 +33,15 @@ The :mod:`slidecontroller` module contains the most important part of OpenLP - t
 import os
 import logging
 import copy
+import threading
 from collections import deque
 
 from PyQt4 import QtCore, QtGui
 
 from openlp.core.lib import OpenLPToolbar, ItemCapabilities, ServiceItem, ImageSource, SlideLimits, \
-    ServiceItemAction, Settings, Registry, UiStrings, ScreenList, build_icon, build_html, translate
+    ServiceItemAction, Settings, Registry, UiStrings, ScreenList, build_icon, build_html, image_to_byte, translate
 from openlp.core.ui import HideMode, MainDisplay, Display, DisplayControllerType
+from openlp.core.lib.imagemanager import DISPLAY_IMAGE_TIMEOUT
 from openlp.core.lib.ui import create_action
 from openlp.core.utils.actions import ActionList, CategoryOrder
 from openlp.core.ui.listpreviewwidget import ListPreviewWidget
@@ -48,6 +50,8 @@ log = logging.getLogger(__name__)
 
 # Threshold which has to be trespassed to toggle.
 HIDE_MENU_THRESHOLD  = 27
+# The number of frames of a lazily rendered text item which are rendered at a time, once the item is shown.
+FRAME_RENDER_CHUNK = 10
 AUDIO_TIME_LABEL_STYLESHEET = 'background-color: palette(background); ' \
     'border-top-color: palette(shadow); ' \
     'border-left-color: palette(shadow); ' \
@@ -86,6 +90,9 @@ class SlideController(DisplayController):
     SlideController is the slide controller widget. This widget is what the
     user uses to control the displaying of verses/slides/etc on the screen.
     """
+    # Asks the GUI thread to encode the image of the display for the remote. The event is set once it is done.
+    slide_image_requested = QtCore.pyqtSignal(object)
+
     def __init__(self, parent, is_live=False):
         """
         Set up the Slide Controller.
@@ -123,8 +130,19 @@ class SlideController(DisplayController):
         self.update_slide_limits()
         self.panel = QtGui.QWidget(parent.control_splitter)
         self.slideList = {}
+        # The label of the last row in the slide list, to continue the labels when rendered frames are added.
+        self.slide_list_row = 0
+        # Counts the changes of the preview image, so that the remote knows when to fetch it again.
         self.slide_count = 0
+        # Counts the preview updates, to skip the grabs of the screen which have been made obsolete by a later update.
+        self.preview_request = 0
+        # What the display showed when the preview image was grabbed, to skip grabs while it stays the same.
+        self.preview_key = None
+        # The image of the display for the remote as a (slide_count, pixmap, image_bytes) tuple, which is only ever
+        # replaced as a whole. The base64 encoded PNG is created on the GUI thread when the remote first asks for it,
+        # from the full size pixmap of a screen grab, or else from a new grab of the display.
         self.slide_image = None
+        self.slide_image_requested.connect(self.encode_slide_image)
         # Layout for holding panel
         self.panel_layout = QtGui.QVBoxLayout(self.panel)
         self.panel_layout.setSpacing(0)
@@ -419,6 +437,8 @@ class SlideController(DisplayController):
             self.current_shortcut += verse_type
         elif verse_type:
             self.current_shortcut = verse_type
+        # The shortcut might select a verse which has not been rendered yet.
+        self.add_rendered_frames(True)
         keys = list(self.slideList.keys())
         matches = [match for match in keys
             if match.startswith(self.current_shortcut)]
@@ -635,7 +655,9 @@ class SlideController(DisplayController):
         if item.is_text():
             if Settings().value(self.main_window.songs_settings_section + '/display songbar') and self.slideList:
                 self.toolbar.set_widget_visible(['song_menu'], True)
-        if item.is_capable(ItemCapabilities.CanLoop) and len(item.get_frames()) > 1:
+        # Do not render a lazily rendered item just to count its frames, it has more than one if it is not done yet.
+        if item.is_capable(ItemCapabilities.CanLoop) and \
+                (len(item.get_frames(rendered_only=True)) > 1 or not item.is_fully_rendered()):
             self.toolbar.set_widget_visible(self.loop_list)
         if item.is_media():
             self.mediabar.show()
@@ -756,9 +778,49 @@ class SlideController(DisplayController):
                 else:
                     self.display.audio_player.play()
                 self.set_audio_items_visibility(True)
-        row = 0
+        self.slide_list_row = 0
         width = self.main_window.control_splitter.sizes()[self.split]
-        for framenumber, frame in enumerate(self.service_item.get_frames()):
+        # Text items are rendered lazily. Only render the frames up to the selected one now, the others are rendered
+        # once the item is shown.
+        self.service_item.prefetch_frames(slideno)
+        self._update_slide_list(0, slideno)
+        self.preview_widget.replace_service_item(self.service_item, width, slideno)
+        self.enable_tool_bar(self.service_item)
+        # Pass to display for viewing.
+        # Postpone image build, we need to do this later to avoid the theme
+        # flashing on the screen
+        if not self.service_item.is_image():
+            self.display.build_html(self.service_item)
+        if service_item.is_media():
+            self.on_media_start(service_item)
+        self.slide_selected(True)
+        if old_item:
+            # Close the old item after the new one is opened
+            # This avoids the service theme/desktop flashing on screen
+            # However opening a new item of the same type will automatically
+            # close the previous, so make sure we don't close the new one.
+            if old_item.is_command() and not service_item.is_command():
+                Registry().execute('%s_stop' % old_item.name.lower(), [old_item, self.is_live])
+            if old_item.is_media() and not service_item.is_media():
+                self.on_media_close()
+        Registry().execute('slidecontroller_%s_started' % self.type_prefix, [service_item])
+        if not self.service_item.is_fully_rendered():
+            item = self.service_item
+            QtCore.QTimer.singleShot(0, lambda: self.render_remaining_frames(item))
+
+    def _update_slide_list(self, start, slideno=-1):
+        """
+        Adds the rendered frames of the service item to the slide list and the song menu.
+
+        ``start``
+            The first frame to add.
+
+        ``slideno``
+            The slide which is shown first. The background of an image item is taken from it.
+        """
+        row = self.slide_list_row
+        frames = self.service_item.get_frames(rendered_only=True)
+        for framenumber, frame in enumerate(frames[start:], start):
             if self.service_item.is_text():
                 if frame['verseTag']:
                     # These tags are already translated.
@@ -779,27 +841,42 @@ class SlideController(DisplayController):
                 # If current slide set background to image
                 if not self.service_item.is_command() and framenumber == slideno:
                     self.service_item.bg_image_bytes = self.image_manager.get_image_bytes(frame['path'],
-                        ImageSource.ImagePlugin)
-        self.preview_widget.replace_service_item(self.service_item, width, slideno)
-        self.enable_tool_bar(service_item)
-        # Pass to display for viewing.
-        # Postpone image build, we need to do this later to avoid the theme
-        # flashing on the screen
-        if not self.service_item.is_image():
-            self.display.build_html(self.service_item)
-        if service_item.is_media():
-            self.on_media_start(service_item)
-        self.slide_selected(True)
-        if old_item:
-            # Close the old item after the new one is opened
-            # This avoids the service theme/desktop flashing on screen
-            # However opening a new item of the same type will automatically
-            # close the previous, so make sure we don't close the new one.
-            if old_item.is_command() and not service_item.is_command():
-                Registry().execute('%s_stop' % old_item.name.lower(), [old_item, self.is_live])
-            if old_item.is_media() and not service_item.is_media():
-                self.on_media_close()
-        Registry().execute('slidecontroller_%s_started' % self.type_prefix, [service_item])
+                        ImageSource.ImagePlugin, DISPLAY_IMAGE_TIMEOUT)
+        self.slide_list_row = row
+
+    def add_rendered_frames(self, render_all=False):
+        """
+        Adds the frames of a lazily rendered text item which have been rendered since it was loaded to the slide list.
+
+        ``render_all``
+            Render all remaining frames first, e. g. before jumping to the last slide. Defaults to *False*.
+        """
+        if not self.service_item:
+            return
+        if render_all:
+            self.service_item.get_frames()
+        if len(self.service_item.get_frames(rendered_only=True)) > self.preview_widget.slide_count():
+            self._update_slide_list(self.preview_widget.slide_count())
+            self.preview_widget.add_rendered_frames()
+
+    def render_remaining_frames(self, service_item):
+        """
+        Renders the next frames of a lazily rendered text item and adds them to the slide list. This is called from a
+        timer, so that the selected slide is shown before the others are rendered.
+
+        ``service_item``
+            The service item to render. Nothing is done if another item has been loaded meanwhile.
+        """
+        if service_item is not self.service_item:
+            return
+        if service_item.is_fully_rendered():
+            # The frames may have been rendered elsewhere, e. g. by expanding the item in the service manager.
+            self.add_rendered_frames()
+            return
+        service_item.prefetch_frames(self.preview_widget.slide_count(), FRAME_RENDER_CHUNK)
+        self.add_rendered_frames()
+        if not service_item.is_fully_rendered():
+            QtCore.QTimer.singleShot(0, lambda: self.render_remaining_frames(service_item))
 
     # Screen event methods
     def on_slide_selected_index(self, message):
@@ -964,6 +1041,9 @@ class SlideController(DisplayController):
                     Registry().execute('%s_slide' % self.service_item.name.lower(),
                         [self.service_item, self.is_live, row])
             else:
+                # Make sure the following slides have been rendered, so they can be selected next.
+                self.service_item.prefetch_frames(row)
+                self.add_rendered_frames()
                 to_display = self.service_item.get_rendered_frame(row)
                 if self.service_item.is_text():
                     self.display.text(to_display)
@@ -993,25 +1073,88 @@ class SlideController(DisplayController):
         This updates the preview frame, for example after changing a slide or using *Blank to Theme*.
         """
         log.debug('update_preview %s ' % self.screens.current['primary'])
+        self.preview_request += 1
+        if self.service_item and (self.service_item.is_command() or self.service_item.is_media() or
+                self.service_item.is_capable(ItemCapabilities.ProvidesOwnDisplay)):
+            # Other applications and media players change the screen without us knowing, so always grab it.
+            self.preview_key = None
+        else:
+            # Text and images only change with the item, the slide, the hide mode or the background image.
+            preview_key = (self.service_item, self.preview_widget.current_slide_number(), self.hide_mode(),
+                self.display.override.get('image'))
+            if preview_key == self.preview_key:
+                return
+            self.preview_key = preview_key
         if not self.screens.current['primary'] and self.service_item and \
                 self.service_item.is_capable(ItemCapabilities.ProvidesOwnDisplay):
-            # Grab now, but try again in a couple of seconds if slide change is slow
-            QtCore.QTimer.singleShot(0.5, self.grab_maindisplay)
-            QtCore.QTimer.singleShot(2.5, self.grab_maindisplay)
+            # Grab now, but try again in a couple of seconds if slide change is slow. A later slide change makes
+            # these grabs obsolete.
+            preview_request = self.preview_request
+            QtCore.QTimer.singleShot(500, lambda: self.grab_maindisplay(preview_request))
+            QtCore.QTimer.singleShot(2500, lambda: self.grab_maindisplay(preview_request))
         else:
-            self.slide_image = self.display.preview()
-            self.slide_preview.setPixmap(self.slide_image)
-        self.slide_count += 1
+            self.display.grab_preview(self.set_slide_image, self.slide_preview.size())
 
-    def grab_maindisplay(self):
+    def grab_maindisplay(self, preview_request=None):
         """
         Creates an image of the current screen and updates the preview frame.
+
+        ``preview_request``
+            The preview update the grab was requested for. The grab is skipped if the preview has been updated since.
         """
+        if preview_request is not None and preview_request != self.preview_request:
+            return
         win_id = QtGui.QApplication.desktop().winId()
         rect = self.screens.current['size']
         win_image = QtGui.QPixmap.grabWindow(win_id, rect.x(), rect.y(), rect.width(), rect.height())
-        self.slide_preview.setPixmap(win_image)
-        self.slide_image = win_image
+        self.set_slide_image(win_image.scaled(self.slide_preview.size(), QtCore.Qt.IgnoreAspectRatio,
+            QtCore.Qt.SmoothTransformation), win_image)
+
+    def set_slide_image(self, pixmap, full_size_pixmap=None):
+        """
+        Show a new image of the display in the preview frame. This is called once the image has been grabbed, so the
+        slide count is increased here to let the remote fetch the new image.
+
+        ``pixmap``
+            The image of the display, in the size of the preview frame.
+
+        ``full_size_pixmap``
+            The image of the display in its full size, if it has been grabbed anyway. Otherwise the display is grabbed
+            again when the remote asks for the image.
+        """
+        self.slide_preview.setPixmap(pixmap)
+        self.slide_count += 1
+        self.slide_image = (self.slide_count, full_size_pixmap, None)
+
+    def get_slide_image_bytes(self):
+        """
+        Return the image of the display as a base64 encoded PNG. This is called by the remote from another thread, so
+        the image is encoded on the GUI thread. It is only encoded once for each change.
+        """
+        slide_image = self.slide_image
+        if slide_image is not None and slide_image[2] is None:
+            encoded = threading.Event()
+            self.slide_image_requested.emit(encoded)
+            encoded.wait(DISPLAY_IMAGE_TIMEOUT)
+            slide_image = self.slide_image
+        if slide_image is None or slide_image[2] is None:
+            return ''
+        return slide_image[2]
+
+    def encode_slide_image(self, encoded):
+        """
+        Encode the image of the display for the remote, unless it has been encoded already.
+
+        ``encoded``
+            The event to set once the image has been encoded.
+        """
+        slide_image = self.slide_image
+        if slide_image is not None and slide_image[2] is None:
+            slide_count, pixmap, image_bytes = slide_image
+            if pixmap is None:
+                pixmap = self.display.render_preview()
+            self.slide_image = (slide_count, None, image_to_byte(pixmap))
+        encoded.set()
 
     def on_slide_selected_next_action(self, checked):
         """
@@ -1060,6 +1203,7 @@ class SlideController(DisplayController):
             row = self.preview_widget.current_slide_number() - 1
             if row == -1:
                 if self.slide_limits == SlideLimits.Wrap:
+                    self.add_rendered_frames(True)
                     row = self.preview_widget.slide_count() - 1
                 elif self.is_live and self.slide_limits == SlideLimits.Next:
                     self.keypress_queue.append(ServiceItemAction.PreviousLastSlide)
@@ -136,6 +136,7 @@ class ThemeForm(QtGui.QWizard, Ui_ThemeWizard):
         self.backgroundPage.registerField('horizontal', self.horizontalComboBox)
         self.backgroundPage.registerField('vertical', self.verticalComboBox)
         self.backgroundPage.registerField('slideTransition', self.transitionsCheckBox)
+        self.backgroundPage.registerField('nativePagination', self.nativePaginationCheckBox)
         self.backgroundPage.registerField('name', self.themeNameEdit)
 
     def calculateLines(self):
@@ -195,10 +196,15 @@ class ThemeForm(QtGui.QWizard, Ui_ThemeWizard):
         self.setOption(QtGui.QWizard.HaveCustomButton1, enabled)
         if self.page(pageId) == self.previewPage:
             self.updateTheme()
-            frame = self.theme_manager.generate_image(self.theme)
-            self.previewBoxLabel.setPixmap(frame)
-            self.displayAspectRatio = float(frame.width()) / frame.height()
-            self.resizeEvent()
+            self.theme_manager.generate_image(self.theme, callback=self.on_preview_generated)
+
+    def on_preview_generated(self, frame):
+        """
+        Show the preview of the theme, once it has been generated.
+        """
+        self.previewBoxLabel.setPixmap(frame)
+        self.displayAspectRatio = float(frame.width()) / frame.height()
+        self.resizeEvent()
 
     def onCustom1ButtonClicked(self, number):
         """
@@ -370,6 +376,7 @@ class ThemeForm(QtGui.QWizard, Ui_ThemeWizard):
         self.setField('horizontal', self.theme.display_horizontal_align)
         self.setField('vertical', self.theme.display_vertical_align)
         self.setField('slideTransition', self.theme.display_slide_transition)
+        self.setField('nativePagination', self.theme.display_native_pagination)
 
     def setPreviewPageValues(self):
         """
@@ -508,6 +515,7 @@ class ThemeForm(QtGui.QWizard, Ui_ThemeWizard):
         self.theme.display_horizontal_align = self.horizontalComboBox.currentIndex()
         self.theme.display_vertical_align = self.verticalComboBox.currentIndex()
         self.theme.display_slide_transition = self.field('slideTransition')
+        self.theme.display_native_pagination = self.field('nativePagination')
 
     def accept(self):
         """
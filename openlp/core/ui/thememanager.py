@@ -141,6 +141,8 @@ class ThemeManager(QtGui.QWidget):
         check_directory_exists(self.thumb_path)
         self.theme_form.path = self.path
         self.old_background_image = None
+        # The number of preview images which have been requested but not saved yet.
+        self.pending_preview_images = 0
         self.bad_v1_name_chars = re.compile(r'[%+\[\]]')
         # Last little bits of setting up
         self.global_theme = Settings().value(self.settings_section + '/global theme')
@@ -649,10 +651,23 @@ class ThemeManager(QtGui.QWidget):
 
     def generate_and_save_image(self, directory, name, theme):
         """
-        Generate and save a preview image
+        Generate and save a preview image. The image is generated in the background, the themes are loaded again once
+        all the requested images have been saved.
         """
         log.debug('generate_and_save_image %s %s', directory, name)
-        frame = self.generate_image(theme)
+        self.pending_preview_images += 1
+        self.generate_image(theme, callback=lambda frame: self._save_preview_image(name, frame))
+
+    def _save_preview_image(self, name, frame):
+        """
+        Save the generated preview image of a theme and its thumbnail.
+
+        ``name``
+            The name of the theme.
+
+        ``frame``
+            The preview image.
+        """
         sample_path_name = os.path.join(self.path, name + '.png')
         if os.path.exists(sample_path_name):
             os.unlink(sample_path_name)
@@ -660,6 +675,9 @@ class ThemeManager(QtGui.QWidget):
         thumb = os.path.join(self.thumb_path, '%s.png' % name)
         create_thumb(sample_path_name, thumb, False)
         log.debug('Theme image written to %s', sample_path_name)
+        self.pending_preview_images -= 1
+        if not self.pending_preview_images:
+            self.load_themes()
 
     def update_preview_images(self):
         """
@@ -673,7 +691,7 @@ class ThemeManager(QtGui.QWidget):
         self.main_window.finished_progress_bar()
         self.load_themes()
 
-    def generate_image(self, theme_data, forcePage=False):
+    def generate_image(self, theme_data, forcePage=False, callback=None):
         """
         Call the renderer to build a Sample Image
 
@@ -682,9 +700,12 @@ class ThemeManager(QtGui.QWidget):
 
         ``forcePage``
             Flag to tell message lines per page need to be generated.
+
+        ``callback``
+            The function to call with the sample image, once it has been built.
         """
         log.debug('generate_image \n%s ', theme_data)
-        return self.renderer.generate_preview(theme_data, forcePage)
+        self.renderer.generate_preview(theme_data, forcePage, callback)
 
     def get_preview_image(self, theme):
         """
@@ -261,7 +261,12 @@ class Ui_ThemeWizard(object):
         self.transitionsCheckBox = QtGui.QCheckBox(self.alignmentPage)
         self.transitionsCheckBox.setObjectName('TransitionsCheckBox')
         self.alignmentLayout.addRow(self.transitionsLabel, self.transitionsCheckBox)
-        self.alignmentLayout.setItem(3, QtGui.QFormLayout.LabelRole, self.spacer)
+        self.nativePaginationLabel = QtGui.QLabel(self.alignmentPage)
+        self.nativePaginationLabel.setObjectName('NativePaginationLabel')
+        self.nativePaginationCheckBox = QtGui.QCheckBox(self.alignmentPage)
+        self.nativePaginationCheckBox.setObjectName('NativePaginationCheckBox')
+        self.alignmentLayout.addRow(self.nativePaginationLabel, self.nativePaginationCheckBox)
+        self.alignmentLayout.setItem(4, QtGui.QFormLayout.LabelRole, self.spacer)
         themeWizard.addPage(self.alignmentPage)
         # Area Position Page
         self.areaPositionPage = QtGui.QWizardPage()
@@ -456,6 +461,9 @@ class Ui_ThemeWizard(object):
         self.horizontalComboBox.setItemText(HorizontalType.Center, translate('OpenLP.ThemeWizard', 'Center'))
         self.horizontalComboBox.setItemText(HorizontalType.Justify, translate('OpenLP.ThemeWizard', 'Justify'))
         self.transitionsLabel.setText(translate('OpenLP.ThemeWizard', 'Transitions:'))
+        self.nativePaginationLabel.setText(translate('OpenLP.ThemeWizard', 'Fast text layout:'))
+        self.nativePaginationCheckBox.setToolTip(translate('OpenLP.ThemeWizard', 'Split the text into slides without '
+            'using the web engine. This is much faster, but may differ slightly for unusual fonts and formatting.'))
         self.areaPositionPage.setTitle(translate('OpenLP.ThemeWizard', 'Output Area Locations'))
         self.areaPositionPage.setSubTitle(translate('OpenLP.ThemeWizard', 'Allows you to change and move the'
                 ' main and footer areas.'))
@@ -88,6 +88,7 @@ class BiblePlugin(Plugin):
         # Set to invisible until we can export bibles
         self.export_bible_item.setVisible(False)
         self.tools_upgrade_item.setVisible(bool(self.manager.old_bible_databases))
+        self.tools_reindex_item.setVisible(True)
 
     def finalise(self):
         """
@@ -101,6 +102,7 @@ class BiblePlugin(Plugin):
         self.import_bible_item.setVisible(False)
         #action_list.remove_action(self.export_bible_item, UiStrings().Export)
         self.export_bible_item.setVisible(False)
+        self.tools_reindex_item.setVisible(False)
 
     def app_startup(self):
         """
@@ -140,6 +142,11 @@ class BiblePlugin(Plugin):
             statustip=translate('BiblesPlugin', 'Upgrade the Bible databases to the latest format.'),
             visible=False, triggers=self.on_tools_upgrade_Item_triggered)
         tools_menu.addAction(self.tools_upgrade_item)
+        self.tools_reindex_item = create_action(tools_menu, 'toolsRebuildBibleIndexItem',
+            text=translate('BiblesPlugin', '&Rebuild Bible search index'),
+            statustip=translate('BiblesPlugin', 'Rebuild the index which is used to search the text of the Bibles.'),
+            visible=False, triggers=self.on_tools_reindex_item_triggered)
+        tools_menu.addAction(self.tools_reindex_item)
 
     def on_tools_upgrade_Item_triggered(self):
         """
@@ -151,6 +158,21 @@ class BiblePlugin(Plugin):
         if self.upgrade_wizard.exec_():
             self.media_item.reloadBibles()
 
+    def on_tools_reindex_item_triggered(self):
+        """
+        Rebuild the search indexes of the Bibles.
+        """
+        self.application.set_busy_cursor()
+        failed = self.manager.rebuild_verse_indexes()
+        self.application.set_normal_cursor()
+        if failed:
+            QtGui.QMessageBox.warning(self.main_window, translate('BiblesPlugin', 'Search Index'),
+                translate('BiblesPlugin', 'The search index of these Bibles could not be built, their text is searched '
+                    'without it:\n%s') % '\n'.join(failed))
+        else:
+            QtGui.QMessageBox.information(self.main_window, translate('BiblesPlugin', 'Search Index'),
+                translate('BiblesPlugin', 'The search index of the Bibles has been rebuilt.'))
+
     def on_bible_import_click(self):
         if self.media_item:
             self.media_item.on_import_click()
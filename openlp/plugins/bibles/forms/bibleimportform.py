@@ -569,6 +569,9 @@ class BibleImportForm(OpenLPWizard):
         if importer.do_import(license_version):
             self.manager.save_meta_data(license_version, license_version,
                 license_copyright, license_permissions)
+            self.progress_label.setText(translate('BiblesPlugin.ImportWizardForm', 'Building the search index...'))
+            self.application.process_events()
+            importer.rebuild_verse_index()
             self.manager.reload_bibles()
             if bible_type == BibleFormat.WebDownload:
                 self.progress_label.setText(
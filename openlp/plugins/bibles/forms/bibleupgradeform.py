@@ -521,6 +521,7 @@ class BibleUpgradeForm(OpenLPWizard):
             else:
                 self.success[number] = True
                 self.new_bibles[number].save_meta('name', name)
+                self.new_bibles[number].rebuild_verse_index()
                 self.increment_progress_bar(translate('BiblesPlugin.UpgradeWizardForm',
                     'Upgrading Bible %s of %s: "%s"\nComplete') % (number + 1, max_bibles, name))
             if number in self.new_bibles:
@@ -32,6 +32,7 @@ plugin.
 """
 import logging
 import re
+from functools import lru_cache
 
 from openlp.core.lib import Settings, translate
 
@@ -41,6 +42,8 @@ log = logging.getLogger(__name__)
 
 REFERENCE_MATCHES = {}
 REFERENCE_SEPARATORS = {}
+# The number of parsed references which are remembered.
+REFERENCE_CACHE_SIZE = 256
 
 
 class LayoutStyle(object):
@@ -220,6 +223,7 @@ def update_reference_separators():
     REFERENCE_MATCHES['full'] = re.compile('^\s*(?!\s)(?P<book>[\d]*[^\d]+)(?<!\s)\s*'
         '(?P<ranges>(?:%(range_regex)s(?:%(sep_l)s(?!\s*$)|(?=\s*$)))+)\s*$' \
         % dict(list(REFERENCE_SEPARATORS.items()) + [('range_regex', range_regex)]), re.UNICODE)
+    clear_reference_cache()
 
 
 def get_reference_separator(separator_type):
@@ -330,6 +334,25 @@ def parse_reference(reference, bible, language_selection, book_ref_id=False):
         The second group contains all ``ranges``. This can be multiple declarations of range_regex separated by a list
         separator.
 
+    The results are remembered for the last ``REFERENCE_CACHE_SIZE`` references, so typing a reference does not parse
+    it again. See :func:`clear_reference_cache`.
+    """
+    ref_list = _parse_reference(reference, bible, language_selection, book_ref_id)
+    return list(ref_list) if ref_list is not None else None
+
+
+def clear_reference_cache():
+    """
+    Forget the parsed references, because the separators or the books of a Bible have changed.
+    """
+    _parse_reference.cache_clear()
+
+
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def _parse_reference(reference, bible, language_selection, book_ref_id):
+    """
+    Parse a reference, see :func:`parse_reference`. The reference list is returned as a tuple, so the cached result
+    cannot be changed.
     """
     log.debug('parse_reference("%s")', reference)
     match = get_reference_match('full').match(reference)
@@ -395,7 +418,7 @@ def parse_reference(reference, bible, language_selection, book_ref_id=False):
                 ref_list.append((book_ref_id, from_chapter, from_verse, from_verse))
             else:
                 ref_list.append((book_ref_id, from_chapter, 1, -1))
-        return ref_list
+        return tuple(ref_list)
     else:
         log.debug('Invalid reference: %s' % reference)
         return None
@@ -32,10 +32,14 @@ import logging
 import os
 import re
 import sqlite3
+from collections import OrderedDict, namedtuple
 
 from PyQt4 import QtCore
-from sqlalchemy import Column, ForeignKey, Table, or_, types, func
+from sqlalchemy import Column, ForeignKey, Table, and_, or_, types, func
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.sql.expression import text as sql_text
 from sqlalchemy.orm import class_mapper, mapper, relation
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.exc import UnmappedClassError
 
 from openlp.core.lib import Registry, translate
@@ -46,7 +50,33 @@ from . import upgrade
 
 log = logging.getLogger(__name__)
 
-RESERVED_CHARACTERS = '\\.^$*+?{}[]()'
+
+# The full text index of the verse texts. The triggers keep it up to date when verses are added, changed or removed.
+VERSE_INDEX_TABLE = 'verse_fts'
+VERSE_INDEX_CREATE = "CREATE VIRTUAL TABLE verse_fts USING fts5(text, content='verse', content_rowid='id')"
+VERSE_INDEX_TRIGGERS = [
+    'CREATE TRIGGER IF NOT EXISTS verse_fts_insert AFTER INSERT ON verse BEGIN '
+    'INSERT INTO verse_fts(rowid, text) VALUES (new.id, new.text); END',
+    'CREATE TRIGGER IF NOT EXISTS verse_fts_delete AFTER DELETE ON verse BEGIN '
+    "INSERT INTO verse_fts(verse_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+    'CREATE TRIGGER IF NOT EXISTS verse_fts_update AFTER UPDATE OF text ON verse BEGIN '
+    "INSERT INTO verse_fts(verse_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+    'INSERT INTO verse_fts(rowid, text) VALUES (new.id, new.text); END'
+]
+VERSE_INDEX_TRIGGER_NAMES = ['verse_fts_insert', 'verse_fts_delete', 'verse_fts_update']
+VERSE_INDEX_REBUILD = "INSERT INTO verse_fts(verse_fts) VALUES ('rebuild')"
+VERSE_INDEX_PROBE = 'SELECT rowid FROM verse_fts LIMIT 0'
+VERSE_INDEX_SEARCH = 'SELECT verse.* FROM (SELECT rowid, rank FROM verse_fts WHERE verse_fts MATCH :query) AS found ' \
+    'JOIN verse ON verse.id = found.rowid ORDER BY found.rank'
+# The tables of book names for reference lookups by language selection, see get_book_name_lookup().
+BOOK_NAME_LOOKUPS = {}
+# A book in the catalogue of a Bible, see BibleDB._load_catalogue(). The catalogue keeps plain values rather than
+# Book objects, which the session expires on every commit.
+CatalogueBook = namedtuple('CatalogueBook', 'id name book_reference_id testament_reference_id')
+# The number of parameters SQLite allows in one query by default.
+SQLITE_MAX_VARIABLES = 999
+# The number of verse ranges which are looked up in one query. Each range takes four parameters.
+RANGES_PER_QUERY = 200
 
 class BibleMeta(BaseModel):
     """
@@ -113,9 +143,221 @@ def init_schema(url):
         mapper(Verse, verse_table)
 
     metadata.create_all(checkfirst=True)
+    check_verse_index(session)
     return session
 
 
+def has_verse_index(session):
+    """
+    Return ``True`` if the database has a full text index of the verses which is kept up to date.
+
+    ``session``
+        The database session.
+    """
+    if session.bind.dialect.name != 'sqlite':
+        return False
+    return _has_verse_index_table(session) and \
+        _count_verse_index_triggers(session) == len(VERSE_INDEX_TRIGGER_NAMES)
+
+
+def _has_verse_index_table(session):
+    """
+    Return ``True`` if the database has the table of the full text index of the verses.
+
+    ``session``
+        The database session.
+    """
+    return bool(session.execute(sql_text('SELECT COUNT(*) FROM sqlite_master WHERE type = \'table\' AND name = :name'),
+        {'name': VERSE_INDEX_TABLE}).scalar())
+
+
+def _count_verse_index_triggers(session):
+    """
+    Return the number of the triggers which keep the full text index of the verses up to date.
+
+    ``session``
+        The database session.
+    """
+    return session.execute(sql_text('SELECT COUNT(*) FROM sqlite_master WHERE type = \'trigger\' AND name IN '
+        '(:insert, :delete, :update)'), dict(zip(('insert', 'delete', 'update'), VERSE_INDEX_TRIGGER_NAMES))).scalar()
+
+
+def _drop_verse_index_triggers(session):
+    """
+    Drop the triggers of the full text index of the verses. Without FTS5 every change of the verses would fail on them.
+
+    ``session``
+        The database session.
+    """
+    for name in VERSE_INDEX_TRIGGER_NAMES:
+        session.execute(sql_text('DROP TRIGGER IF EXISTS %s' % name))
+
+
+def _disable_verse_index(session):
+    """
+    Roll back a failed use of the full text index of the verses and drop its triggers, so that the verses can still be
+    changed.
+
+    ``session``
+        The database session.
+    """
+    session.rollback()
+    try:
+        _drop_verse_index_triggers(session)
+        session.commit()
+    except DBAPIError:
+        log.exception('Could not drop the triggers of the verse index.')
+        session.rollback()
+
+
+def check_verse_index(session):
+    """
+    Check the full text index of the verses when a Bible is opened. If the Bible was indexed by an SQLite build with
+    FTS5 and is opened by one without it, the triggers of the index are dropped, which would make every change of the
+    verses fail otherwise. The index is neither created nor rebuilt here, as that takes a while for every Bible. This is
+    done after imports and upgrades and by the rebuild tool, until then the Bible is searched without the index.
+
+    ``session``
+        The database session.
+    """
+    if session.bind.dialect.name != 'sqlite':
+        return
+    try:
+        if not _has_verse_index_table(session):
+            return
+        session.execute(sql_text(VERSE_INDEX_PROBE))
+    except DBAPIError:
+        log.exception('The verse index is not available, searching without it.')
+        _disable_verse_index(session)
+
+
+def init_verse_index(session, rebuild=False):
+    """
+    Create the full text index of the verses if it does not exist yet, and fill it with the verses which are already in
+    the database. Only SQLite databases with the FTS5 extension get an index, the others are searched without it.
+    The triggers which keep the index up to date are only created once the index works. If the database was indexed
+    by an SQLite build with FTS5 and is opened by one without it, the triggers are dropped, see
+    :func:`check_verse_index`. The index missed the changes meanwhile, so it is rebuilt the next time this is called
+    with FTS5 available. This is called after imports and upgrades and by the rebuild tool. Returns ``True`` if the
+    index is available.
+
+    ``session``
+        The database session.
+
+    ``rebuild``
+        Rebuild an existing index as well.
+    """
+    if session.bind.dialect.name != 'sqlite':
+        return False
+    try:
+        if not _has_verse_index_table(session):
+            log.debug('Creating the verse index')
+            session.execute(sql_text(VERSE_INDEX_CREATE))
+            rebuild = True
+        else:
+            session.execute(sql_text(VERSE_INDEX_PROBE))
+            # The index missed the changes of the verses while it had no triggers.
+            if _count_verse_index_triggers(session) < len(VERSE_INDEX_TRIGGER_NAMES):
+                rebuild = True
+    except DBAPIError:
+        log.exception('The verse index is not available, searching without it.')
+        _disable_verse_index(session)
+        return False
+    try:
+        for trigger in VERSE_INDEX_TRIGGERS:
+            session.execute(sql_text(trigger))
+        if rebuild:
+            session.execute(sql_text(VERSE_INDEX_REBUILD))
+        session.commit()
+        return True
+    except DBAPIError:
+        log.exception('Could not build the verse index, searching without it.')
+        session.rollback()
+        return False
+
+
+def get_verse_index_query(text):
+    """
+    Translate the text of a verse search into a full text query.
+
+    ``text``
+        The text to search for. If the text contains commas, it is split apart and the parts are OR'd, each part
+        being a phrase. Otherwise it is split at the spaces and the words are AND'd, where text in double quotes is
+        kept together as a phrase. A trailing ``*`` turns a word or phrase into a prefix query. The last word or
+        phrase is always a prefix, so that a word which is not typed completely is still found, for example "Jesu"
+        finds "Jesus". Unlike the search without the index, a word does not match in the middle of other words.
+    """
+    if text.find(',') > -1:
+        keywords = text.split(',')
+        operator = ' OR '
+    else:
+        keywords = re.findall(r'"[^"]*"?\*?|[^\s"]+', text)
+        operator = ' AND '
+    terms = []
+    for keyword in keywords:
+        words = re.findall(r'\w+', keyword, re.UNICODE)
+        if not words:
+            continue
+        term = '"%s"' % ' '.join(words)
+        if keyword.strip().rstrip('"').endswith('*'):
+            term += '*'
+        terms.append(term)
+    if terms and not terms[-1].endswith('*'):
+        terms[-1] += '*'
+    return operator.join(terms)
+
+
+def get_catalogue_book(book):
+    """
+    Return the ``CatalogueBook`` of a ``Book`` object.
+
+    ``book``
+        The book object.
+    """
+    return CatalogueBook(book.id, book.name, book.book_reference_id, book.testament_reference_id)
+
+
+def normalise_book_name(name):
+    """
+    Return a book name in lower case without whitespace, to compare it with typed book names.
+
+    ``name``
+        The book name.
+    """
+    return ''.join(name.lower().split())
+
+
+def get_book_name_lookup(language_selection):
+    """
+    Return the lookup table of the book names of a language selection. It maps every prefix of a normalised book name
+    to the book_reference_ids of the books starting with it, in the order of the book names. The table is built on
+    first use.
+
+    ``language_selection``
+        ``LanguageSelection.Application`` for the translated book names, ``LanguageSelection.English`` for the English
+        ones.
+    """
+    if language_selection not in BOOK_NAME_LOOKUPS:
+        from openlp.plugins.bibles.lib import LanguageSelection, BibleStrings
+        if language_selection == LanguageSelection.Application:
+            book_names = []
+            for abbreviation, name in BibleStrings().BookNames.items():
+                book = BiblesResourcesDB.get_book(abbreviation)
+                if book:
+                    book_names.append((str(name), book['id']))
+        else:
+            book_names = [(book['name'], book['id']) for book in BiblesResourcesDB.get_books()]
+        lookup = {}
+        for name, book_ref_id in book_names:
+            name = normalise_book_name(name)
+            for length in range(1, len(name) + 1):
+                book_ref_ids = lookup.setdefault(name[:length], [])
+                if book_ref_id not in book_ref_ids:
+                    book_ref_ids.append(book_ref_id)
+        BOOK_NAME_LOOKUPS[language_selection] = lookup
+    return BOOK_NAME_LOOKUPS[language_selection]
+
+
 class BibleDB(QtCore.QObject, Manager):
     """
     This class represents a database-bound Bible. It is used as a base class
@@ -160,6 +402,10 @@ class BibleDB(QtCore.QObject, Manager):
         if 'path' in kwargs:
             self.path = kwargs['path']
         self.wizard = None
+        self.verse_index = bool(self.session) and has_verse_index(self.session)
+        # The catalogue of the books, see _load_catalogue().
+        self.catalogue_books = None
+        self.catalogue_verse_counts = None
         Registry().execute('openlp_stop_wizard', self.stop_import)
 
     def stop_import(self):
@@ -207,6 +453,10 @@ class BibleDB(QtCore.QObject, Manager):
         log.debug('BibleDB.create_book("%s", "%s")', name, bk_ref_id)
         book = Book.populate(name=name, book_reference_id=bk_ref_id, testament_reference_id=testament)
         self.save_object(book)
+        if self.catalogue_books is not None:
+            self.catalogue_books.setdefault(book.book_reference_id, get_catalogue_book(book))
+            self.catalogue_verse_counts[book.id] = {}
+        self._books_changed()
         return book
 
     def update_book(self, book):
@@ -217,6 +467,8 @@ class BibleDB(QtCore.QObject, Manager):
             The book object
         """
         log.debug('BibleDB.update_book("%s")', book.name)
+        self._clear_catalogue()
+        self._books_changed()
         return self.save_object(book)
 
     def delete_book(self, db_book):
@@ -228,9 +480,18 @@ class BibleDB(QtCore.QObject, Manager):
         """
         log.debug('BibleDB.delete_book("%s")', db_book.name)
         if self.delete_object(Book, db_book.id):
+            self._clear_catalogue()
+            self._books_changed()
             return True
         return False
 
+    def _books_changed(self):
+        """
+        Forget the parsed references, which might refer to books that have been added, renamed or removed.
+        """
+        from openlp.plugins.bibles.lib import clear_reference_cache
+        clear_reference_cache()
+
     def create_chapter(self, book_id, chapter, textlist):
         """
         Add a chapter and its verses to a book.
@@ -255,6 +516,7 @@ class BibleDB(QtCore.QObject, Manager):
                 text=verse_text
             )
             self.session.add(verse)
+            self._add_to_catalogue(book_id, chapter, verse_number)
         self.session.commit()
 
     def create_verse(self, book_id, chapter, verse, text):
@@ -283,8 +545,88 @@ class BibleDB(QtCore.QObject, Manager):
             text=text
         )
         self.session.add(verse)
+        self._add_to_catalogue(book_id, chapter, verse.verse)
         return verse
 
+    def _load_catalogue(self):
+        """
+        Load the catalogue of the Bible, unless it has been loaded already. The catalogue keeps the books as
+        ``CatalogueBook`` tuples by their book_reference_id and the number of verses of each chapter by the id of the
+        book, so references can be resolved without querying the database. The methods which add books and verses keep
+        it up to date, the ones which change or remove books clear it.
+        """
+        if self.catalogue_books is not None:
+            return
+        log.debug('BibleDB._load_catalogue("%s")', self.name)
+        books = self.get_all_objects(Book, order_by_ref=Book.id)
+        self.catalogue_books = OrderedDict()
+        self.catalogue_verse_counts = {}
+        for book in books:
+            self.catalogue_books.setdefault(book.book_reference_id, get_catalogue_book(book))
+            self.catalogue_verse_counts[book.id] = {}
+        verse_counts = self.session.query(Verse.book_id, Verse.chapter, func.max(Verse.verse)) \
+            .group_by(Verse.book_id, Verse.chapter) \
+            .all()
+        for book_id, chapter, count in verse_counts:
+            self.catalogue_verse_counts.setdefault(book_id, {})[chapter] = count
+
+    def _clear_catalogue(self):
+        """
+        Clear the catalogue after books have been changed or removed. It is loaded again when it is needed.
+        """
+        self.catalogue_books = None
+        self.catalogue_verse_counts = None
+
+    def _get_catalogue_book(self, book_ref_id):
+        """
+        Return the ``CatalogueBook`` of a book, or ``None`` if the Bible does not have the book.
+
+        ``book_ref_id``
+            The book reference id.
+        """
+        self._load_catalogue()
+        try:
+            return self.catalogue_books.get(int(book_ref_id))
+        except (ValueError, TypeError):
+            return None
+
+    def _find_catalogue_book(self, name):
+        """
+        Return the ``CatalogueBook`` of the first book whose name starts with ``name``, or ``None``.
+
+        ``name``
+            The name of the book.
+        """
+        self._load_catalogue()
+        name = name.lower()
+        for book in self.catalogue_books.values():
+            if book.name.lower().startswith(name):
+                return book
+        return None
+
+    def _add_to_catalogue(self, book_id, chapter, verse):
+        """
+        Update the verse count of a chapter in the catalogue for a new verse.
+
+        ``book_id``
+            The id of the book.
+
+        ``chapter``
+            The chapter number.
+
+        ``verse``
+            The verse number.
+        """
+        if self.catalogue_verse_counts is None:
+            return
+        try:
+            chapter = int(chapter)
+            verse = int(verse)
+        except (ValueError, TypeError):
+            return
+        chapters = self.catalogue_verse_counts.setdefault(book_id, {})
+        chapters[chapter] = max(chapters.get(chapter, 0), verse)
+
     def save_meta(self, key, value):
         """
         Utility method to save or update BibleMeta objects in a Bible database.
@@ -313,7 +655,8 @@ class BibleDB(QtCore.QObject, Manager):
             The name of the book to return.
         """
         log.debug('BibleDB.get_book("%s")', book)
-        return self.get_object_filtered(Book, Book.name.like(book + '%'))
+        book = self._find_catalogue_book(book)
+        return self.get_object(Book, book.id) if book else None
 
     def get_books(self):
         """
@@ -321,7 +664,9 @@ class BibleDB(QtCore.QObject, Manager):
         manager can call. Used in the media manager advanced search tab.
         """
         log.debug('BibleDB.get_books()')
-        return self.get_all_objects(Book, order_by_ref=Book.id)
+        self._load_catalogue()
+        books = dict((book.id, book) for book in self.get_all_objects(Book))
+        return [books[book.id] for book in self.catalogue_books.values() if book.id in books]
 
     def get_book_by_book_ref_id(self, id):
         """
@@ -331,7 +676,8 @@ class BibleDB(QtCore.QObject, Manager):
             The reference id of the book to return.
         """
         log.debug('BibleDB.get_book_by_book_ref_id("%s")', id)
-        return self.get_object_filtered(Book, Book.book_reference_id.like(id))
+        book = self._get_catalogue_book(id)
+        return self.get_object(Book, book.id) if book else None
 
     def get_book_ref_id_by_name(self, book, maxbooks, language_id=None):
         log.debug('BibleDB.get_book_ref_id_by_name:("%s", "%s")', book, language_id)
@@ -364,33 +710,20 @@ class BibleDB(QtCore.QObject, Manager):
             The language selection the user has chosen in the settings section of the Bible.
         """
         log.debug('get_book_ref_id_by_localised_name("%s", "%s")', book, language_selection)
-        from openlp.plugins.bibles.lib import LanguageSelection, BibleStrings
-        book_names = BibleStrings().BookNames
-        # escape reserved characters
-        book_escaped = book
-        for character in RESERVED_CHARACTERS:
-            book_escaped = book_escaped.replace(character, '\\' + character)
-        regex_book = re.compile('\s*%s\s*' % '\s*'.join(
-            book_escaped.split()), re.UNICODE | re.IGNORECASE)
+        from openlp.plugins.bibles.lib import LanguageSelection
         if language_selection == LanguageSelection.Bible:
-            db_book = self.get_book(book)
+            db_book = self._find_catalogue_book(book)
             if db_book:
                 return db_book.book_reference_id
-        elif language_selection == LanguageSelection.Application:
-            books = [key for key in list(book_names.keys()) if regex_book.match(str(book_names[key]))]
-            books = [_f for _f in map(BiblesResourcesDB.get_book, books) if _f]
-            for value in books:
-                if self.get_book_by_book_ref_id(value['id']):
-                    return value['id']
-        elif language_selection == LanguageSelection.English:
-            books = BiblesResourcesDB.get_books_like(book)
-            if books:
-                book_list = [value for value in books if regex_book.match(value['name'])]
-                if not book_list:
-                    book_list = books
-                for value in book_list:
-                    if self.get_book_by_book_ref_id(value['id']):
-                        return value['id']
+        elif language_selection in (LanguageSelection.Application, LanguageSelection.English):
+            book_ref_ids = get_book_name_lookup(language_selection).get(normalise_book_name(book))
+            if not book_ref_ids and language_selection == LanguageSelection.English:
+                # Fall back to the books which contain the name somewhere.
+                books = BiblesResourcesDB.get_books_like(book)
+                book_ref_ids = [value['id'] for value in books] if books else []
+            for book_ref_id in book_ref_ids or []:
+                if self._get_catalogue_book(book_ref_id):
+                    return book_ref_id
         return False
 
     def get_verses(self, reference_list, show_error=True):
@@ -410,28 +743,33 @@ class BibleDB(QtCore.QObject, Manager):
             list of ``Verse`` objects. For example::
 
                 [(u'35', 1, 1, 1), (u'35', 2, 2, 3)]
+
+            The verses of all the references are fetched in one query, or a
+            few for very long lists.
         """
         log.debug('BibleDB.get_verses("%s")', reference_list)
-        verse_list = []
         book_error = False
+        ranges = []
         for book_id, chapter, start_verse, end_verse in reference_list:
-            db_book = self.get_book_by_book_ref_id(book_id)
+            db_book = self._get_catalogue_book(book_id)
             if db_book:
-                book_id = db_book.book_reference_id
                 log.debug('Book name corrected to "%s"', db_book.name)
                 if end_verse == -1:
-                    end_verse = self.get_verse_count(book_id, chapter)
-                verses = self.session.query(Verse) \
-                    .filter_by(book_id=db_book.id) \
-                    .filter_by(chapter=chapter) \
-                    .filter(Verse.verse >= start_verse) \
-                    .filter(Verse.verse <= end_verse) \
-                    .order_by(Verse.verse) \
-                    .all()
-                verse_list.extend(verses)
+                    end_verse = self.get_verse_count(db_book.book_reference_id, chapter)
+                ranges.append((db_book.id, int(chapter), start_verse, end_verse))
             else:
                 log.debug('OpenLP failed to find book with id "%s"', book_id)
                 book_error = True
+        # Fetch all the ranges at once, then put the verses in the order of the references.
+        chapters = {}
+        for verse in self._get_verse_ranges(ranges):
+            chapters.setdefault((verse.book_id, verse.chapter), []).append(verse)
+        for verses in chapters.values():
+            verses.sort(key=lambda verse: verse.verse)
+        verse_list = []
+        for book_id, chapter, start_verse, end_verse in ranges:
+            verse_list.extend(verse for verse in chapters.get((book_id, chapter), [])
+                if start_verse <= verse.verse <= end_verse)
         if book_error and show_error:
             critical_error_message_box(
                 translate('BiblesPlugin', 'No Book Found'),
@@ -441,15 +779,30 @@ class BibleDB(QtCore.QObject, Manager):
 
     def verse_search(self, text):
         """
-        Search for verses containing text ``text``.
+        Search for verses containing text ``text``. The full text index is used if the Bible has one, the verses are
+        then ordered by relevance. If the index cannot be searched, for example because SQLite lacks FTS5, the verse
+        texts are searched without it.
 
         ``text``
             The text to search for. If the text contains commas, it will be
             split apart and OR'd on the list of values. If the text just
             contains spaces, it will split apart and AND'd on the list of
-            values.
+            values. See :func:`get_verse_index_query` for phrase and prefix
+            queries.
         """
         log.debug('BibleDB.verse_search("%s")', text)
+        if self.verse_index:
+            query = get_verse_index_query(text)
+            if not query:
+                return []
+            try:
+                verses = self.session.query(Verse).from_statement(sql_text(VERSE_INDEX_SEARCH)).params(
+                    query=query).all()
+                self._load_books(verses)
+                return verses
+            except DBAPIError:
+                log.exception('The verse index could not be searched, searching without it.')
+                self.session.rollback()
         verses = self.session.query(Verse)
         if text.find(',') > -1:
             keywords = \
@@ -462,8 +815,90 @@ class BibleDB(QtCore.QObject, Manager):
             for keyword in keywords:
                 verses = verses.filter(Verse.text.like(keyword))
         verses = verses.all()
+        self._load_books(verses)
+        return verses
+
+    def get_verses_for_refs(self, references):
+        """
+        Return the verses for a list of single verse references in a few queries, for example to look up the verses of
+        a text search in the second Bible.
+
+        ``references``
+            A list of ``(book_reference_id, chapter, verse)`` tuples.
+
+        Returns a list in the order of ``references``, with a ``Verse`` object or ``None`` where this Bible does not
+        have the verse.
+        """
+        log.debug('BibleDB.get_verses_for_refs(%d references)', len(references))
+        self._load_catalogue()
+        books = self.catalogue_books
+        chapters = {}
+        for book_ref_id, chapter, verse in references:
+            if book_ref_id in books:
+                chapters.setdefault((books[book_ref_id].id, chapter), set()).add(verse)
+        # Look up consecutive verses as one range.
+        ranges = []
+        for (book_id, chapter), verses in sorted(chapters.items()):
+            verses = sorted(verses)
+            start_verse = verses[0]
+            for previous_verse, verse in zip(verses, verses[1:] + [None]):
+                if verse != previous_verse + 1:
+                    ranges.append((book_id, chapter, start_verse, previous_verse))
+                    start_verse = verse
+        found = dict(((verse.book_id, verse.chapter, verse.verse), verse) for verse in self._get_verse_ranges(ranges))
+        verse_list = []
+        for book_ref_id, chapter, verse in references:
+            book = books.get(book_ref_id)
+            verse_list.append(found.get((book.id, chapter, verse)) if book else None)
+        return verse_list
+
+    def _get_verse_ranges(self, ranges):
+        """
+        Return the verses of a list of verse ranges with their books loaded, using one query for up to
+        ``RANGES_PER_QUERY`` ranges, which keeps each query below ``SQLITE_MAX_VARIABLES`` parameters. Each verse is
+        returned once, even if several ranges contain it, and the verses are ordered by their id, which is the order
+        they were imported in.
+
+        ``ranges``
+            A list of ``(book_id, chapter, start_verse, end_verse)`` tuples, where ``book_id`` is the id of the book in
+            this Bible.
+        """
+        verses = {}
+        for index in range(0, len(ranges), RANGES_PER_QUERY):
+            clauses = [and_(Verse.book_id == book_id, Verse.chapter == chapter, Verse.verse >= start_verse,
+                Verse.verse <= end_verse) for book_id, chapter, start_verse, end_verse in
+                ranges[index:index + RANGES_PER_QUERY]]
+            # Ranges in different queries may overlap.
+            verses.update((verse.id, verse) for verse in
+                self.session.query(Verse).filter(or_(*clauses)).order_by(Verse.id).all())
+        verses = [verses[verse_id] for verse_id in sorted(verses)]
+        self._load_books(verses)
         return verses
 
+    def _load_books(self, verses):
+        """
+        Load the books of ``verses`` in one query and set them, so using ``verse.book`` does not query the database for
+        each verse.
+
+        ``verses``
+            A list of ``Verse`` objects.
+        """
+        if not verses:
+            return
+        book_ids = set(verse.book_id for verse in verses)
+        books = dict((book.id, book) for book in self.get_all_objects(Book, Book.id.in_(book_ids)))
+        for verse in verses:
+            set_committed_value(verse, 'book', books.get(verse.book_id))
+
+    def rebuild_verse_index(self):
+        """
+        Rebuild the full text index of the verses, creating it if the Bible does not have one yet. This is done once
+        the verses have been imported, so they are indexed in one go rather than one by one.
+        """
+        log.debug('BibleDB.rebuild_verse_index("%s")', self.name)
+        self.verse_index = init_verse_index(self.session, True)
+        return self.verse_index
+
     def get_chapter_count(self, book):
         """
         Return the number of chapters in a book.
@@ -472,11 +907,11 @@ class BibleDB(QtCore.QObject, Manager):
             The book object to get the chapter count for.
         """
         log.debug('BibleDB.get_chapter_count("%s")', book.name)
-        count = self.session.query(func.max(Verse.chapter)).join(Book).filter(
-            Book.book_reference_id==book.book_reference_id).scalar()
-        if not count:
+        db_book = self._get_catalogue_book(book.book_reference_id)
+        if not db_book:
             return 0
-        return count
+        chapters = self.catalogue_verse_counts.get(db_book.id)
+        return max(chapters) if chapters else 0
 
     def get_verse_count(self, book_ref_id, chapter):
         """
@@ -489,13 +924,10 @@ class BibleDB(QtCore.QObject, Manager):
             The chapter to get the verse count for.
         """
         log.debug('BibleDB.get_verse_count("%s", "%s")', book_ref_id, chapter)
-        count = self.session.query(func.max(Verse.verse)).join(Book) \
-            .filter(Book.book_reference_id == book_ref_id) \
-            .filter(Verse.chapter == chapter) \
-            .scalar()
-        if not count:
+        db_book = self._get_catalogue_book(book_ref_id)
+        if not db_book:
             return 0
-        return count
+        return self.catalogue_verse_counts.get(db_book.id, {}).get(int(chapter), 0)
 
     def get_language(self, bible_name=None):
         """
@@ -42,7 +42,7 @@ from openlp.core.lib import Registry, translate
 from openlp.core.lib.ui import critical_error_message_box
 from openlp.core.utils import get_web_page
 from openlp.plugins.bibles.lib import SearchResults
-from openlp.plugins.bibles.lib.db import BibleDB, BiblesResourcesDB, Book
+from openlp.plugins.bibles.lib.db import BibleDB, BiblesResourcesDB
 
 CLEANER_REGEX = re.compile(r'&nbsp;|<br />|\'\+\'')
 FIX_PUNKCTUATION_REGEX = re.compile(r'[ ]+([.,;])')
@@ -606,7 +606,7 @@ class HTTPBible(BibleDB):
         log.debug('HTTPBible.get_verses("%s")', reference_list)
         for reference in reference_list:
             book_id = reference[0]
-            db_book = self.get_book_by_book_ref_id(book_id)
+            db_book = self._get_catalogue_book(book_id)
             if not db_book:
                 if show_error:
                     critical_error_message_box(
@@ -614,25 +614,55 @@ class HTTPBible(BibleDB):
                         translate('BiblesPlugin', 'No matching book could be found in this Bible. Check that you have '
                         'spelled the name of the book correctly.'))
                 return []
-            book = db_book.name
-            if BibleDB.get_verse_count(self, book_id, reference[1]) == 0:
-                self.application.set_busy_cursor()
-                search_results = self.get_chapter(book, reference[1])
-                if search_results and search_results.has_verse_list():
-                    ## We have found a book of the bible lets check to see
-                    ## if it was there. By reusing the returned book name
-                    ## we get a correct book. For example it is possible
-                    ## to request ac and get Acts back.
-                    book_name = search_results.book
-                    self.application.process_events()
-                    # Check to see if book/chapter exists.
-                    db_book = self.get_book(book_name)
-                    self.create_chapter(db_book.id, search_results.chapter, search_results.verse_list)
-                    self.application.process_events()
-                self.application.set_normal_cursor()
-            self.application.process_events()
+            self._download_chapter(db_book, reference[1])
         return BibleDB.get_verses(self, reference_list, show_error)
 
+    def get_verses_for_refs(self, references):
+        """
+        A reimplementation of the ``BibleDB.get_verses_for_refs`` method for web Bibles. It first downloads the
+        chapters of the references which are not in the DB yet, then looks the verses up using the ancestor method.
+
+        ``references``
+            A list of ``(book_reference_id, chapter, verse)`` tuples.
+        """
+        log.debug('HTTPBible.get_verses_for_refs(%d references)', len(references))
+        chapters = []
+        for book_id, chapter, verse in references:
+            if (book_id, chapter) not in chapters:
+                chapters.append((book_id, chapter))
+        for book_id, chapter in chapters:
+            db_book = self._get_catalogue_book(book_id)
+            if db_book:
+                self._download_chapter(db_book, chapter)
+        return BibleDB.get_verses_for_refs(self, references)
+
+    def _download_chapter(self, db_book, chapter):
+        """
+        Download a chapter and save it in the DB, unless the DB has it already.
+
+        ``db_book``
+            The book of the chapter.
+
+        ``chapter``
+            The chapter number.
+        """
+        if BibleDB.get_verse_count(self, db_book.book_reference_id, chapter) == 0:
+            self.application.set_busy_cursor()
+            search_results = self.get_chapter(db_book.name, chapter)
+            if search_results and search_results.has_verse_list():
+                ## We have found a book of the bible lets check to see
+                ## if it was there. By reusing the returned book name
+                ## we get a correct book. For example it is possible
+                ## to request ac and get Acts back.
+                book_name = search_results.book
+                self.application.process_events()
+                # Check to see if book/chapter exists.
+                db_book = self.get_book(book_name)
+                self.create_chapter(db_book.id, search_results.chapter, search_results.verse_list)
+                self.application.process_events()
+            self.application.set_normal_cursor()
+        self.application.process_events()
+
     def get_chapter(self, book, chapter):
         """
         Receive the request and call the relevant handler methods.
@@ -647,13 +677,6 @@ class HTTPBible(BibleDB):
             handler = BSExtract(self.proxy_server)
         return handler.get_bible_chapter(self.download_name, book, chapter)
 
-    def get_books(self):
-        """
-        Return the list of books.
-        """
-        log.debug('HTTPBible.get_books("%s")', Book.name)
-        return self.get_all_objects(Book, order_by_ref=Book.id)
-
     def get_chapter_count(self, book):
         """
         Return the number of chapters in a particular book.
@@ -32,7 +32,8 @@ import os
 
 from openlp.core.lib import Registry, Settings, translate
 from openlp.core.utils import AppLocation, delete_file
-from openlp.plugins.bibles.lib import parse_reference, get_reference_separator, LanguageSelection
+from openlp.plugins.bibles.lib import parse_reference, clear_reference_cache, get_reference_separator, \
+    LanguageSelection
 from openlp.plugins.bibles.lib.db import BibleDB, BibleMeta
 from .csvbible import CSVBible
 from .http import HTTPBible
@@ -119,6 +120,7 @@ class BibleManager(object):
         BibleDB class.
         """
         log.debug('Reload bibles')
+        clear_reference_cache()
         files = AppLocation.get_files(self.settings_section, self.suffix)
         if 'alternative_book_names.sqlite' in files:
             files.remove('alternative_book_names.sqlite')
@@ -189,6 +191,7 @@ class BibleManager(object):
         bible = self.db_cache[name]
         bible.session.close()
         bible.session = None
+        clear_reference_cache()
         return delete_file(os.path.join(bible.path, bible.file))
 
     def get_bibles(self):
@@ -387,6 +390,18 @@ class BibleManager(object):
                 )
             return None
 
+    def rebuild_verse_indexes(self):
+        """
+        Rebuild the full text indexes of all Bibles, creating them where they are missing. Returns the names of the
+        Bibles which could not be indexed.
+        """
+        log.debug('BibleManager.rebuild_verse_indexes()')
+        failed = []
+        for name, bible in self.db_cache.items():
+            if not bible.rebuild_verse_index():
+                failed.append(name)
+        return failed
+
     def save_meta_data(self, bible, version, copyright, permissions,
         book_name_language=None):
         """
@@ -663,21 +663,22 @@ class BibleMediaItem(MediaManagerItem):
             bibles = self.plugin.manager.get_bibles()
             self.search_results = self.plugin.manager.verse_search(bible, second_bible, text)
             if second_bible and self.search_results:
-                text = []
+                references = [(verse.book.book_reference_id, verse.chapter, verse.verse)
+                    for verse in self.search_results]
+                second_verses = bibles[second_bible].get_verses_for_refs(references)
                 new_search_results = []
+                new_second_search_results = []
                 count = 0
                 passage_not_found = False
-                for verse in self.search_results:
-                    db_book = bibles[second_bible].get_book_by_book_ref_id(verse.book.book_reference_id)
-                    if not db_book:
+                for verse, second_verse in zip(self.search_results, second_verses):
+                    if not second_verse:
                         log.debug('Passage "%s %d:%d" not found in Second Bible' %
                             (verse.book.name, verse.chapter, verse.verse))
                         passage_not_found = True
                         count += 1
                         continue
                     new_search_results.append(verse)
-                    text.append((verse.book.book_reference_id, verse.chapter,
-                        verse.verse, verse.verse))
+                    new_second_search_results.append(second_verse)
                 if passage_not_found:
                     QtGui.QMessageBox.information(self, translate('BiblesPlugin.MediaItem', 'Information'),
                         translate('BiblesPlugin.MediaItem', 'The second Bible does not contain all the verses '
@@ -685,7 +686,7 @@ class BibleMediaItem(MediaManagerItem):
                             'have not been included in the results.') % count,
                         QtGui.QMessageBox.StandardButtons(QtGui.QMessageBox.Ok))
                 self.search_results = new_search_results
-                self.second_search_results = bibles[second_bible].get_verses(text)
+                self.second_search_results = new_second_search_results
         if not self.quickLockButton.isChecked():
             self.list_view.clear()
         if self.list_view.count() != 0 and self.search_results:
@@ -726,16 +727,19 @@ class BibleMediaItem(MediaManagerItem):
             second_permissions = self.plugin.manager.get_meta_data(second_bible, 'permissions').value
         items = []
         language_selection = self.plugin.manager.get_language_selection(bible)
+        if language_selection != LanguageSelection.Bible:
+            # Look up all the books at once, instead of once for each verse.
+            reference_books = dict((data['id'], data) for data in BiblesResourcesDB.get_books())
+            book_names = BibleStrings().BookNames
         for count, verse in enumerate(search_results):
             book = None
             if language_selection == LanguageSelection.Bible:
                 book = verse.book.name
             elif language_selection == LanguageSelection.Application:
-                book_names = BibleStrings().BookNames
-                data = BiblesResourcesDB.get_book_by_id(verse.book.book_reference_id)
+                data = reference_books[verse.book.book_reference_id]
                 book = str(book_names[data['abbreviation']])
             elif language_selection == LanguageSelection.English:
-                data = BiblesResourcesDB.get_book_by_id(verse.book.book_reference_id)
+                data = reference_books[verse.book.book_reference_id]
                 book = data['name']
             data = {
                 'book': book,
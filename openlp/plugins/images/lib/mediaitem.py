@@ -587,9 +587,8 @@ class ImageMediaItem(MediaManagerItem):
             QtGui.QMessageBox.StandardButtons(QtGui.QMessageBox.No | QtGui.QMessageBox.Yes)) == QtGui.QMessageBox.No:
             return False
         # Continue with the existing images.
-        for filename in images_filenames:
-            name = os.path.split(filename)[1]
-            service_item.add_from_image(filename, name, background)
+        service_item.add_from_images([(filename, os.path.split(filename)[1]) for filename in images_filenames],
+            background)
         return True
 
     def check_group_exists(self, new_group):
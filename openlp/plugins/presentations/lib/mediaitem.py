@@ -265,10 +265,12 @@ class PresentationMediaItem(MediaManagerItem):
                 i = 1
                 img = doc.get_thumbnail_path(i, True)
                 if img:
+                    commands = []
                     while img:
-                        service_item.add_from_command(path, name, img)
+                        commands.append((path, name, img))
                         i += 1
                         img = doc.get_thumbnail_path(i, True)
+                    service_item.add_from_commands(commands)
                     doc.close_presentation()
                     return True
                 else:
@@ -124,7 +124,7 @@ import cherrypy
 from mako.template import Template
 from PyQt4 import QtCore
 
-from openlp.core.lib import Registry, Settings, PluginStatus, StringContent, image_to_byte
+from openlp.core.lib import Registry, Settings, PluginStatus, StringContent
 from openlp.core.utils import AppLocation, translate
 
 from hashlib import sha1
@@ -462,7 +462,7 @@ class HttpRouter(object):
         Return the latest display image as a byte stream.
         """
         result = {
-            'slide_image': 'data:image/png;base64,' + str(image_to_byte(self.live_controller.slide_image))
+            'slide_image': 'data:image/png;base64,' + self.live_controller.get_slide_image_bytes()
         }
         cherrypy.response.headers['Content-Type'] = 'application/json'
         return json.dumps({'results': result}).encode()
@@ -512,7 +512,9 @@ class HttpRouter(object):
             current_item = self.live_controller.service_item
             data = []
             if current_item:
-                for index, frame in enumerate(current_item.get_frames()):
+                # Rendering frames needs the web views of the renderer, which must not be used from this thread. The
+                # live slide controller adds the remaining frames in the background.
+                for index, frame in enumerate(current_item.get_frames(rendered_only=True)):
                     item = {}
                     if current_item.is_text():
                         if frame['verseTag']:
@@ -3,11 +3,17 @@
 """
 
 import os
+import shutil
+import tempfile
 from unittest import TestCase
 
+from mock import patch
+
 from PyQt4 import QtCore, QtGui
 
-from openlp.core.lib import Registry, ImageManager, ScreenList
+from openlp.core.lib import Registry, ImageManager, ScreenList, Settings
+from openlp.core.lib import image_to_byte
+from openlp.core.lib.imagemanager import Image, ImageDiskCache, Priority, PriorityQueue
 
 
 TEST_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'resources'))
@@ -23,6 +29,8 @@ class TestImageManager(TestCase):
         self.app = QtGui.QApplication.instance()
         ScreenList.create(self.app.desktop())
         self.image_manager = ImageManager()
+        # Do not write into the real disk cache.
+        self.image_manager.disk_cache.size_limit = 0
 
     def tearDown(self):
         """
@@ -54,3 +62,146 @@ class TestImageManager(TestCase):
         with self.assertRaises(KeyError) as context:
             self.image_manager.get_image(TEST_PATH, 'church1.jpg')
         self.assertNotEquals(context.exception, '', 'KeyError exception should have been thrown for missing image')
+
+    def cache_eviction_test(self):
+        """
+        Test that the Image Manager evicts the least recently used image when the cache exceeds its memory budget
+        """
+        # GIVEN: Two images added to an image manager with a single thread which can only hold one of them
+        image_path = os.path.join(TEST_PATH, 'church.jpg')
+        self.image_manager.image_threads = self.image_manager.image_threads[:1]
+        self.image_manager.cache_size_limit = 1
+        self.image_manager.add_image(image_path, 'first', None)
+        self.image_manager.add_image(image_path, 'second', None)
+
+        # WHEN: Both images are requested one after the other
+        self.image_manager.get_image(image_path, 'first')
+        second_image = self.image_manager.get_image(image_path, 'second')
+
+        # THEN: Only the first image should have been evicted
+        self.assertIsNone(self.image_manager._cache[(image_path, 'first')].image, 'The first image should be evicted')
+        self.assertIsNotNone(second_image, 'The second image should be returned')
+        self.assertGreater(self.image_manager.get_cache_statistics()['evictions'], 0, 'There should be an eviction')
+
+        # WHEN: The evicted image is requested again
+        image = self.image_manager.get_image(image_path, 'first')
+
+        # THEN: The image should be regenerated
+        self.assertEqual(isinstance(image, QtGui.QImage), True, 'The returned object should be a QImage')
+
+    def wait_for_evicted_image_test(self):
+        """
+        Test that waiting for an image which was dropped from the queue queues it again instead of waiting forever
+        """
+        # GIVEN: An image whose QImage has been generated
+        image_path = os.path.join(TEST_PATH, 'church.jpg')
+        self.image_manager.add_image(image_path, 'evicted', None)
+        self.image_manager.get_image(image_path, 'evicted')
+        image = self.image_manager._cache[(image_path, 'evicted')]
+
+        # WHEN: The byte stream is waited for after it has been dropped and the image removed from the queue
+        with self.image_manager._image_ready:
+            self.image_manager._conversion_queue.remove(image)
+            image.image_bytes = None
+            ready = self.image_manager._wait_for(image, Priority.Urgent, lambda: image.image_bytes is not None, 5)
+
+        # THEN: The byte stream should be generated after all
+        self.assertTrue(ready, 'The byte stream should be generated')
+        self.assertNotIn(image, self.image_manager._waiters, 'Nobody should be waiting for the image anymore')
+
+    def unreadable_image_test(self):
+        """
+        Test that an unreadable image file results in an empty image instead of blocking the caller
+        """
+        # GIVEN: A file which does not contain a valid image added to the image manager
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        image_path = os.path.join(temp_dir, 'corrupt.jpg')
+        with open(image_path, 'wb') as image_file:
+            image_file.write(b'This is not an image')
+        self.image_manager.add_image(image_path, 'corrupt', None)
+
+        # WHEN: The image is requested
+        image = self.image_manager.get_image(image_path, 'corrupt', 5)
+
+        # THEN: An empty image should be returned
+        self.assertEqual(isinstance(image, QtGui.QImage), True, 'The returned object should be a QImage')
+        self.assertTrue(image.isNull(), 'The returned image should be empty')
+
+    def unsupported_display_image_format_test(self):
+        """
+        Test that an unsupported display image format falls back to JPEG, so the display images get the right type
+        """
+        # GIVEN: A display image format which the web views are not given as data URIs
+        Settings().setValue('advanced/display image format', 'webp')
+        self.addCleanup(Settings().remove, 'advanced/display image format')
+
+        # WHEN: A new image manager is created
+        image_manager = ImageManager()
+
+        # THEN: The display images should be encoded as JPEG
+        self.assertEqual(image_manager.image_format, 'JPG', 'The images should be encoded as JPEG')
+
+
+class TestPriorityQueue(TestCase):
+
+    def modify_priority_test(self):
+        """
+        Test that modifying the priority of queued images keeps the queue ordered and each image queued once
+        """
+        # GIVEN: A queue with three images of normal priority
+        conversion_queue = PriorityQueue()
+        images = [Image(os.path.join(TEST_PATH, 'church.jpg'), str(number), None) for number in range(3)]
+        for image in images:
+            conversion_queue.put((image.priority, image.secondary_priority, image))
+
+        # WHEN: The last image is made urgent, the first one removed and the second one put again
+        conversion_queue.modify_priority(images[2], Priority.Urgent)
+        conversion_queue.remove(images[0])
+        conversion_queue.put((images[1].priority, images[1].secondary_priority, images[1]))
+
+        # THEN: The urgent image should come first, followed by the second image only
+        self.assertEqual(conversion_queue.qsize(), 2, 'Only two images should be queued')
+        self.assertIs(conversion_queue.get()[2], images[2], 'The urgent image should be returned first')
+        self.assertIs(conversion_queue.get()[2], images[1], 'The second image should be returned next')
+        self.assertTrue(conversion_queue.empty(), 'The queue should be empty')
+
+
+class TestImageDiskCache(TestCase):
+
+    def setUp(self):
+        """
+        Create a temporary cache directory
+        """
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Delete the temporary cache directory
+        """
+        shutil.rmtree(self.cache_path)
+
+    def store_and_load_test(self):
+        """
+        Test that a stored image is loaded from the disk cache, but only for the same size
+        """
+        with patch('openlp.core.lib.imagemanager.AppLocation.get_section_data_path') as mocked_get_section_data_path:
+            # GIVEN: A disk cache and a converted image
+            mocked_get_section_data_path.return_value = self.cache_path
+            disk_cache = ImageDiskCache(1024 * 1024, 'PNG', -1)
+            image = Image(os.path.join(TEST_PATH, 'church.jpg'), 'test', '#000000')
+            image_bytes = image_to_byte(QtGui.QImage(os.path.join(TEST_PATH, 'church.jpg')))
+
+            # WHEN: The image is stored and loaded again
+            disk_cache.store(image, 100, 100, image_bytes)
+            cached = disk_cache.load(image, 100, 100)
+
+            # THEN: The same byte stream should be returned, but nothing for a different size
+            self.assertEqual(cached[1], image_bytes, 'The cached byte stream should be returned')
+            self.assertIsNone(disk_cache.load(image, 200, 100), 'Nothing should be cached for a different size')
+
+            # WHEN: The cache is purged
+            disk_cache.purge()
+
+            # THEN: The image should not be cached anymore
+            self.assertIsNone(disk_cache.load(image, 100, 100), 'The image should not be cached after a purge')
@@ -10,7 +10,8 @@ from mock import MagicMock, patch
 from PyQt4 import QtCore, QtGui
 
 from openlp.core.lib import str_to_bool, create_thumb, translate, check_directory_exists, get_text_file_string, \
-    build_icon, image_to_byte, check_item_selected, validate_thumb, create_separated_list, clean_tags, expand_tags
+    build_icon, image_to_byte, image_data_uri, check_item_selected, validate_thumb, create_separated_list, clean_tags, \
+    expand_tags
 
 
 TEST_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'resources'))
@@ -265,10 +266,26 @@ class TestLib(TestCase):
             MockedQtCore.QByteArray.assert_called_with()
             MockedQtCore.QBuffer.assert_called_with(mocked_byte_array)
             mocked_buffer.open.assert_called_with('writeonly')
-            mocked_image.save.assert_called_with(mocked_buffer, "PNG")
+            mocked_image.save.assert_called_with(mocked_buffer, "PNG", -1)
             mocked_byte_array.toBase64.assert_called_with()
             assert result == 'base64mock', 'The result should be the return value of the mocked out base64 method'
 
+    def image_data_uri_test(self):
+        """
+        Test the image_data_uri() function
+        """
+        # GIVEN: A base64 encoded JPEG and PNG image
+        jpeg_bytes = '/9j/4AAQSkZJRgABAQ'
+        png_bytes = 'iVBORw0KGgoAAAANSUhEUgAA'
+
+        # WHEN: We build data URIs for them
+        jpeg_uri = image_data_uri(jpeg_bytes)
+        png_uri = image_data_uri(png_bytes)
+
+        # THEN: The URIs should have the right MIME types
+        assert jpeg_uri == 'data:image/jpeg;base64,' + jpeg_bytes, 'The JPEG image should have the JPEG MIME type'
+        assert png_uri == 'data:image/png;base64,' + png_bytes, 'The PNG image should have the PNG MIME type'
+
     def create_thumb_with_size_test(self):
         """
         Test the create_thumb() function
@@ -3,6 +3,7 @@
 """
     Package to test the openlp.core.lib package.
 """
+import copy
 import os
 import json
 import tempfile
@@ -74,6 +75,68 @@ class TestServiceItem(TestCase):
         assert service_item.get_frame_title(1) == 'Slide 2', '"Slide 2" has been returned as the title'
         assert service_item.get_frame_title(2) == '', 'Blank has been returned as the title of slide 3'
 
+    def serviceitem_lazy_render_test(self):
+        """
+        Test the Service Item - text slides are only formatted when the frames are requested
+        """
+        # GIVEN: A service item loaded from a saved service and a renderer set up for a theme
+        service_item = ServiceItem(None)
+        service_item.add_icon = MagicMock()
+        service_item.set_from_service(self.convert_file_service_item('serviceitem_custom_1.osj'))
+        mocked_renderer = Registry().get('renderer')
+        mocked_renderer.pre_render.return_value = (MagicMock(), MagicMock(), MagicMock())
+
+        # WHEN: The service item is rendered lazily
+        service_item.render(lazy=True)
+
+        # THEN: No slide has been formatted until the frames are requested
+        assert mocked_renderer.format_slide.call_count == 0, 'No slide should have been formatted yet'
+        assert service_item.is_fully_rendered() is False, 'The service item should not be fully rendered'
+        service_item.get_rendered_frame(0)
+        assert mocked_renderer.format_slide.call_count == 1, 'Only the first slide should have been formatted'
+        assert len(service_item.get_frames()) == 2, 'All the slides should be formatted when the frames are requested'
+        assert service_item.is_fully_rendered() is True, 'The service item should be fully rendered'
+
+    def serviceitem_lazy_render_copy_test(self):
+        """
+        Test the Service Item - a copy of a lazily rendered item renders its frames independently
+        """
+        # GIVEN: A lazily rendered service item and a copy of it
+        service_item = ServiceItem(None)
+        service_item.add_icon = MagicMock()
+        service_item.set_from_service(self.convert_file_service_item('serviceitem_custom_1.osj'))
+        Registry().get('renderer').pre_render.return_value = (MagicMock(), MagicMock(), MagicMock())
+        service_item.render(lazy=True)
+        service_item_copy = copy.copy(service_item)
+
+        # WHEN: The first frame of the copy and then all frames of both items are requested
+        service_item_copy.prefetch_frames(0, 0)
+        rendered_frames = service_item_copy.get_frames(rendered_only=True)
+
+        # THEN: Only the copy should have been rendered, and both items should end up with the same frames
+        assert len(rendered_frames) == 1, 'Only the first frame of the copy should have been rendered'
+        assert service_item.get_frames(rendered_only=True) == [], 'The original item should not have been rendered'
+        assert service_item.get_frames() == service_item_copy.get_frames(), 'Both items should have the same frames'
+        assert len(service_item.get_frames()) == 2, 'The frames should not be duplicated'
+
+    def serviceitem_add_from_images_test(self):
+        """
+        Test the Service Item - adding several images at once only checks every image once
+        """
+        # GIVEN: A new service item and a list of images
+        service_item = ServiceItem(None)
+        images = [('/path/to/image%d.jpg' % number, 'image%d.jpg' % number) for number in range(10)]
+
+        # WHEN: The images are added at once
+        with patch('openlp.core.lib.serviceitem.os.path.exists') as mocked_exists:
+            mocked_exists.return_value = True
+            service_item.add_from_images(images)
+
+        # THEN: There should be a frame for every image and every image should have been checked once
+        assert len(service_item.get_frames()) == 10, 'There should be 10 frames'
+        assert mocked_exists.call_count == 10, 'Every image should have been checked once'
+        assert service_item.is_valid is True, 'The service item should be valid'
+
     def serviceitem_load_image_from_service_test(self):
         """
         Test the Service Item - adding an image from a saved service
@@ -0,0 +1,231 @@
+"""
+This module contains tests for the db submodule of the Bibles plugin.
+"""
+from unittest import TestCase
+
+from mock import MagicMock, patch
+from sqlalchemy.exc import DBAPIError
+
+from openlp.plugins.bibles.lib import LanguageSelection
+from openlp.plugins.bibles.lib.db import BOOK_NAME_LOOKUPS, RANGES_PER_QUERY, SQLITE_MAX_VARIABLES, \
+    VERSE_INDEX_TRIGGER_NAMES, BibleDB, CatalogueBook, check_verse_index, get_book_name_lookup, get_verse_index_query
+
+
+def make_verse(verse_id, book_id, chapter, verse):
+    """
+    Return a mocked verse.
+    """
+    return MagicMock(id=verse_id, book_id=book_id, chapter=chapter, verse=verse)
+
+
+class TestDB(TestCase):
+    """
+    Test the functions in the :mod:`db` module.
+    """
+    def get_verse_index_query_and_test(self):
+        """
+        Test that words separated by spaces are AND'd, keeping quoted phrases and prefixes
+        """
+        # GIVEN: A search text with words, a phrase and a prefix
+        text = 'light "let there be" creat*'
+
+        # WHEN: We translate it into a full text query
+        query = get_verse_index_query(text)
+
+        # THEN: All terms should be required
+        self.assertEqual(query, '"light" AND "let there be" AND "creat"*', 'The terms should be AND\'d')
+
+    def get_verse_index_query_or_test(self):
+        """
+        Test that parts separated by commas are OR'd as phrases
+        """
+        # GIVEN: A search text with commas
+        text = 'in the beginning, Lord\'s ,'
+
+        # WHEN: We translate it into a full text query
+        query = get_verse_index_query(text)
+
+        # THEN: Each non-empty part should be an alternative phrase, the last one a prefix
+        self.assertEqual(query, '"in the beginning" OR "Lord s"*', 'The parts should be OR\'d')
+
+    def get_verse_index_query_prefix_test(self):
+        """
+        Test that the last word is a prefix, so that words which are not typed completely are found
+        """
+        # GIVEN: A search text ending with an incomplete word
+        text = 'wept Jesu'
+
+        # WHEN: We translate it into a full text query
+        query = get_verse_index_query(text)
+
+        # THEN: Only the last word should be a prefix
+        self.assertEqual(query, '"wept" AND "Jesu"*', 'The last word should be a prefix')
+
+    def check_verse_index_without_index_test(self):
+        """
+        Test that opening a Bible without a verse index does not build one
+        """
+        # GIVEN: An SQLite Bible without a verse index
+        session = MagicMock()
+        session.bind.dialect.name = 'sqlite'
+        session.execute.return_value.scalar.return_value = 0
+
+        # WHEN: The verse index is checked
+        check_verse_index(session)
+
+        # THEN: Only the tables should have been looked up
+        self.assertEqual(session.execute.call_count, 1, 'The index should not be created when the Bible is opened')
+        self.assertEqual(session.commit.call_count, 0, 'Nothing should be changed')
+
+    def check_verse_index_without_fts5_test(self):
+        """
+        Test that opening an indexed Bible with an SQLite build without FTS5 drops the triggers of the index
+        """
+        # GIVEN: An SQLite Bible with a verse index, which cannot be used
+        session = MagicMock()
+        session.bind.dialect.name = 'sqlite'
+        table_lookup = MagicMock()
+        table_lookup.scalar.return_value = 1
+        session.execute.side_effect = [table_lookup, DBAPIError('SELECT', {}, Exception('no such module: fts5'))] + \
+            [MagicMock()] * len(VERSE_INDEX_TRIGGER_NAMES)
+
+        # WHEN: The verse index is checked
+        check_verse_index(session)
+
+        # THEN: The triggers should have been dropped
+        statements = [str(execute_call[0][0]) for execute_call in session.execute.call_args_list[2:]]
+        self.assertEqual(statements, ['DROP TRIGGER IF EXISTS %s' % name for name in VERSE_INDEX_TRIGGER_NAMES],
+            'All triggers of the index should be dropped')
+        session.rollback.assert_called_once_with()
+        session.commit.assert_called_once_with()
+
+    def verse_search_without_index_test(self):
+        """
+        Test that verse_search() searches the verse texts when the verse index cannot be searched
+        """
+        # GIVEN: A Bible with a verse index which fails, for example because SQLite lacks FTS5
+        bible = MagicMock(verse_index=True)
+        query = bible.session.query.return_value
+        query.from_statement.return_value.params.return_value.all.side_effect = \
+            DBAPIError('SELECT', {}, Exception('no such module: fts5'))
+        verses = [MagicMock()]
+        query.filter.return_value.filter.return_value.all.return_value = verses
+
+        # WHEN: We search for two words
+        result = BibleDB.verse_search(bible, 'Jesus wept')
+
+        # THEN: The transaction should be rolled back and the verses found by both words returned
+        bible.session.rollback.assert_called_once_with()
+        self.assertEqual(query.filter.call_count, 1, 'The first word should filter the verses')
+        self.assertEqual(query.filter.return_value.filter.call_count, 1, 'The second word should filter them too')
+        self.assertIs(result, verses, 'The verses found without the index should be returned')
+        bible._load_books.assert_called_once_with(verses)
+
+    def load_catalogue_test(self):
+        """
+        Test that the catalogue keeps plain values of the books and the verse counts of their chapters
+        """
+        # GIVEN: A Bible with Genesis twice and John, and the verse counts of their chapters
+        bible = MagicMock(catalogue_books=None)
+        books = [MagicMock(id=1, book_reference_id=1, testament_reference_id=1),
+                 MagicMock(id=2, book_reference_id=43, testament_reference_id=2),
+                 MagicMock(id=3, book_reference_id=1, testament_reference_id=1)]
+        for book, name in zip(books, ['Genesis', 'John', 'Genesis']):
+            book.name = name
+        bible.get_all_objects.return_value = books
+        bible.session.query.return_value.group_by.return_value.all.return_value = [(1, 1, 31), (1, 2, 25), (2, 11, 57)]
+
+        # WHEN: The catalogue is loaded
+        with patch('openlp.plugins.bibles.lib.db.Book'), patch('openlp.plugins.bibles.lib.db.Verse'):
+            BibleDB._load_catalogue(bible)
+
+        # THEN: The first book of each reference id should be kept as a tuple, with the verse counts of its chapters
+        self.assertEqual(list(bible.catalogue_books.values()),
+            [CatalogueBook(1, 'Genesis', 1, 1), CatalogueBook(2, 'John', 43, 2)], 'The books should be kept in order')
+        self.assertEqual(bible.catalogue_verse_counts, {1: {1: 31, 2: 25}, 2: {11: 57}, 3: {}},
+            'The verse counts should be kept by the id of the book')
+
+    def update_book_clears_catalogue_test(self):
+        """
+        Test that changing a book clears the catalogue, so it is loaded again with the new name
+        """
+        # GIVEN: A Bible with a loaded catalogue
+        bible = MagicMock(catalogue_books={1: CatalogueBook(1, 'Genesis', 1, 1)}, catalogue_verse_counts={1: {1: 31}})
+        bible._clear_catalogue.side_effect = lambda: BibleDB._clear_catalogue(bible)
+        book = MagicMock()
+
+        # WHEN: A book is renamed
+        book.name = '1 Moses'
+        BibleDB.update_book(bible, book)
+
+        # THEN: The catalogue should be cleared and the book saved
+        self.assertIsNone(bible.catalogue_books, 'The books should be loaded again')
+        self.assertIsNone(bible.catalogue_verse_counts, 'The verse counts should be loaded again')
+        bible.save_object.assert_called_once_with(book)
+
+    def get_verses_order_test(self):
+        """
+        Test that get_verses() returns the verses in the order of the references, repeating overlapping references
+        """
+        # GIVEN: A Bible with Genesis and John, whose verses are found in the order they were imported
+        bible = MagicMock()
+        books = {1: CatalogueBook(1, 'Genesis', 1, 1), 43: CatalogueBook(2, 'John', 43, 2)}
+        bible._get_catalogue_book.side_effect = books.get
+        genesis_verses = [make_verse(index, 1, 1, index) for index in range(1, 4)]
+        john_verse = make_verse(100, 2, 11, 35)
+        bible._get_verse_ranges.return_value = genesis_verses + [john_verse]
+        references = [(43, 11, 35, 35), (1, 1, 1, 3), (1, 1, 2, 2)]
+
+        # WHEN: The verses of John 11:35, Genesis 1:1-3 and Genesis 1:2 are looked up
+        verses = BibleDB.get_verses(bible, references)
+
+        # THEN: The ranges should be looked up at once, and the verses returned in the order of the references
+        bible._get_verse_ranges.assert_called_once_with([(2, 11, 35, 35), (1, 1, 1, 3), (1, 1, 2, 2)])
+        self.assertEqual(verses, [john_verse] + genesis_verses + [genesis_verses[1]],
+            'The verses should follow the references, Genesis 1:2 should be repeated')
+
+    def get_verse_ranges_chunks_test(self):
+        """
+        Test that a long list of verse ranges is split into queries below SQLite's parameter limit
+        """
+        # GIVEN: More ranges than fit in one query, where the queries find overlapping verses
+        bible = MagicMock()
+        ranges = [(1, chapter, 1, 2) for chapter in range(1, 451)]
+        verses = [make_verse(verse_id, 1, verse_id, 1) for verse_id in range(1, 5)]
+        query = bible.session.query.return_value.filter.return_value.order_by.return_value
+        query.all.side_effect = [[verses[2], verses[3]], [verses[0], verses[2]], [verses[1]]]
+
+        # WHEN: The verses of the ranges are looked up
+        with patch('openlp.plugins.bibles.lib.db.Verse'), patch('openlp.plugins.bibles.lib.db.and_'), \
+                patch('openlp.plugins.bibles.lib.db.or_') as mocked_or:
+            result = BibleDB._get_verse_ranges(bible, ranges)
+
+        # THEN: Each query should stay below the limit, and each verse should be returned once in the order of the ids
+        self.assertEqual(mocked_or.call_count, 3, 'The ranges should be looked up in three queries')
+        for query_call in mocked_or.call_args_list:
+            self.assertLess(len(query_call[0]) * 4, SQLITE_MAX_VARIABLES, 'A query should not take too many parameters')
+        self.assertEqual(sum(len(query_call[0]) for query_call in mocked_or.call_args_list), len(ranges),
+            'Every range should be looked up')
+        self.assertEqual(len(mocked_or.call_args_list[0][0]), RANGES_PER_QUERY, 'The queries should be full')
+        self.assertEqual(result, verses, 'Each verse should be returned once, ordered by id')
+        bible._load_books.assert_called_once_with(verses)
+
+    def get_book_name_lookup_test(self):
+        """
+        Test that the book name lookup maps the normalised prefixes of the book names to their reference ids
+        """
+        # GIVEN: Some English book names
+        books = [{'id': 43, 'name': 'John'}, {'id': 62, 'name': '1 John'}, {'id': 20, 'name': 'Job'}]
+        with patch('openlp.plugins.bibles.lib.db.BiblesResourcesDB.get_books') as mocked_get_books, \
+                patch.dict(BOOK_NAME_LOOKUPS, clear=True):
+            mocked_get_books.return_value = books
+
+            # WHEN: We get the lookup table for the English book names twice
+            lookup = get_book_name_lookup(LanguageSelection.English)
+            get_book_name_lookup(LanguageSelection.English)
+
+            # THEN: The prefixes should map to the books in order, and the table should only be built once
+            self.assertEqual(lookup['jo'], [43, 20], 'Both "John" and "Job" start with "jo"')
+            self.assertEqual(lookup['1jo'], [62], 'Whitespace should be ignored')
+            self.assertNotIn('1 j', lookup, 'The prefixes should not contain whitespace')
+            self.assertEqual(mocked_get_books.call_count, 1, 'The book names should only be read once')
@@ -0,0 +1,135 @@
+"""
+Package to test the openlp.core.lib.renderer package.
+"""
+from unittest import TestCase
+
+from mock import MagicMock, patch
+from PyQt4 import QtGui
+
+from openlp.core.lib import FormattingTags, ItemCapabilities, Registry, Renderer, ScreenList, ServiceItem
+from openlp.core.lib.renderer import VERSE
+from openlp.core.lib.theme import ThemeXML
+
+
+class TestRenderer(TestCase):
+    """
+    Test the Renderer class
+    """
+
+    def setUp(self):
+        """
+        Create the renderer with a mocked out display
+        """
+        Registry.create()
+        self.app = QtGui.QApplication.instance()
+        ScreenList.create(self.app.desktop())
+        Registry().register('image_manager', MagicMock())
+        with patch('openlp.core.lib.renderer.MainDisplay'):
+            self.renderer = Renderer()
+
+    def tearDown(self):
+        """
+        Delete all the C++ objects at the end so that we don't have a segfault
+        """
+        del self.renderer
+        del self.app
+
+    def native_pagination_agreement_test(self):
+        """
+        Test that the native pagination splits a song into the same slides as WebKit
+        """
+        # GIVEN: A song which needs more than one slide and a theme
+        service_item = ServiceItem()
+        service_item.add_capability(ItemCapabilities.CanSoftBreak)
+        text = '\n'.join([VERSE.strip()] * 4)
+        theme = ThemeXML()
+
+        # WHEN: The song is split using WebKit and using the native pagination
+        self.renderer.pre_render(theme)
+        webkit_pages = self.renderer.format_slide(text, service_item)
+        theme.display_native_pagination = True
+        self.renderer.pre_render(theme)
+        native_pages = self.renderer.format_slide(text, service_item)
+
+        # THEN: Both should result in the same slides
+        self.assertGreater(len(webkit_pages), 1, 'The song should need more than one slide')
+        self.assertEqual(native_pages, webkit_pages, 'The native pagination should agree with WebKit')
+
+    def format_slide_cache_test(self):
+        """
+        Test that formatting the same slide twice with the same theme uses the cache
+        """
+        # GIVEN: A song slide and a theme
+        service_item = ServiceItem()
+        service_item.add_capability(ItemCapabilities.CanSoftBreak)
+        self.renderer.pre_render(ThemeXML())
+
+        # WHEN: The slide is formatted twice
+        with patch.object(self.renderer, '_format_slide', return_value=['page']) as mocked_format_slide:
+            first_pages = self.renderer.format_slide(VERSE, service_item)
+            second_pages = self.renderer.format_slide(VERSE, service_item)
+
+            # THEN: The slide should only be split once
+            self.assertEqual(mocked_format_slide.call_count, 1, 'The slide should only be split once')
+            self.assertEqual(first_pages, second_pages, 'The cached pages should be returned')
+
+        # WHEN: The theme is updated
+        self.renderer.update_theme('')
+
+        # THEN: The cache should be empty
+        self.assertEqual(len(self.renderer._format_slide_cache), 0, 'The cache should be cleared')
+
+    def format_slide_cache_formatting_tags_test(self):
+        """
+        Test that changing the formatting tags discards the formatted slides
+        """
+        # GIVEN: A song slide which has been formatted
+        service_item = ServiceItem()
+        service_item.add_capability(ItemCapabilities.CanSoftBreak)
+        self.renderer.pre_render(ThemeXML())
+        with patch.object(self.renderer, '_format_slide', return_value=['page']) as mocked_format_slide:
+            self.renderer.format_slide(VERSE, service_item)
+
+            # WHEN: A formatting tag is removed and the slide is formatted again
+            with patch.object(FormattingTags, 'html_expands', [{'start tag': '{r}'}]):
+                FormattingTags.remove_html_tag(0)
+            self.renderer.format_slide(VERSE, service_item)
+
+            # THEN: The slide should be split again
+            self.assertEqual(mocked_format_slide.call_count, 2, 'The slide should be split again')
+
+    def reuse_web_views_test(self):
+        """
+        Test that the web view of a theme is reused when 'advanced/reuse renderer views' is enabled
+        """
+        # GIVEN: A theme and the reuse of the web views enabled
+        theme = ThemeXML()
+        with patch('openlp.core.lib.renderer.Settings') as mocked_settings:
+            mocked_settings.return_value.value.return_value = True
+
+            # WHEN: The theme is rendered twice
+            self.renderer.pre_render(theme)
+            first_web_view = self.renderer.web
+            self.renderer.pre_render(theme)
+
+        # THEN: The web view should have been kept and reused
+        self.assertEqual(len(self.renderer._web_views), 1, 'The web view should have been kept')
+        self.assertIs(self.renderer.web, first_web_view, 'The web view should have been reused')
+
+    def do_not_reuse_web_views_test(self):
+        """
+        Test that no web views are kept when 'advanced/reuse renderer views' is disabled
+        """
+        # GIVEN: A theme and the reuse of the web views disabled
+        theme = ThemeXML()
+        with patch('openlp.core.lib.renderer.Settings') as mocked_settings:
+            mocked_settings.return_value.value.return_value = False
+
+            # WHEN: The theme is rendered twice
+            self.renderer.pre_render(theme)
+            first_web_view = self.renderer.web
+            self.renderer.pre_render(theme)
+
+        # THEN: A new web view should have been created and none kept
+        self.assertEqual(len(self.renderer._web_views), 0, 'No web view should have been kept')
+        self.assertIsNot(self.renderer.web, first_web_view, 'A new web view should have been created')
@@ -7,7 +7,8 @@ from mock import MagicMock, patch
 
 from PyQt4 import QtGui
 
-from openlp.core.lib import Registry, ServiceItem
+from openlp.core.lib import ImageSource, Registry, ServiceItem
+from openlp.core.lib.imagemanager import Priority
 from openlp.core.ui import listpreviewwidget
 from tests.utils.osdinteraction import read_service_from_file
 
@@ -24,6 +25,7 @@ class TestListPreviewWidget(TestCase):
         self.image = QtGui.QImage(1, 1, QtGui.QImage.Format_RGB32)
         self.image_manager = MagicMock()
         self.image_manager.get_image.return_value = self.image
+        self.image_manager.request_image.return_value = self.image
         Registry().register('image_manager', self.image_manager)
         self.preview_widget = listpreviewwidget.ListPreviewWidget(self.main_window, 2)
 
@@ -82,3 +84,28 @@ class TestListPreviewWidget(TestCase):
         self.preview_widget.change_slide(1)
         # THEN: The current_slide_number should reflect the change.
         self.assertEqual(self.preview_widget.current_slide_number(), 1, 'The current slide number should  be 1.')
+
+    def thumbnail_test(self):
+        """
+        Test that the images of a service item are only requested as thumbnails when their rows are painted.
+        """
+        # GIVEN: A ServiceItem with two images.
+        service_item = ServiceItem(None)
+        service = read_service_from_file('serviceitem_image_3.osj')
+        with patch('os.path.exists'):
+            service_item.set_from_service(service[0])
+        # WHEN: Added to the preview widget.
+        self.preview_widget.replace_service_item(service_item, 1, 0)
+        # THEN: Thumbnails should have been queued, but no image should have been requested yet.
+        self.assertEqual(self.image_manager.add_image.call_args[0][1], ImageSource.Thumbnail,
+            'The thumbnails should have been added to the image manager.')
+        self.assertEqual(self.image_manager.add_image.call_args[0][3], Priority.Low,
+            'The thumbnails should only be generated with a low priority until they are requested.')
+        self.assertEqual(self.image_manager.get_image.call_count, 0, 'No full size image should have been requested.')
+        self.assertEqual(self.image_manager.request_image.call_count, 0, 'No thumbnail should have been requested.')
+        # WHEN: The thumbnail of the first row is needed.
+        pixmap = self.preview_widget.get_thumbnail(0)
+        # THEN: The thumbnail should have been requested from the image manager.
+        self.image_manager.request_image.assert_called_once_with(service_item.get_frames()[0]['path'],
+            ImageSource.Thumbnail)
+        self.assertFalse(pixmap.isNull(), 'The thumbnail should have been returned.')
@@ -1,14 +1,18 @@
 """
     Package to test the openlp.core.lib package.
 """
-
+import os
+import shutil
+import tempfile
+import zipfile
 from unittest import TestCase
 from mock import MagicMock, Mock, patch
 
-from PyQt4 import QtGui
+from PyQt4 import QtCore, QtGui
 
 from openlp.core.lib import Registry, ScreenList, ServiceItem
 from openlp.core.ui.mainwindow import MainWindow
+from openlp.core.ui.servicemanager import get_safe_member_name
 
 
 class TestServiceManager(TestCase):
@@ -86,3 +90,102 @@ class TestServiceManager(TestCase):
                 'The action should be set invisible.'
             self.service_manager.auto_start_action.setVisible.assert_called_once_with(False), \
                 'The action should be set invisible.'
+
+    def update_service_file_test(self):
+        """
+        Test that saving a service again only appends the new media files and the new service data.
+        """
+        # GIVEN: A service file with one image and the service data
+        temp_dir = tempfile.mkdtemp()
+        first_image = os.path.join(temp_dir, 'first.jpg')
+        second_image = os.path.join(temp_dir, 'second.jpg')
+        for file_name in (first_image, second_image):
+            with open(file_name, 'wb') as image_file:
+                image_file.write(os.urandom(1024))
+        service_file = os.path.join(temp_dir, 'service.osz')
+        self.service_manager._write_service_file(service_file, 'service.osj', '[1]', [(first_image, first_image)],
+            False)
+        with zipfile.ZipFile(service_file) as zip_file:
+            first_offset = zip_file.getinfo(self.service_manager._get_zip_name(first_image)).header_offset
+
+        # WHEN: The service is saved again with a second image
+        result = self.service_manager._update_service_file(service_file, 'service.osj', '[1, 2]',
+            [(first_image, first_image), (second_image, second_image)])
+
+        # THEN: The second image and the new service data should have been added, leaving the first image alone
+        with zipfile.ZipFile(service_file) as zip_file:
+            self.assertTrue(result, 'The service file should have been updated')
+            self.assertIsNone(zip_file.testzip(), 'The service file should not be corrupt')
+            self.assertEqual(len(zip_file.namelist()), 4, 'There should be two images and the service data twice')
+            self.assertEqual(zip_file.namelist()[-1], 'service.osj', 'The new service data should be last')
+            self.assertEqual(zip_file.read('service.osj'), b'[1, 2]', 'The new service data should be read')
+            self.assertEqual(zip_file.getinfo(self.service_manager._get_zip_name(first_image)).header_offset,
+                first_offset, 'The first image should not have been rewritten')
+        shutil.rmtree(temp_dir)
+
+    def update_service_file_failure_test(self):
+        """
+        Test that a service file is restored when appending to it fails.
+        """
+        # GIVEN: A service file with one image, and a new image which cannot be read
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        first_image = os.path.join(temp_dir, 'first.jpg')
+        with open(first_image, 'wb') as image_file:
+            image_file.write(os.urandom(1024))
+        missing_image = os.path.join(temp_dir, 'missing.jpg')
+        service_file = os.path.join(temp_dir, 'service.osz')
+        self.service_manager._write_service_file(service_file, 'service.osj', '[1]', [(first_image, first_image)],
+            False)
+        with open(service_file, 'rb') as saved_file:
+            saved_data = saved_file.read()
+
+        # WHEN: The service is saved again with the new image
+        with self.assertRaises(OSError):
+            self.service_manager._update_service_file(service_file, 'service.osj', '[1, 2]',
+                [(first_image, first_image), (missing_image, missing_image)])
+
+        # THEN: The service file should be as it was before
+        with open(service_file, 'rb') as saved_file:
+            self.assertEqual(saved_file.read(), saved_data, 'The service file should have been restored')
+
+    def get_safe_member_name_test(self):
+        """
+        Test that the members of a service file cannot be extracted outside of the service path.
+        """
+        # GIVEN: Member names with parent directories and an absolute path
+        member_names = ['audio/../../evil.mp3', '/etc/evil.jpg', 'audio/./song.mp3']
+
+        # WHEN: The names are made safe
+        safe_names = [get_safe_member_name(member_name) for member_name in member_names]
+
+        # THEN: Only the relative parts within the service path should be left
+        self.assertEqual(safe_names, [os.path.join('audio', 'evil.mp3'), os.path.join('etc', 'evil.jpg'),
+            os.path.join('audio', 'song.mp3')], 'The names should stay within the service path')
+
+    def previous_item_last_slide_test(self):
+        """
+        Test that going back to the last slide of a collapsed item without slides in the list makes that item live
+        """
+        # GIVEN: An image item with a slide, a collapsed song without slides in the list and the selected item
+        list_widget = self.service_manager.service_manager_list
+        image_item = QtGui.QTreeWidgetItem(list_widget)
+        image_item.setData(0, QtCore.Qt.UserRole, 1)
+        QtGui.QTreeWidgetItem(image_item).setData(0, QtCore.Qt.UserRole, 0)
+        song_item = QtGui.QTreeWidgetItem(list_widget)
+        song_item.setData(0, QtCore.Qt.UserRole, 2)
+        current_item = QtGui.QTreeWidgetItem(list_widget)
+        current_item.setData(0, QtCore.Qt.UserRole, 3)
+        song = MagicMock()
+        song.get_frames.return_value = [{}, {}, {}, {}]
+        self.service_manager.service_items = [{'service_item': MagicMock(), 'expanded': True},
+            {'service_item': song, 'expanded': False}, {'service_item': MagicMock(), 'expanded': False}]
+        list_widget.setCurrentItem(current_item)
+
+        # WHEN: The previous item is requested at its last slide
+        with patch.object(self.service_manager, 'make_live') as mocked_make_live:
+            self.service_manager.previous_item(last_slide=True)
+
+        # THEN: The last slide of the song should be made live
+        mocked_make_live.assert_called_once_with(3)
+        self.assertIs(list_widget.currentItem(), song_item, 'The song should be the current item')
@@ -3,10 +3,10 @@
 """
 
 from unittest import TestCase
-from mock import MagicMock
+from mock import MagicMock, call, patch
 
 from openlp.core.lib import Registry
-from openlp.plugins.bibles.lib.http import BGExtract, CWExtract
+from openlp.plugins.bibles.lib.http import BGExtract, CWExtract, HTTPBible
 
 
 class TestBibleHTTP(TestCase):
@@ -19,6 +19,51 @@ class TestBibleHTTP(TestCase):
         Registry().register('service_list', MagicMock())
         Registry().register('application', MagicMock())
 
+    def get_verses_for_refs_downloads_chapters_test(self):
+        """
+        Test that the web Bible downloads the missing chapters before it looks up the verses of the references
+        """
+        # GIVEN: A web Bible with John and Genesis, but without the book with reference id 99
+        bible = MagicMock()
+        john = MagicMock(book_reference_id=43)
+        genesis = MagicMock(book_reference_id=1)
+        bible._get_catalogue_book.side_effect = lambda book_id: {43: john, 1: genesis}.get(book_id)
+        references = [(43, 11, 35), (43, 11, 36), (1, 1, 1), (99, 1, 1)]
+        verses = [MagicMock(), MagicMock(), MagicMock(), None]
+        with patch('openlp.plugins.bibles.lib.http.BibleDB.get_verses_for_refs') as mocked_get_verses_for_refs:
+            mocked_get_verses_for_refs.return_value = verses
+
+            # WHEN: The verses of the references are looked up
+            result = HTTPBible.get_verses_for_refs(bible, references)
+
+        # THEN: Each chapter of a known book should be downloaded once, then the verses looked up
+        self.assertEqual(bible._download_chapter.call_args_list, [call(john, 11), call(genesis, 1)],
+            'The chapters should be downloaded once each, in the order of the references')
+        mocked_get_verses_for_refs.assert_called_once_with(bible, references)
+        self.assertIs(result, verses, 'The verses of the references should be returned')
+
+    def download_chapter_test(self):
+        """
+        Test that a chapter which is not in the database is downloaded and saved
+        """
+        # GIVEN: A web Bible which does not have John 11 yet
+        bible = MagicMock()
+        john = MagicMock(book_reference_id=43)
+        john.name = 'John'
+        search_results = bible.get_chapter.return_value
+        search_results.book = 'John'
+        search_results.chapter = 11
+        with patch('openlp.plugins.bibles.lib.http.BibleDB.get_verse_count') as mocked_get_verse_count:
+            mocked_get_verse_count.return_value = 0
+
+            # WHEN: The chapter is downloaded
+            HTTPBible._download_chapter(bible, john, 11)
+
+        # THEN: The chapter should be fetched and saved in the book
+        bible.get_chapter.assert_called_once_with('John', 11)
+        bible.create_chapter.assert_called_once_with(bible.get_book.return_value.id, 11,
+            search_results.verse_list)
+
     def bible_gateway_extract_books_test(self):
         """
         Test the Bible Gateway retrieval of book list for NIV bible